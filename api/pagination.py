@@ -0,0 +1,11 @@
+from rest_framework.pagination import CursorPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Newest first by primary key. Cursors stay stable while rows are added,
+    and every page is an indexed range scan instead of an OFFSET.
+    """
+    ordering = '-pk'
+    page_size_query_param = 'page_size'
+    max_page_size = 200
@@ -0,0 +1,121 @@
+"""
+Serializers for the v1 API.
+
+Every serializer reads only columns and relations that its viewset loads with
+select_related / prefetch_related or annotations, so a page costs a fixed number
+of queries whatever its size. Clients can ask for a subset of fields with
+?fields=id,name.
+"""
+from rest_framework import serializers
+
+from complaints.models import Complaint
+from payments.models import Fee, PaymentRecord
+from rooms.models import Hostel, Room
+from students.models import Allocation, Student
+
+
+class SparseFieldsetMixin:
+    """Keep only the fields listed in the ?fields= query parameter (unknown names are ignored)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        requested = request.query_params.get('fields') if request is not None else None
+        if requested:
+            keep = {name.strip() for name in requested.split(',')}
+            for name in set(self.fields) - keep:
+                self.fields.pop(name)
+
+
+class HostelSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    id = serializers.IntegerField(source='pk', read_only=True)
+    room_count = serializers.IntegerField(read_only=True)
+    total_beds = serializers.IntegerField(read_only=True)
+    occupied_beds = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Hostel
+        fields = ['id', 'name', 'location', 'totalrooms', 'room_count', 'total_beds', 'occupied_beds']
+
+
+class RoomSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    id = serializers.IntegerField(source='pk', read_only=True)
+    hostel = serializers.IntegerField(source='hostelid_id', read_only=True)
+    hostel_name = serializers.CharField(source='hostelid.name', read_only=True)
+    occupied = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Room
+        fields = ['id', 'hostel', 'hostel_name', 'roomnumber', 'capacity', 'type', 'occupied']
+
+
+class StudentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    id = serializers.IntegerField(source='pk', read_only=True)
+    current_room = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Student
+        fields = ['id', 'name', 'gender', 'department', 'phone', 'current_room']
+
+    def get_current_room(self, obj):
+        # allocation_list is prefetched newest first by StudentViewSet
+        allocations = getattr(obj, 'allocation_list', None)
+        if not allocations:
+            return None
+        room = allocations[0].room
+        return {'id': room.pk, 'hostel': room.hostelid_id, 'roomnumber': room.roomnumber}
+
+
+class AllocationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    id = serializers.IntegerField(source='pk', read_only=True)
+    student = serializers.IntegerField(source='student_id', read_only=True)
+    student_name = serializers.CharField(source='student.name', read_only=True)
+    room = serializers.IntegerField(source='room_id', read_only=True)
+    roomnumber = serializers.CharField(source='room.roomnumber', read_only=True)
+    hostel = serializers.IntegerField(source='room.hostelid_id', read_only=True)
+
+    class Meta:
+        model = Allocation
+        fields = ['id', 'student', 'student_name', 'room', 'roomnumber', 'hostel', 'date_of_allocation']
+
+
+class PaymentRecordSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    fee = serializers.IntegerField(source='fee_id', read_only=True)
+
+    class Meta:
+        model = PaymentRecord
+        fields = ['id', 'fee', 'payment_type', 'created_at']
+
+
+class FeeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    id = serializers.IntegerField(source='pk', read_only=True)
+    student = serializers.IntegerField(source='studentid_id', read_only=True)
+    student_name = serializers.CharField(source='studentid.name', read_only=True)
+    payment = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Fee
+        fields = ['id', 'student', 'student_name', 'amount', 'duedate', 'status', 'payment']
+
+    def get_payment(self, obj):
+        # payment_record is loaded with select_related; unpaid fees have none
+        record = getattr(obj, 'payment_record', None)
+        if record is None:
+            return None
+        return {
+            'id': record.pk,
+            'payment_type': record.payment_type,
+            'created_at': serializers.DateTimeField().to_representation(record.created_at),
+        }
+
+
+class ComplaintSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    student = serializers.IntegerField(source='student_id', read_only=True)
+    student_name = serializers.CharField(source='student.name', read_only=True)
+
+    class Meta:
+        model = Complaint
+        fields = [
+            'id', 'student', 'student_name', 'category', 'subject', 'description', 'status',
+            'admin_remarks', 'created_at', 'updated_at', 'resolved_at',
+        ]
@@ -0,0 +1,58 @@
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from complaints.models import Complaint
+from hostel_management.testing import create_unmanaged_tables
+from payments.models import Fee
+from rooms.models import Hostel
+from students.models import Student
+
+
+class ApiRevalidationTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        create_unmanaged_tables()
+        super().setUpClass()
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        self.student = Student.objects.create(name='asha')
+        Fee.objects.create(studentid=self.student, amount=1500, duedate=date(2025, 1, 10), status='Not Paid')
+        Complaint.objects.create(student=self.student, category='water', subject='Leak', description='-')
+
+    def rename_student(self):
+        # Content versions move when the transaction commits
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.name = 'asha k'
+            self.student.save()
+
+    def assert_revalidates_after_rename(self, url):
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.rename_student()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['results'][0]['student_name'], 'asha k')
+
+    def test_fee_list_changes_when_student_is_renamed(self):
+        self.assert_revalidates_after_rename('/api/v1/fees/')
+
+    def test_complaint_list_changes_when_student_is_renamed(self):
+        self.assert_revalidates_after_rename('/api/v1/complaints/')
+
+    def test_hostel_list_counts_each_utilization_query(self):
+        Hostel.objects.create(name='North')
+        with mock.patch('rooms.occupancy.metrics.inc') as inc:
+            self.client.get('/api/v1/hostels/')
+            self.client.get('/api/v1/hostels/')
+        self.assertEqual(
+            [c for c in inc.call_args_list if c.kwargs.get('kind') == 'hostel_utilization'],
+            [mock.call('occupancy_recomputations_total', kind='hostel_utilization')] * 2,
+        )
@@ -0,0 +1,20 @@
+from django.urls import include, re_path
+from rest_framework.authtoken.views import obtain_auth_token
+from rest_framework.routers import DefaultRouter
+
+from . import views
+
+router = DefaultRouter()
+router.register('hostels', views.HostelViewSet, basename='api-hostel')
+router.register('rooms', views.RoomViewSet, basename='api-room')
+router.register('students', views.StudentViewSet, basename='api-student')
+router.register('allocations', views.AllocationViewSet, basename='api-allocation')
+router.register('fees', views.FeeViewSet, basename='api-fee')
+router.register('payment-records', views.PaymentRecordViewSet, basename='api-payment-record')
+router.register('complaints', views.ComplaintViewSet, basename='api-complaint')
+
+urlpatterns = [
+    re_path(r'^(?P<version>v1)/auth/token/$', obtain_auth_token, name='api-token'),
+    re_path(r'^(?P<version>v1)/sync/$', views.SyncView.as_view(), name='api-sync'),
+    re_path(r'^(?P<version>v1)/', include(router.urls)),
+]
@@ -0,0 +1,224 @@
+"""
+Read-only v1 API.
+
+Admins see every row; students see only their own student record, allocations,
+fees, payment records and complaints. Hostels and rooms are visible to every
+authenticated user. List and detail responses carry an ETag built from the
+content versions of hostel_management.conditional, so a client that sends
+If-None-Match gets 304 after a single version lookup.
+"""
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework import status, viewsets
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from complaints.models import Complaint
+from hostel_management import changelog, conditional
+from payments.models import Fee, PaymentRecord
+from rooms.occupancy import hostels_with_utilization, rooms_with_occupancy
+from students.models import Allocation, Student
+from students.utils import get_student_for_user
+from .serializers import (
+    AllocationSerializer, ComplaintSerializer, FeeSerializer, HostelSerializer,
+    PaymentRecordSerializer, RoomSerializer, StudentSerializer,
+)
+
+
+def is_admin(user):
+    """Check if user is admin"""
+    if user.is_superuser:
+        return True
+    try:
+        return user.profile.role == 'admin'
+    except Exception:
+        return False
+
+
+class ConditionalReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only viewset with per-student row filtering and ETag revalidation.
+
+    Subclasses set queryset as on any DRF viewset, and override get_queryset()
+    (calling super) for filters that depend on the request. version_scope is
+    the tuple of content versions bumped by writes to anything the serializer
+    outputs, including related rows such as the student's name;
+    student_field is the lookup from a row to its Student, or None when the
+    rows are not student-specific.
+    """
+    version_scope = ()
+    student_field = None
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = self.request.user
+        if self.student_field is None or is_admin(user):
+            return queryset
+        student = get_student_for_user(user)
+        if student is None:
+            return queryset.none()
+        return queryset.filter(**{self.student_field: student.pk})
+
+    def _conditional(self, handler, request, *args, **kwargs):
+        versions = conditional.current(self.version_scope)
+        etag = conditional.etag_for(
+            versions, request.version, self.basename, self.action,
+            sorted(kwargs.items()), request.user.pk, request.query_params.urlencode(),
+        )
+        last_modified = conditional.last_modified_for(versions)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(super().retrieve, request, *args, **kwargs)
+
+
+class HostelViewSet(ConditionalReadOnlyViewSet):
+    serializer_class = HostelSerializer
+    version_scope = ('rooms',)
+
+    def get_queryset(self):
+        # Built per request so occupancy_recomputations_total counts API reads;
+        # hostels are not student-specific, so no row filtering is needed
+        return hostels_with_utilization()
+
+
+class RoomViewSet(ConditionalReadOnlyViewSet):
+    queryset = rooms_with_occupancy()
+    serializer_class = RoomSerializer
+    version_scope = ('rooms',)
+
+    def get_queryset(self):
+        rooms = super().get_queryset()
+        hostel = self.request.query_params.get('hostel', '')
+        if hostel.isdigit():
+            rooms = rooms.filter(hostelid=hostel)
+        return rooms
+
+
+class StudentViewSet(ConditionalReadOnlyViewSet):
+    queryset = Student.objects.prefetch_related(Prefetch(
+        'allocations',
+        queryset=Allocation.objects.select_related('room').order_by('-date_of_allocation', '-allocationid'),
+        to_attr='allocation_list',
+    ))
+    serializer_class = StudentSerializer
+    version_scope = ('rooms',)
+    student_field = 'pk'
+
+
+class AllocationViewSet(ConditionalReadOnlyViewSet):
+    queryset = Allocation.objects.select_related('student', 'room')
+    serializer_class = AllocationSerializer
+    version_scope = ('rooms',)
+    student_field = 'student'
+
+
+class FeeViewSet(ConditionalReadOnlyViewSet):
+    queryset = Fee.objects.select_related('studentid', 'payment_record')
+    serializer_class = FeeSerializer
+    # student_name comes from Student, whose writes bump 'rooms'
+    version_scope = ('fees', 'rooms')
+    student_field = 'studentid'
+
+    def get_queryset(self):
+        fees = super().get_queryset()
+        if self.request.query_params.get('status'):
+            fees = fees.filter(status=self.request.query_params['status'])
+        return fees
+
+
+class PaymentRecordViewSet(ConditionalReadOnlyViewSet):
+    queryset = PaymentRecord.objects.all()
+    serializer_class = PaymentRecordSerializer
+    version_scope = ('fees',)
+    student_field = 'fee__studentid'
+
+
+class ComplaintViewSet(ConditionalReadOnlyViewSet):
+    queryset = Complaint.objects.select_related('student')
+    serializer_class = ComplaintSerializer
+    version_scope = ('complaints', 'rooms')
+    student_field = 'student'
+
+    def get_queryset(self):
+        complaints = super().get_queryset()
+        if self.request.query_params.get('status'):
+            complaints = complaints.filter(status=self.request.query_params['status'])
+        return complaints
+
+
+class SyncView(APIView):
+    """
+    Delta sync of one student's fees, payment records, complaints and allocations.
+
+    Without ?cursor= the response is a full snapshot. With the cursor returned
+    by the previous call it contains only rows created or updated since then,
+    and the ids of deleted rows. When has_more is true, call again right away
+    with the new cursor. reset=true means the cursor is too old (the log was
+    pruned) and the response is a full snapshot instead. Admins pass ?student=.
+    """
+    # change log model -> (queryset of current rows, serializer, response key)
+    SOURCES = {
+        'fee': (lambda: Fee.objects.select_related('studentid', 'payment_record'), FeeSerializer, 'fees'),
+        'payment_record': (lambda: PaymentRecord.objects.all(), PaymentRecordSerializer, 'payment_records'),
+        'complaint': (lambda: Complaint.objects.select_related('student'), ComplaintSerializer, 'complaints'),
+        'allocation': (lambda: Allocation.objects.select_related('student', 'room'), AllocationSerializer, 'allocations'),
+    }
+    STUDENT_FIELDS = {'fee': 'studentid', 'payment_record': 'fee__studentid', 'complaint': 'student', 'allocation': 'student'}
+
+    def get_student(self, request):
+        if is_admin(request.user):
+            student_id = request.query_params.get('student', '')
+            if not student_id.isdigit():
+                raise ParseError('Invalid student.')
+            return get_object_or_404(Student, pk=student_id)
+        return get_student_for_user(request.user)
+
+    def get(self, request, *args, **kwargs):
+        student = self.get_student(request)
+        if student is None:
+            return Response({'detail': 'Student profile not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        cursor = request.query_params.get('cursor', '')
+        if cursor and not cursor.isdigit():
+            return Response({'detail': 'Invalid cursor.'}, status=status.HTTP_400_BAD_REQUEST)
+        delta = changelog.changes_since(student.pk, int(cursor)) if cursor else None
+
+        context = {'request': request}
+        data = {}
+        if delta is None:
+            # Snapshot; the cursor is taken first so changes made meanwhile are sent next time
+            new_cursor, has_more = changelog.latest_cursor(), False
+            for model, (queryset, serializer, key) in self.SOURCES.items():
+                rows = queryset().filter(**{self.STUDENT_FIELDS[model]: student.pk})
+                data[key] = {'updated': serializer(rows, many=True, context=context).data, 'deleted': []}
+        else:
+            changes, new_cursor, has_more = delta
+            for model, (queryset, serializer, key) in self.SOURCES.items():
+                ids = changes[model]['upsert']
+                # A row updated and then deleted is not in the table any more
+                rows = queryset().filter(pk__in=ids, **{self.STUDENT_FIELDS[model]: student.pk}) if ids else []
+                data[key] = {
+                    'updated': serializer(rows, many=True, context=context).data,
+                    'deleted': changes[model]['delete'],
+                }
+        return Response({
+            'cursor': str(new_cursor),
+            'has_more': has_more,
+            'reset': bool(cursor) and delta is None,
+            **data,
+        })
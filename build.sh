@@ -2,7 +2,14 @@
 # exit on error
 set -o errexit
 
-pip install -r requirements.txt
+# DB_POOL_MODE=native needs psycopg 3 on top of the regular requirements
+if [ "${DB_POOL_MODE:-persistent}" = "native" ]; then
+    pip install -r requirements-pool.txt
+else
+    pip install -r requirements.txt
+fi
 
 python manage.py collectstatic --no-input
 python manage.py migrate
+# Delete expired sessions (no-op with SESSION_BACKEND=signed_cookies)
+python manage.py clearsessions
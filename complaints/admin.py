@@ -1,5 +1,6 @@
-from django.contrib import admin
-from .models import Complaint
+from django.contrib import admin, messages
+from .bulk import set_complaint_status
+from .models import Complaint, ComplaintDailyRollup
 
 
 @admin.register(Complaint)
@@ -9,3 +10,22 @@ class ComplaintAdmin(admin.ModelAdmin):
     search_fields = ['subject', 'description', 'student__name']
     list_editable = ['status']
     date_hierarchy = 'created_at'
+    actions = ['mark_in_progress', 'mark_resolved']
+    
+    @admin.action(description='Mark selected complaints as In Progress')
+    def mark_in_progress(self, request, queryset):
+        updated = set_complaint_status(queryset, 'in_progress')
+        self.message_user(request, f'{updated} complaint(s) marked as In Progress.', messages.SUCCESS)
+    
+    @admin.action(description='Mark selected complaints as Resolved')
+    def mark_resolved(self, request, queryset):
+        updated = set_complaint_status(queryset, 'resolved')
+        self.message_user(request, f'{updated} complaint(s) marked as Resolved.', messages.SUCCESS)
+
+
+@admin.register(ComplaintDailyRollup)
+class ComplaintDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ['day', 'category', 'hostel', 'opened_count', 'resolved_count', 'median_hours', 'p90_hours']
+    list_filter = ['category', 'hostel']
+    date_hierarchy = 'day'
+    exclude = ['resolution_hours']
@@ -0,0 +1,144 @@
+"""
+Complaint analytics built from incremental daily rollups.
+
+build_rollups() recomputes ComplaintDailyRollup rows for a date range and is
+run by the build_complaint_rollups management command. weekly_report() reads
+only the rollup table and caches its result until the next rollup run.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from hostel_management import caching
+from students.utils import current_hostel_map
+from .models import Complaint, ComplaintDailyRollup
+
+CACHE_VERSION_KEY = 'complaint_rollups:version'
+CACHE_TIMEOUT = 60 * 60
+
+
+def _day_bounds(start, end):
+    """Aware datetimes covering the local days start..end inclusive"""
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(start, time.min), tz),
+        timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz),
+    )
+
+
+def _percentiles(hours):
+    """Return (median, p90) for a list or array of hours, or (None, None)"""
+    if len(hours) == 0:
+        return None, None
+    median, p90 = np.percentile(np.asarray(hours, dtype=float), [50, 90])
+    return round(float(median), 2), round(float(p90), 2)
+
+
+def build_rollups(start, end):
+    """
+    Recompute the daily rollups for every local day from start to end.
+    Only complaints created or resolved inside the range are read.
+    Returns the number of rollup rows written.
+    """
+    range_start, range_end = _day_bounds(start, end)
+    fields = ('student_id', 'category', 'created_at', 'resolved_at')
+    opened = list(Complaint.objects.filter(
+        created_at__gte=range_start, created_at__lt=range_end
+    ).values_list(*fields))
+    resolved = list(Complaint.objects.filter(
+        resolved_at__gte=range_start, resolved_at__lt=range_end
+    ).values_list(*fields))
+
+    student_ids = {row[0] for row in opened} | {row[0] for row in resolved}
+    hostel_map = current_hostel_map(student_ids)
+
+    rows = defaultdict(lambda: {'opened_count': 0, 'resolution_hours': []})
+    for student_id, category, created_at, _ in opened:
+        key = (timezone.localtime(created_at).date(), category, hostel_map.get(student_id))
+        rows[key]['opened_count'] += 1
+
+    if resolved:
+        # Compute every resolution time in the batch at once, then split by day
+        created = np.array([row[2].timestamp() for row in resolved])
+        closed = np.array([row[3].timestamp() for row in resolved])
+        hours = np.round((closed - created) / 3600.0, 2)
+        for (student_id, category, _, resolved_at), value in zip(resolved, hours.tolist()):
+            key = (timezone.localtime(resolved_at).date(), category, hostel_map.get(student_id))
+            rows[key]['resolution_hours'].append(value)
+
+    rollups = []
+    for (day, category, hostel_id), data in rows.items():
+        resolution_hours = sorted(data['resolution_hours'])
+        median, p90 = _percentiles(resolution_hours)
+        rollups.append(ComplaintDailyRollup(
+            day=day,
+            category=category,
+            hostel_id=hostel_id,
+            opened_count=data['opened_count'],
+            resolved_count=len(resolution_hours),
+            resolution_hours=resolution_hours,
+            median_hours=median,
+            p90_hours=p90,
+        ))
+
+    with transaction.atomic():
+        ComplaintDailyRollup.objects.filter(day__gte=start, day__lte=end).delete()
+        ComplaintDailyRollup.objects.bulk_create(rollups, batch_size=1000)
+
+    # Invalidate cached reports by moving to a new key namespace
+    try:
+        cache.incr(CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(CACHE_VERSION_KEY, 2, None)
+    return len(rollups)
+
+
+def weekly_report(weeks=12, force=False):
+    """
+    Complaint volume and median/p90 resolution hours grouped by week,
+    category and hostel, read from the rollup table only.
+    """
+    version = cache.get_or_set(CACHE_VERSION_KEY, 1, None)
+    return caching.get_or_set(
+        f'complaint_rollups:weekly:{version}:{weeks}', lambda: _weekly_report(weeks),
+        timeout=CACHE_TIMEOUT, name='complaint_weekly_report', force=force,
+    )
+
+
+def _weekly_report(weeks):
+    today = timezone.localdate()
+    first_day = today - timedelta(days=today.weekday(), weeks=weeks - 1)
+    rollups = ComplaintDailyRollup.objects.filter(day__gte=first_day).values_list(
+        'day', 'category', 'hostel_id', 'hostel__name', 'opened_count', 'resolution_hours'
+    )
+
+    groups = defaultdict(lambda: {'opened': 0, 'hours': []})
+    for day, category, hostel_id, hostel_name, opened_count, resolution_hours in rollups:
+        week = day - timedelta(days=day.weekday())
+        group = groups[(week, category, hostel_id, hostel_name)]
+        group['opened'] += opened_count
+        group['hours'].extend(resolution_hours)
+
+    categories = dict(Complaint.CATEGORY_CHOICES)
+    report = []
+    for (week, category, hostel_id, hostel_name), group in sorted(
+        groups.items(), key=lambda item: (item[0][0], item[0][1], item[0][3] or '')
+    ):
+        median, p90 = _percentiles(group['hours'])
+        report.append({
+            'week': week.isoformat(),
+            'category': category,
+            'category_display': categories.get(category, category),
+            'hostel_id': hostel_id,
+            'hostel': hostel_name or 'Unallocated',
+            'opened': group['opened'],
+            'resolved': len(group['hours']),
+            'median_hours': median,
+            'p90_hours': p90,
+        })
+
+    return report
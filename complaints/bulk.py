@@ -0,0 +1,19 @@
+"""
+Status changes for many complaints at once (complaint list and admin actions)
+"""
+from django.db.models import DateTimeField, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from hostel_management.bulk import update_in_bulk
+
+
+def set_complaint_status(queryset, status):
+    """Set the status of the complaints in queryset with one UPDATE; returns the number changed"""
+    now = timezone.now()
+    # update() does not apply auto_now
+    values = {'status': status, 'updated_at': now}
+    if status == 'resolved':
+        # Complaints resolved before keep their original resolution time
+        values['resolved_at'] = Coalesce('resolved_at', Value(now, output_field=DateTimeField()))
+    return update_in_bulk(queryset.exclude(status=status), 'student', **values)
@@ -0,0 +1,54 @@
+"""
+Incrementally build the complaint analytics rollups.
+
+Usage:
+    python manage.py build_complaint_rollups            # since the last run
+    python manage.py build_complaint_rollups --days 30  # last 30 days
+    python manage.py build_complaint_rollups --full     # entire history
+"""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from complaints.analytics import build_rollups
+from complaints.models import Complaint, ComplaintDailyRollup
+
+
+class Command(BaseCommand):
+    help = 'Build daily complaint rollups used by the complaint analytics report'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='First day to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--days', type=int, help='Rebuild the last N days')
+        parser.add_argument('--full', action='store_true', help='Rebuild the entire history')
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+
+        if options['since']:
+            try:
+                start = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError('--since must be a date in YYYY-MM-DD format')
+        elif options['days']:
+            start = today - timedelta(days=options['days'] - 1)
+        else:
+            last_day = None
+            if not options['full']:
+                last_day = ComplaintDailyRollup.objects.aggregate(Max('day'))['day__max']
+            if last_day:
+                # Re-read the previous day to pick up late resolutions and edits
+                start = min(last_day - timedelta(days=1), today)
+            else:
+                first = Complaint.objects.aggregate(Min('created_at'))['created_at__min']
+                if first is None:
+                    self.stdout.write('No complaints to roll up.')
+                    return
+                start = timezone.localtime(first).date()
+
+        written = build_rollups(start, today)
+        self.stdout.write(self.style.SUCCESS(
+            f'Built {written} rollup rows for {start} to {today}.'
+        ))
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0002_alter_complaint_table'),
+        ('rooms', '0001_initial'),
+        ('students', '0003_studentprofile_hostel_mess'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComplaintDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('category', models.CharField(choices=[('maintenance', 'Maintenance'), ('cleanliness', 'Cleanliness'), ('electricity', 'Electricity'), ('water', 'Water Supply'), ('security', 'Security'), ('other', 'Other')], max_length=20)),
+                ('opened_count', models.PositiveIntegerField(default=0)),
+                ('resolved_count', models.PositiveIntegerField(default=0)),
+                ('resolution_hours', models.JSONField(blank=True, default=list)),
+                ('median_hours', models.FloatField(blank=True, null=True)),
+                ('p90_hours', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Complaint Daily Rollup',
+                'verbose_name_plural': 'Complaint Daily Rollups',
+                'db_table': 'complaint_daily_rollup',
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['created_at'], name='complaint_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['resolved_at'], name='complaint_resolved_idx'),
+        ),
+        migrations.AddField(
+            model_name='complaintdailyrollup',
+            name='hostel',
+            field=models.ForeignKey(blank=True, db_column='hostelid', db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='rooms.hostel'),
+        ),
+        migrations.AddConstraint(
+            model_name='complaintdailyrollup',
+            constraint=models.UniqueConstraint(fields=('day', 'category', 'hostel'), name='complaint_rollup_unique_day'),
+        ),
+    ]
@@ -32,8 +32,50 @@ class Complaint(models.Model):
     def __str__(self):
         return f"{self.subject} - {self.student.name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets complaints.stream publish only changes the student can see
+        instance._visible_state = (instance.__dict__.get('status'), instance.__dict__.get('admin_remarks'))
+        return instance
+    
     class Meta:
         db_table = 'complaint'
         ordering = ['-created_at']
         verbose_name = 'Complaint'
         verbose_name_plural = 'Complaints'
+        indexes = [
+            models.Index(fields=['created_at'], name='complaint_created_idx'),
+            models.Index(fields=['resolved_at'], name='complaint_resolved_idx'),
+        ]
+
+
+class ComplaintDailyRollup(models.Model):
+    """Daily complaint volume and resolution times per category and hostel"""
+    
+    day = models.DateField()
+    category = models.CharField(max_length=20, choices=Complaint.CATEGORY_CHOICES)
+    # Hostel of the student's current allocation (null when unallocated)
+    hostel = models.ForeignKey(
+        'rooms.Hostel', on_delete=models.DO_NOTHING, null=True, blank=True,
+        db_constraint=False, related_name='+', db_column='hostelid'
+    )
+    opened_count = models.PositiveIntegerField(default=0)
+    resolved_count = models.PositiveIntegerField(default=0)
+    # Hours from created_at to resolved_at for complaints resolved on this day
+    resolution_hours = models.JSONField(default=list, blank=True)
+    median_hours = models.FloatField(null=True, blank=True)
+    p90_hours = models.FloatField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.day} - {self.category} - {self.opened_count} opened"
+    
+    class Meta:
+        db_table = 'complaint_daily_rollup'
+        ordering = ['-day']
+        verbose_name = 'Complaint Daily Rollup'
+        verbose_name_plural = 'Complaint Daily Rollups'
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'category', 'hostel'], name='complaint_rollup_unique_day'),
+        ]
@@ -0,0 +1,107 @@
+"""
+Live complaint updates for students.
+
+Saving a complaint publishes its student-visible state (status, admin remarks,
+resolution time) on the student's pub/sub channel when it is created or when
+one of those fields changes; so do bulk status updates. Deleting it publishes
+a 'deleted' message.
+events() turns a subscription into a server-sent event stream for
+complaint_stream, so open complaint pages update without reloading.
+"""
+import json
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.signals import post_delete, post_save
+
+from hostel_management import metrics, pubsub
+from hostel_management.async_utils import alist
+from hostel_management.bulk import bulk_updated
+
+from .models import Complaint
+
+
+# Streams open in this process; events() runs on the event loop thread
+_open_streams = 0
+metrics.register_gauge('sse_streams_open', lambda: _open_streams)
+
+
+def channel_for(student_id):
+    return f'complaints.student.{student_id}'
+
+
+def complaint_state(complaint):
+    return {
+        'id': complaint.pk,
+        'status': complaint.status,
+        'status_display': complaint.get_status_display(),
+        'admin_remarks': complaint.admin_remarks or '',
+        'resolved_at': complaint.resolved_at,
+        'updated_at': complaint.updated_at,
+    }
+
+
+def _on_save(sender, instance, created, **kwargs):
+    visible = (instance.status, instance.admin_remarks)
+    if not created and getattr(instance, '_visible_state', None) == visible:
+        return
+    instance._visible_state = visible
+    pubsub.publish(channel_for(instance.student_id), {'type': 'complaint', 'created': created, **complaint_state(instance)})
+
+
+def _on_delete(sender, instance, **kwargs):
+    pubsub.publish(channel_for(instance.student_id), {'type': 'deleted', 'id': instance.pk})
+
+
+def _on_bulk_update(sender, rows, **kwargs):
+    for complaint in Complaint.objects.filter(pk__in=[pk for pk, _ in rows]):
+        pubsub.publish(channel_for(complaint.student_id), {'type': 'complaint', 'created': False, **complaint_state(complaint)})
+
+
+def connect_signals():
+    post_save.connect(_on_save, sender=Complaint, dispatch_uid='complaint_stream:save')
+    post_delete.connect(_on_delete, sender=Complaint, dispatch_uid='complaint_stream:delete')
+    bulk_updated.connect(_on_bulk_update, sender=Complaint, dispatch_uid='complaint_stream:bulk')
+
+
+def _event(message):
+    # The id only tells a reconnecting browser (Last-Event-ID) that it may have missed messages
+    data = json.dumps(message, cls=DjangoJSONEncoder)
+    return f'id: {time.time_ns()}\nevent: {message["type"]}\ndata: {data}\n\n'
+
+
+async def _snapshot(student_id):
+    complaints = await alist(Complaint.objects.filter(student_id=student_id))
+    return {'type': 'snapshot', 'complaints': [complaint_state(complaint) for complaint in complaints]}
+
+
+async def events(student_id, resync=False):
+    """
+    Server-sent events for one student's complaints.
+
+    Sends a snapshot first when resync is true (a reconnect), a comment every
+    COMPLAINT_STREAM_HEARTBEAT_SECONDS so proxies keep the connection open,
+    and ends after COMPLAINT_STREAM_MAX_SECONDS; the browser then reconnects.
+    """
+    heartbeat = getattr(settings, 'COMPLAINT_STREAM_HEARTBEAT_SECONDS', 15)
+    deadline = time.monotonic() + getattr(settings, 'COMPLAINT_STREAM_MAX_SECONDS', 300)
+    global _open_streams
+    metrics.inc('sse_streams_opened_total', stream='complaints')
+    _open_streams += 1
+    try:
+        async with pubsub.subscribe(channel_for(student_id)) as subscription:
+            yield 'retry: 5000\n\n'
+            if resync:
+                yield _event(await _snapshot(student_id))
+            while (remaining := deadline - time.monotonic()) > 0:
+                message = await subscription.get(timeout=min(heartbeat, remaining))
+                if message is None:
+                    yield ': keepalive\n\n'
+                elif message['type'] == 'resync':
+                    yield _event(await _snapshot(student_id))
+                else:
+                    yield _event(message)
+    finally:
+        _open_streams -= 1
+        metrics.inc('sse_streams_closed_total', stream='complaints')
@@ -1,3 +1,79 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from hostel_management.bulk import bulk_updated
+from hostel_management.testing import create_unmanaged_tables
+from students.models import Student
+from .bulk import set_complaint_status
+from .models import Complaint
+
+
+class BulkComplaintStatusTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        create_unmanaged_tables()
+        super().setUpClass()
+
+    def setUp(self):
+        self.student = Student.objects.create(name='asha')
+        self.complaints = [
+            Complaint.objects.create(student=self.student, category='water', subject=f'Leak {n}', description='-')
+            for n in range(3)
+        ]
+
+    def complaint_updates(self, queries):
+        return [q['sql'] for q in queries if q['sql'].startswith('UPDATE "complaint"')]
+
+    def test_changes_every_row_with_one_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            changed = set_complaint_status(Complaint.objects.all(), 'in_progress')
+        self.assertEqual(changed, 3)
+        self.assertEqual(len(self.complaint_updates(queries)), 1)
+        self.assertEqual(set(Complaint.objects.values_list('status', flat=True)), {'in_progress'})
+
+    def test_resolving_keeps_earlier_resolution_time(self):
+        reopened, fresh, _ = self.complaints
+        earlier = timezone.now() - timedelta(days=3)
+        Complaint.objects.filter(pk=reopened.pk).update(status='in_progress', resolved_at=earlier)
+
+        set_complaint_status(Complaint.objects.filter(pk__in=[reopened.pk, fresh.pk]), 'resolved')
+
+        reopened.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(reopened.resolved_at, earlier)
+        self.assertIsNotNone(fresh.resolved_at)
+        self.assertGreater(fresh.resolved_at, earlier)
+
+    def test_rows_already_in_status_are_left_alone(self):
+        Complaint.objects.update(status='resolved')
+        updated_at = dict(Complaint.objects.values_list('pk', 'updated_at'))
+        receiver = mock.Mock()
+        bulk_updated.connect(receiver, sender=Complaint)
+        self.addCleanup(bulk_updated.disconnect, receiver, sender=Complaint)
+
+        with CaptureQueriesContext(connection) as queries:
+            changed = set_complaint_status(Complaint.objects.all(), 'resolved')
+
+        self.assertEqual(changed, 0)
+        self.assertEqual(self.complaint_updates(queries), [])
+        self.assertEqual(dict(Complaint.objects.values_list('pk', 'updated_at')), updated_at)
+        receiver.assert_not_called()
+
+    def test_receivers_run_once_per_batch(self):
+        receiver = mock.Mock()
+        bulk_updated.connect(receiver, sender=Complaint)
+        self.addCleanup(bulk_updated.disconnect, receiver, sender=Complaint)
+
+        set_complaint_status(Complaint.objects.all(), 'in_progress')
 
-# Create your tests here.
+        receiver.assert_called_once()
+        self.assertEqual(
+            sorted(receiver.call_args.kwargs['rows']),
+            sorted((complaint.pk, self.student.pk) for complaint in self.complaints),
+        )
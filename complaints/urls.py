@@ -4,6 +4,9 @@ from . import views
 urlpatterns = [
     path('', views.complaint_list, name='complaint_list'),
     path('add/', views.complaint_add, name='complaint_add'),
+    path('analytics/', views.complaint_analytics, name='complaint_analytics'),
+    path('stream/', views.complaint_stream, name='complaint_stream'),
+    path('bulk-status/', views.complaint_bulk_status, name='complaint_bulk_status'),
     path('<int:pk>/', views.complaint_detail, name='complaint_detail'),
     path('<int:pk>/update/', views.complaint_update, name='complaint_update'),
     path('<int:pk>/resolve/', views.complaint_resolve, name='complaint_resolve'),
@@ -1,10 +1,16 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
 from .models import Complaint
 from .forms import ComplaintForm, ComplaintUpdateForm
 from students.models import Student
+from hostel_management.async_utils import alist, arender, aget_student_for_user
+from hostel_management.conditional import conditional_page
+from hostel_management.db_router import read_only_view
 
 
 def is_admin(user):
@@ -18,23 +24,23 @@ def is_admin(user):
 
 
 @login_required
-def complaint_list(request):
+@read_only_view
+# The admin list shows student names, which change with the 'rooms' scope
+@conditional_page('complaints', 'rooms')
+async def complaint_list(request):
     """List complaints based on user role"""
-    if is_admin(request.user):
+    user = await request.auser()
+    if await sync_to_async(is_admin)(user):
         # Admin sees all complaints
-        complaints = Complaint.objects.all()
+        complaints = await alist(Complaint.objects.select_related('student'))
         template = 'complaints/complaint_list.html'
     else:
         # Student sees only their complaints
         try:
-            # Try to find student by username matching
-            student = Student.objects.filter(name__icontains=request.user.username).first()
-            if not student:
-                # If no exact match, try to find by user profile or create a basic student record
-                student = Student.objects.filter(studentid=request.user.id).first()
+            student = await aget_student_for_user(user)
             
             if student:
-                complaints = Complaint.objects.filter(student=student)
+                complaints = await alist(Complaint.objects.filter(student=student))
             else:
                 complaints = []
                 messages.warning(request, 'Student profile not found.')
@@ -46,7 +52,7 @@ def complaint_list(request):
     context = {
         'complaints': complaints,
     }
-    return render(request, template, context)
+    return await arender(request, template, context)
 
 
 @login_required
@@ -70,13 +76,11 @@ def complaint_add(request):
             complaint.save()
             
             # Send email confirmation to student
-            try:
+            # Queued so a slow SMTP server does not block the request
+            if request.user.email:
+                from hostel_management.email_queue import enqueue
                 from hostel_management.email_utils import send_complaint_confirmation_email
-                if request.user.email:
-                    send_complaint_confirmation_email(complaint, request.user.email)
-            except Exception as e:
-                print(f"Email sending failed: {str(e)}")
-                # Continue even if email fails
+                enqueue(send_complaint_confirmation_email, complaint, request.user.email)
             
             messages.success(request, 'Complaint submitted successfully! A confirmation email has been sent.')
             return redirect('complaint_list')
@@ -127,6 +131,28 @@ def complaint_detail(request, pk):
     return render(request, template, context)
 
 
+@login_required
+async def complaint_stream(request):
+    """Server-sent events with status and remark changes of the student's complaints"""
+    from .stream import events
+    
+    # 204 tells EventSource not to reconnect: streaming would tie up a WSGI worker,
+    # and there is nothing to stream without a student profile
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    student = await aget_student_for_user(await request.auser())
+    if not student:
+        return HttpResponse(status=204)
+    
+    response = StreamingHttpResponse(
+        events(student.pk, resync='Last-Event-ID' in request.headers),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @login_required
 @user_passes_test(is_admin)
 def complaint_update(request, pk):
@@ -153,6 +179,27 @@ def complaint_update(request, pk):
     return render(request, 'complaints/complaint_update.html', context)
 
 
+@login_required
+@user_passes_test(is_admin)
+def complaint_bulk_status(request):
+    """Set the status of the selected complaints in one update (admin only)"""
+    if request.method != 'POST':
+        return redirect('complaint_list')
+    
+    from .bulk import set_complaint_status
+    
+    status = request.POST.get('status')
+    complaint_ids = [pk for pk in request.POST.getlist('complaint_ids') if pk.isdigit()]
+    if status not in dict(Complaint.STATUS_CHOICES):
+        messages.error(request, 'Please choose a valid status.')
+    elif not complaint_ids:
+        messages.error(request, 'Please select at least one complaint.')
+    else:
+        updated = set_complaint_status(Complaint.objects.filter(pk__in=complaint_ids), status)
+        messages.success(request, f'{updated} complaint(s) marked as {dict(Complaint.STATUS_CHOICES)[status]}.')
+    return redirect('complaint_list')
+
+
 @login_required
 @user_passes_test(is_admin)
 def complaint_resolve(request, pk):
@@ -196,3 +243,27 @@ def complaint_delete(request, pk):
         'complaint': complaint,
     }
     return render(request, 'complaints/complaint_confirm_delete.html', context)
+
+
+@login_required
+@user_passes_test(is_admin)
+@read_only_view
+def complaint_analytics(request):
+    """Complaint volume and resolution times by week, category and hostel (admin only)"""
+    from .analytics import weekly_report
+    
+    try:
+        weeks = max(1, min(int(request.GET.get('weeks', 12)), 52))
+    except ValueError:
+        weeks = 12
+    
+    report = weekly_report(weeks)
+    
+    if request.GET.get('format') == 'json':
+        return JsonResponse({'weeks': weeks, 'results': report})
+    
+    context = {
+        'report': report,
+        'weeks': weeks,
+    }
+    return render(request, 'complaints/complaint_analytics.html', context)
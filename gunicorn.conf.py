@@ -0,0 +1,35 @@
+"""
+Gunicorn configuration.
+
+SERVER_MODE=wsgi (default) runs the WSGI app on sync workers.
+SERVER_MODE=asgi runs the ASGI app on uvicorn workers, which the live complaint
+stream needs: an open event stream waits on the event loop instead of holding
+a worker. Database queries are not faster in this mode; the async views still
+run them one at a time on a thread, and under WSGI they pay an extra
+async-to-sync switch per request.
+"""
+import os
+import subprocess
+import sys
+
+server_mode = os.environ.get('SERVER_MODE', 'wsgi').lower()
+
+if server_mode == 'asgi':
+    wsgi_app = 'hostel_management.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'hostel_management.wsgi:application'
+    worker_class = 'sync'
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    """Fill the shared cache on this host once the server is listening (not blocking startup)"""
+    if os.environ.get('CACHE_WARMUP_ON_START', 'true').lower() in ('1', 'true', 'yes'):
+        manage = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'manage.py')
+        subprocess.Popen([sys.executable, manage, 'warm_caches'])
@@ -0,0 +1,21 @@
+from django.contrib import admin
+from .models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'view', 'duration_ms', 'request_ms', 'database', 'short_sql']
+    list_filter = ['view', 'database', 'created_at']
+    search_fields = ['sql', 'path', 'plan']
+    date_hierarchy = 'created_at'
+    readonly_fields = [field.name for field in SlowQuery._meta.fields]
+
+    @admin.display(description='SQL')
+    def short_sql(self, obj):
+        return obj.sql[:120]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
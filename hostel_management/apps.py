@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class HostelManagementConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'hostel_management'
+    verbose_name = 'Hostel Management'
+
+    def ready(self):
+        from . import changelog, conditional
+        conditional.connect_signals()
+        changelog.connect_signals()
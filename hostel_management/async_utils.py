@@ -0,0 +1,29 @@
+"""
+Helpers for the async views served in ASGI mode (SERVER_MODE=asgi).
+
+Async views read their data with the async ORM and then render in a worker
+thread, because templates may still touch lazy relations such as user.profile.
+The async ORM runs each query in the same thread-sensitive executor on the
+request's one connection, so queries never run in parallel; code that needs
+several queries should make them in one sync function called with
+sync_to_async, which costs one thread switch instead of one per query.
+"""
+from asgiref.sync import sync_to_async
+from django.shortcuts import render
+
+from students.models import Student
+
+arender = sync_to_async(render)
+
+
+async def alist(queryset):
+    """Evaluate a queryset with the async ORM and return a list"""
+    return [obj async for obj in queryset]
+
+
+async def aget_student_for_user(user):
+    """Async version of the username / user id student lookup used by the student views"""
+    student = await Student.objects.filter(name__icontains=user.username).afirst()
+    if not student:
+        student = await Student.objects.filter(studentid=user.id).afirst()
+    return student
@@ -0,0 +1,32 @@
+"""
+Set-wise updates that keep the derived state in step.
+
+QuerySet.update() does not send post_save, so the content versions, change
+log, fee aggregates and complaint streams would not see the change.
+update_in_bulk() changes the rows in one UPDATE ... WHERE pk IN and then sends
+bulk_updated once for the whole batch; those modules receive it and do their
+work once per batch instead of once per row.
+"""
+from django.db import transaction
+from django.dispatch import Signal
+
+# Sent with sender=<model> and rows=[(pk, student id), ...] after the UPDATE,
+# inside its transaction
+bulk_updated = Signal()
+
+
+def update_in_bulk(queryset, student_field, **values):
+    """
+    Apply values to every row of queryset with a single UPDATE.
+
+    student_field is the lookup from a row to its student id, passed on to the
+    bulk_updated receivers. Returns the number of rows updated.
+    """
+    model = queryset.model
+    with transaction.atomic():
+        rows = list(queryset.select_for_update().order_by().values_list('pk', student_field))
+        if not rows:
+            return 0
+        model._base_manager.filter(pk__in=[pk for pk, _ in rows]).update(**values)
+        bulk_updated.send(sender=model, rows=rows)
+    return len(rows)
@@ -0,0 +1,111 @@
+"""
+Cache helpers with stampede protection.
+
+get_or_set(key, compute, timeout) returns the cached value or stores
+compute(). Values are stored with a soft expiry, jittered by +/- JITTER so keys
+written together do not all expire together, and kept in the cache for twice
+as long. When a value goes stale, the first worker to take the key's lock
+(cache.add) recomputes it while the others keep serving the stale copy. When
+there is no copy at all, the others wait up to WAIT_SECONDS for the lock
+holder instead of running the same expensive query at the same time.
+
+force=True recomputes the value even when it is fresh; warm_caches uses it
+so scheduled runs replace entries before they go stale. The lock is atomic on
+Redis and in-process caches; the file cache only makes simultaneous
+recomputation unlikely. aget_or_set() is the version for async views, with an
+async compute function.
+"""
+import asyncio
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import metrics
+
+JITTER = 0.1
+LOCK_TIMEOUT = 30
+WAIT_SECONDS = 5
+POLL_SECONDS = 0.05
+
+
+def _entry(value, timeout):
+    fresh_for = timeout * random.uniform(1 - JITTER, 1 + JITTER)
+    return {'value': value, 'fresh_until': time.time() + fresh_for}
+
+
+def _is_fresh(entry):
+    return entry is not None and entry['fresh_until'] > time.time()
+
+
+def _default_timeout():
+    return getattr(settings, 'CACHE_TIMEOUT', 300)
+
+
+def _metric_name(key, name):
+    return name or key.split(':', 1)[0]
+
+
+def get_or_set(key, compute, timeout=None, name=None, using='default', force=False):
+    """
+    Cached value of key, computing and storing it with compute() when missing,
+    stale or force is true. timeout defaults to CACHE_TIMEOUT; name labels the
+    cache_requests_total metric (default: the key prefix before the first colon).
+    """
+    cache = caches[using]
+    timeout = timeout or _default_timeout()
+    entry = cache.get(key)
+    if _is_fresh(entry) and not force:
+        metrics.inc('cache_requests_total', cache=_metric_name(key, name), result='hit')
+        return entry['value']
+
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            value = compute()
+            cache.set(key, _entry(value, timeout), timeout * 2)
+        finally:
+            cache.delete(lock_key)
+    elif entry is not None:
+        # Another worker is recomputing; serve the stale value meanwhile
+        value = entry['value']
+    else:
+        deadline = time.monotonic() + WAIT_SECONDS
+        while entry is None and time.monotonic() < deadline:
+            time.sleep(POLL_SECONDS)
+            entry = cache.get(key)
+        # Compute locally if the lock holder is too slow or died
+        value = entry['value'] if entry is not None else compute()
+
+    metrics.inc('cache_requests_total', cache=_metric_name(key, name), result='hit' if entry else 'miss')
+    return value
+
+
+async def aget_or_set(key, compute, timeout=None, name=None, using='default', force=False):
+    """get_or_set() for async views; compute is an async function"""
+    cache = caches[using]
+    timeout = timeout or _default_timeout()
+    entry = await cache.aget(key)
+    if _is_fresh(entry) and not force:
+        metrics.inc('cache_requests_total', cache=_metric_name(key, name), result='hit')
+        return entry['value']
+
+    lock_key = f'{key}:lock'
+    if await cache.aadd(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            value = await compute()
+            await cache.aset(key, _entry(value, timeout), timeout * 2)
+        finally:
+            await cache.adelete(lock_key)
+    elif entry is not None:
+        value = entry['value']
+    else:
+        deadline = time.monotonic() + WAIT_SECONDS
+        while entry is None and time.monotonic() < deadline:
+            await asyncio.sleep(POLL_SECONDS)
+            entry = await cache.aget(key)
+        value = entry['value'] if entry is not None else await compute()
+
+    metrics.inc('cache_requests_total', cache=_metric_name(key, name), result='hit' if entry else 'miss')
+    return value
@@ -0,0 +1,144 @@
+"""
+Per-student change log for incremental (delta) sync.
+
+Saves and deletes of Fee, PaymentRecord, Complaint and Allocation append a
+ChangeLogEntry with the owning student's id. The core tables are unmanaged, so
+they cannot get updated_at columns. Entries are written after the transaction
+commits, so rolled-back changes are never logged. The inserts themselves run
+one transaction at a time (an advisory lock on PostgreSQL; SQLite has a single
+writer anyway), so an entry only becomes visible after every entry with a
+lower id. Clients keep the id of the last entry they saw as their cursor and
+cannot skip an entry that commits later; see changes_since().
+
+Bulk writes that bypass model signals must call record_many() themselves, or
+go through hostel_management.bulk.update_in_bulk().
+"""
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+# change log model name -> (app label.model, function returning the student id)
+TRACKED = {
+    'fee': ('payments.Fee', lambda obj: obj.studentid_id),
+    'payment_record': ('payments.PaymentRecord', lambda obj: obj.fee.studentid_id),
+    'complaint': ('complaints.Complaint', lambda obj: obj.student_id),
+    'allocation': ('students.Allocation', lambda obj: obj.student_id),
+}
+
+# pg_advisory_xact_lock key serialising change log inserts
+LOCK_KEY = 7202
+
+
+def _insert(rows):
+    from .models import ChangeLogEntry
+
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # Ids are taken and committed under the lock, so they become visible in order
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s)', [LOCK_KEY])
+        ChangeLogEntry.objects.bulk_create(rows, batch_size=1000)
+
+
+def record_many(model, entries):
+    """Log changes made without signals; entries are (student_id, object_id, action)"""
+    from .models import ChangeLogEntry
+
+    rows = [
+        ChangeLogEntry(student_id=student_id, model=model, object_id=object_id, action=action)
+        for student_id, object_id, action in entries
+        if student_id is not None
+    ]
+    if rows:
+        transaction.on_commit(lambda: _insert(rows))
+
+
+def _handler(model, student_of, action):
+    def handler(sender, instance, **kwargs):
+        try:
+            student_id = student_of(instance)
+        except Exception:
+            # e.g. a payment record whose fee is already gone
+            return
+        record_many(model, [(student_id, instance.pk, action)])
+    return handler
+
+
+def _bulk_handler(sender, rows, **kwargs):
+    for model, (model_name, _) in TRACKED.items():
+        if sender._meta.label == model_name:
+            record_many(model, [(student_id, pk, 'upsert') for pk, student_id in rows])
+
+
+def connect_signals():
+    from django.apps import apps
+
+    from .bulk import bulk_updated
+
+    bulk_updated.connect(_bulk_handler, dispatch_uid='change_log:bulk')
+    for model, (model_name, student_of) in TRACKED.items():
+        sender = apps.get_model(model_name)
+        post_save.connect(_handler(model, student_of, 'upsert'), sender=sender, weak=False,
+                          dispatch_uid=f'change_log:{model}:save')
+        post_delete.connect(_handler(model, student_of, 'delete'), sender=sender, weak=False,
+                            dispatch_uid=f'change_log:{model}:delete')
+
+
+def latest_cursor():
+    from .models import ChangeLogEntry
+
+    return ChangeLogEntry.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def changes_since(student_id, cursor, limit=500):
+    """
+    Changes of one student after the cursor.
+
+    Returns (changes, new_cursor, has_more), where changes maps each model to
+    {'upsert': [object ids], 'delete': [object ids]} with only the latest
+    action per object. Returns None when older entries have been pruned past
+    the cursor and the client must resync from scratch.
+    """
+    from .models import ChangeLogEntry
+
+    oldest = ChangeLogEntry.objects.order_by('id').values_list('id', flat=True).first()
+    if oldest is not None and cursor < oldest - 1:
+        return None
+
+    # Read first: entries committed after this point get higher ids and are
+    # returned by the next call
+    newest = latest_cursor()
+    entries = list(
+        ChangeLogEntry.objects.filter(student_id=student_id, id__gt=cursor, id__lte=newest)
+        .order_by('id').values_list('id', 'model', 'object_id', 'action')[:limit + 1]
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    latest = {}
+    for entry_id, model, object_id, action in entries:
+        latest[(model, object_id)] = action
+    changes = {model: {'upsert': [], 'delete': []} for model in TRACKED}
+    for (model, object_id), action in latest.items():
+        changes[model][action].append(object_id)
+    if has_more:
+        new_cursor = entries[-1][0]
+    else:
+        # Everything up to the newest entry has been seen, including other
+        # students' entries; moving past them keeps idle clients' cursors
+        # ahead of pruning
+        new_cursor = max(cursor, newest)
+    return changes, new_cursor, has_more
+
+
+def prune(days):
+    """Delete entries older than the given number of days; returns the number deleted"""
+    from .models import ChangeLogEntry
+
+    cutoff = timezone.now() - timedelta(days=days)
+    # The newest entry is always kept so changes_since() can tell a pruned
+    # cursor from an empty log
+    deleted, _ = ChangeLogEntry.objects.filter(changed_at__lt=cutoff, id__lt=latest_cursor()).delete()
+    return deleted
@@ -0,0 +1,174 @@
+"""
+Conditional GET (ETag / Last-Modified) for read-mostly pages.
+
+Every write to the tables behind a scope bumps that scope's ContentVersion row
+(see SCOPES and the signal handlers below). @conditional_page('rooms') reads
+the current versions with one query and answers 304 Not Modified when the
+browser already has that version, without running the view. The ETag also
+covers the user, their CSRF secret and RELEASE_VERSION, because the pages are
+per-user and embed tokens and static file names. Pages with pending flash
+messages are always rendered in full and never get an ETag.
+
+Bulk writes that bypass model signals (bulk_create, QuerySet.update) must call
+bump() themselves, or go through hostel_management.bulk.update_in_bulk().
+Versions move when the writing transaction commits, never before, so a page
+rendered from uncommitted data cannot be cached under the old version and a
+rolled-back write does not invalidate anything.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+# scope -> models whose writes change the pages using that scope
+SCOPES = {
+    'rooms': ['rooms.Hostel', 'rooms.Room', 'students.Allocation', 'students.Student'],
+    'fees': ['payments.Fee', 'payments.PaymentRecord'],
+    'complaints': ['complaints.Complaint'],
+}
+
+
+def bump(*scopes):
+    """
+    Move the given scopes to a new version once the current transaction commits
+    (right away outside a transaction). Every write bumps one of a handful of
+    rows, so updating them inside the writer's transaction would hold their
+    locks until it commits and serialize all writers behind it.
+    """
+    transaction.on_commit(lambda: _bump(scopes))
+
+
+def _bump(scopes):
+    from .models import ContentVersion
+
+    now = timezone.now()
+    for scope in scopes:
+        if ContentVersion.objects.filter(key=scope).update(version=F('version') + 1, updated_at=now):
+            continue
+        try:
+            with transaction.atomic():
+                ContentVersion.objects.create(key=scope, version=1, updated_at=now)
+        except IntegrityError:
+            # Created concurrently by another request
+            ContentVersion.objects.filter(key=scope).update(version=F('version') + 1, updated_at=now)
+
+
+def current(scopes):
+    """{scope: (version, updated_at)} for the given scopes, (0, None) when never bumped"""
+    from .models import ContentVersion
+
+    versions = {scope: (0, None) for scope in scopes}
+    for row in ContentVersion.objects.filter(key__in=scopes):
+        versions[row.key] = (row.version, row.updated_at)
+    return versions
+
+
+def etag_for(versions, *parts):
+    """Quoted ETag over RELEASE_VERSION, the scope versions and any other parts"""
+    key = [
+        getattr(settings, 'RELEASE_VERSION', ''),
+        sorted((scope, version) for scope, (version, _) in versions.items()),
+        *parts,
+    ]
+    return quote_etag(hashlib.md5(repr(key).encode(), usedforsecurity=False).hexdigest())
+
+
+def last_modified_for(versions):
+    """Timestamp of the newest bump, or None when a scope was never bumped"""
+    modified = [updated_at for _, updated_at in versions.values() if updated_at]
+    if not modified or len(modified) != len(versions):
+        return None
+    return int(max(modified).timestamp())
+
+
+def _pending_messages(request):
+    # len() does not mark the messages as used
+    return len(get_messages(request)) > 0
+
+
+def _validators(request, user, scopes, args, kwargs):
+    """(etag, last_modified timestamp) for the request, or (None, None) to skip"""
+    if request.method not in ('GET', 'HEAD') or _pending_messages(request):
+        return None, None
+    versions = current(scopes)
+    etag = etag_for(
+        versions,
+        request.resolver_match.view_name if request.resolver_match else request.path,
+        args, sorted(kwargs.items()),
+        user.pk,
+        request.META.get('CSRF_COOKIE', ''),
+    )
+    return etag, last_modified_for(versions)
+
+
+def _finish(request, response, etag, last_modified):
+    if etag is None or response.status_code not in (200, 304) or _pending_messages(request):
+        return response
+    response.headers.setdefault('ETag', etag)
+    if last_modified is not None and not response.has_header('Last-Modified'):
+        response['Last-Modified'] = http_date(last_modified)
+    # Per-user content: browsers keep it but must revalidate, shared caches must not store it
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_page(*scopes):
+    """Answer 304 for repeat GETs while the given scopes are unchanged"""
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                user = await request.auser()
+                etag, last_modified = await sync_to_async(_validators)(request, user, scopes, args, kwargs)
+                if etag is not None:
+                    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                    if response is not None:
+                        return _finish(request, response, etag, last_modified)
+                response = await view_func(request, *args, **kwargs)
+                return _finish(request, response, etag, last_modified)
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            etag, last_modified = _validators(request, request.user, scopes, args, kwargs)
+            if etag is not None:
+                response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                if response is not None:
+                    return _finish(request, response, etag, last_modified)
+            response = view_func(request, *args, **kwargs)
+            return _finish(request, response, etag, last_modified)
+        return wrapper
+    return decorator
+
+
+def _bump_handler(scope):
+    def handler(sender, **kwargs):
+        bump(scope)
+    return handler
+
+
+def _bulk_bump(sender, **kwargs):
+    bump(*[scope for scope, model_names in SCOPES.items() if sender._meta.label in model_names])
+
+
+def connect_signals():
+    from django.apps import apps
+
+    from .bulk import bulk_updated
+
+    bulk_updated.connect(_bulk_bump, dispatch_uid='content_version:bulk')
+    for scope, model_names in SCOPES.items():
+        handler = _bump_handler(scope)
+        for model_name in model_names:
+            model = apps.get_model(model_name)
+            uid = f'content_version:{scope}:{model_name}'
+            post_save.connect(handler, sender=model, weak=False, dispatch_uid=f'{uid}:save')
+            post_delete.connect(handler, sender=model, weak=False, dispatch_uid=f'{uid}:delete')
@@ -0,0 +1,70 @@
+"""
+Admin dashboard statistics.
+
+The counts, fee total and room occupancy scan every student, room, complaint
+and fee, so they are cached under a key built from the 'rooms', 'fees' and
+'complaints' content versions: any write to those tables moves the dashboard
+to a new key, and between writes every worker reads the same cached copy.
+caching.get_or_set() makes sure only one worker computes a missing entry.
+"""
+from django.conf import settings
+from django.db.models import Sum
+
+from complaints.models import Complaint
+from payments.models import Fee
+from rooms.models import Room
+from students.models import Student
+from . import caching, conditional
+
+SCOPES = ('rooms', 'fees', 'complaints')
+EMPTY_ROOMS_SHOWN = 5
+
+
+def stats_key(versions):
+    return 'dashboard:admin:' + ':'.join(str(versions[scope][0]) for scope in SCOPES)
+
+
+def compute_admin_stats():
+    """Dashboard statistics straight from the database"""
+    from rooms.occupancy import rooms_with_occupancy
+
+    total_students = Student.objects.count()
+    total_rooms = Room.objects.count()
+    pending_complaints = Complaint.objects.filter(status='pending').count()
+    # Get paid fees (case-insensitive to handle 'Paid', 'paid', 'PAID')
+    fees = Fee.objects.filter(status__iexact='paid').aggregate(Sum('amount'))
+    rooms = list(rooms_with_occupancy())
+
+    # Count occupied and available rooms correctly
+    # Occupied = completely full (current_occupancy == capacity)
+    # Available = has at least one bed free (current_occupancy < capacity)
+    occupied_rooms = 0
+    available_rooms = 0
+    empty_rooms = []
+    for room in rooms:
+        available_beds = (room.capacity or 0) - room.occupied
+        if available_beds > 0:
+            available_rooms += 1
+            room.available_beds = available_beds
+            empty_rooms.append(room)
+        else:
+            occupied_rooms += 1
+
+    return {
+        'total_students': total_students,
+        'total_rooms': total_rooms,
+        'occupied_rooms': occupied_rooms,
+        'available_rooms': available_rooms,
+        'pending_complaints': pending_complaints,
+        'fees_collected': fees['amount__sum'] or 0,
+        'empty_rooms': empty_rooms[:EMPTY_ROOMS_SHOWN],
+    }
+
+
+def admin_stats(force=False):
+    """Cached dashboard statistics for the current content versions (recomputed when force is true)"""
+    versions = conditional.current(SCOPES)
+    return caching.get_or_set(
+        stats_key(versions), compute_admin_stats,
+        timeout=getattr(settings, 'DASHBOARD_STATS_TIMEOUT', 600), name='dashboard_stats', force=force,
+    )
@@ -0,0 +1,92 @@
+"""
+Primary/replica database routing.
+
+Writes always go to the primary ('default'). Reads go to the replica alias
+(settings.DATABASE_REPLICA_ALIAS) only inside use_replica() or a view wrapped
+with @read_only_view, and only when that alias is configured. Requests made
+right after a write carry a short-lived cookie that pins them to the primary
+so users always see their own changes.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+PIN_COOKIE = 'db_pin_primary'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_alias():
+    """Configured replica alias, or None when no replica is set up"""
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', 'replica')
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def use_replica(enabled=True):
+    """Route reads made inside the block to the replica"""
+    token = _use_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def _should_use_replica(request):
+    return (
+        replica_alias() is not None
+        and request.method in ('GET', 'HEAD')
+        and PIN_COOKIE not in request.COOKIES
+    )
+
+
+def read_only_view(view_func):
+    """Serve a read-only view from the replica unless the request is pinned to the primary"""
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            with use_replica(_should_use_replica(request)):
+                return await view_func(request, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        with use_replica(_should_use_replica(request)):
+            return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    """Send reads to the replica when requested, everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get():
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary and is never migrated directly
+        return db != replica_alias()
+
+
+class PrimaryPinMiddleware(MiddlewareMixin):
+    """After a write request, pin the browser to the primary for a few seconds"""
+
+    def process_response(self, request, response):
+        if replica_alias() is not None and request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=getattr(settings, 'DATABASE_REPLICA_PIN_SECONDS', 10),
+                httponly=True, samesite='Lax',
+            )
+        return response
@@ -0,0 +1,72 @@
+"""
+In-process email queue.
+
+Confirmation emails are handed to a background thread so a slow SMTP server
+does not hold up the worker serving the request. Set EMAIL_QUEUE_ENABLED=False
+to send inline (useful in tests and management commands). Queued emails are
+lost if the process exits before they are sent.
+"""
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from . import metrics
+
+_queue = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def _send(func, args, kwargs):
+    started = time.perf_counter()
+    result = 'ok'
+    try:
+        # The email_utils senders catch their own errors and return False
+        if func(*args, **kwargs) is False:
+            result = 'error'
+    except Exception as e:
+        result = 'error'
+        print(f"Email sending failed: {str(e)}")
+    finally:
+        with metrics.batch():
+            metrics.inc('email_sent_total', result=result)
+            metrics.observe('email_send_duration_seconds', time.perf_counter() - started)
+
+
+def _run():
+    while True:
+        func, args, kwargs = _queue.get()
+        try:
+            _send(func, args, kwargs)
+        finally:
+            close_old_connections()
+            _queue.task_done()
+
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name='email-queue', daemon=True)
+            _worker.start()
+
+
+def enqueue(func, *args, **kwargs):
+    """Send an email with func(*args, **kwargs) on the background sender thread"""
+    metrics.inc('email_queued_total')
+    if not getattr(settings, 'EMAIL_QUEUE_ENABLED', True):
+        _send(func, args, kwargs)
+        return
+    _ensure_worker()
+    _queue.put((func, args, kwargs))
+
+
+def depth():
+    """Number of emails waiting to be sent"""
+    return _queue.qsize()
+
+
+metrics.register_gauge('email_queue_depth', depth)
@@ -0,0 +1,156 @@
+"""
+Per-request database instrumentation.
+
+QueryTimingMiddleware wraps every database connection with
+connection.execute_wrapper() for sampled requests. It records the number of
+queries, the total database time, the slowest statement and the time spent
+outside the database (view code and template rendering). The numbers are added
+as a Server-Timing header and logged as one JSON line on the
+'hostel_management.requests' logger, at DEBUG level. Requests slower than
+REQUEST_TIMING_SLOW_MS are logged as warnings with "slow": true, and their
+slowest statements are saved with query plans (see slow_queries).
+"""
+import heapq
+import itertools
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from . import slow_queries
+
+logger = logging.getLogger('hostel_management.requests')
+
+
+class QueryRecorder:
+    """execute_wrapper that counts and times every statement and keeps the slowest few"""
+
+    def __init__(self, keep=3):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_sql = ''
+        self.keep = keep
+        # Min-heap of (duration_ms, seq, sql, params, alias) for the slowest statements
+        self._slowest = []
+        self._seq = itertools.count()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.count += 1
+            self.total_ms += elapsed
+            if elapsed > self.slowest_ms:
+                self.slowest_ms = elapsed
+                self.slowest_sql = sql
+            if not many and self.keep:
+                entry = (elapsed, next(self._seq), sql, params, context['connection'].alias)
+                if len(self._slowest) < self.keep:
+                    heapq.heappush(self._slowest, entry)
+                elif elapsed > self._slowest[0][0]:
+                    heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self):
+        """(duration_ms, sql, params, alias) of the slowest statements, slowest first"""
+        return [(ms, sql, params, alias) for ms, _, sql, params, alias in sorted(self._slowest, reverse=True)]
+
+
+class QueryTimingMiddleware:
+    """Measure queries, DB time and render time of sampled requests (sync and async)"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _sampled(self):
+        if not getattr(settings, 'REQUEST_TIMING_ENABLED', True):
+            return False
+        return random.random() < getattr(settings, 'REQUEST_TIMING_SAMPLE_RATE', 1.0)
+
+    def _instrument(self, recorder):
+        # 'default' plus the aliases this thread (or async context) already
+        # opened. Other aliases are not set up just to be measured, so the
+        # first replica query of a worker thread goes uncounted.
+        stack = ExitStack()
+        wrapped = {'default': connections['default']}
+        for connection in connections.all(initialized_only=True):
+            wrapped.setdefault(connection.alias, connection)
+        for connection in wrapped.values():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        return stack
+
+    def _finish(self, request, response, recorder, started):
+        total_ms = (time.perf_counter() - started) * 1000
+        render_ms = max(total_ms - recorder.total_ms, 0.0)
+
+        timing = {
+            'method': request.method,
+            'path': request.path,
+            'view': getattr(request.resolver_match, 'view_name', None),
+            'status': response.status_code,
+            'queries': recorder.count,
+            'db_ms': round(recorder.total_ms, 2),
+            'render_ms': round(render_ms, 2),
+            'total_ms': round(total_ms, 2),
+            'slowest_ms': round(recorder.slowest_ms, 2),
+            'slowest_sql': recorder.slowest_sql[:500],
+        }
+        request.timing = timing
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={timing["db_ms"]};desc="{recorder.count} queries"',
+            f'slowest;dur={timing["slowest_ms"]}',
+            f'render;dur={timing["render_ms"]}',
+            f'total;dur={timing["total_ms"]}',
+        ])
+
+        slow = total_ms >= getattr(settings, 'REQUEST_TIMING_SLOW_MS', 500)
+        timing['slow'] = slow
+        # Every request at DEBUG, slow ones as warnings
+        logger.log(logging.WARNING if slow else logging.DEBUG, json.dumps(timing))
+        return timing
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        recorder = QueryRecorder(keep=getattr(settings, 'SLOW_QUERY_CAPTURE_COUNT', 3))
+        started = time.perf_counter()
+        with self._instrument(recorder):
+            response = self.get_response(request)
+        timing = self._finish(request, response, recorder, started)
+        if timing['slow']:
+            slow_queries.capture(timing, recorder.slowest())
+        return response
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        recorder = QueryRecorder(keep=getattr(settings, 'SLOW_QUERY_CAPTURE_COUNT', 3))
+        started = time.perf_counter()
+        # Connections are per thread: wrap the ones of the thread the async
+        # ORM runs this request's queries on, not the event loop's
+        stack = await sync_to_async(self._instrument)(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        timing = self._finish(request, response, recorder, started)
+        if timing['slow']:
+            await sync_to_async(slow_queries.capture)(timing, recorder.slowest())
+        return response
@@ -0,0 +1,92 @@
+"""
+Measure database latency under concurrent load for the current DB_POOL_MODE.
+
+Each thread plays the part of a gunicorn worker: for every simulated request
+it runs the same connection bookkeeping Django does at request start and end
+(close_old_connections), so persistent, pooled and per-request connections
+behave as they would in production.
+
+Usage:
+    DB_POOL_MODE=pgbouncer python manage.py benchmark_db_pool --threads 16 --requests 2000
+    python manage.py benchmark_db_pool --query "SELECT COUNT(*) FROM room" --json
+"""
+import json
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+
+class Command(BaseCommand):
+    help = 'Benchmark p50/p99 database latency under concurrent local load'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent workers')
+        parser.add_argument('--requests', type=int, default=1000, help='Total simulated requests')
+        parser.add_argument('--queries', type=int, default=3, help='Queries per request')
+        parser.add_argument('--query', default='SELECT 1', help='SQL to run for each query')
+        parser.add_argument('--database', default='default', help='Database alias')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        threads = max(1, options['threads'])
+        per_thread = max(1, options['requests'] // threads)
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+
+        def worker():
+            local = []
+            try:
+                for _ in range(per_thread):
+                    started = time.perf_counter()
+                    close_old_connections()
+                    with connections[alias].cursor() as cursor:
+                        for _ in range(options['queries']):
+                            cursor.execute(options['query'])
+                            cursor.fetchall()
+                    close_old_connections()
+                    local.append((time.perf_counter() - started) * 1000)
+            except Exception as e:
+                errors.append(str(e))
+            finally:
+                connections.close_all()
+                with lock:
+                    latencies.extend(local)
+
+        started = time.perf_counter()
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        samples = np.array(latencies) if latencies else np.zeros(1)
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+        results = {
+            'pool_mode': settings.DB_POOL_MODE,
+            'database': alias,
+            'vendor': connections[alias].vendor,
+            'threads': threads,
+            'requests': len(latencies),
+            'queries_per_request': options['queries'],
+            'errors': len(errors),
+            'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0,
+            'p50_ms': round(float(p50), 3),
+            'p95_ms': round(float(p95), 3),
+            'p99_ms': round(float(p99), 3),
+            'max_ms': round(float(samples.max()), 3),
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for key, value in results.items():
+            self.stdout.write(f'{key:>20}: {value}')
+        if errors:
+            self.stdout.write(self.style.ERROR(f'First error: {errors[0]}'))
@@ -0,0 +1,113 @@
+"""
+HTTP load test against a running server, used to compare the WSGI and ASGI
+deployment modes.
+
+Usage:
+    SERVER_MODE=wsgi gunicorn -c gunicorn.conf.py &   # then run:
+    python manage.py loadtest_http --base-url http://127.0.0.1:8000 \\
+        --username admin --password secret --path /dashboard/ --path /rooms/ --json > wsgi.json
+    SERVER_MODE=asgi gunicorn -c gunicorn.conf.py &   # then run the same command > asgi.json
+"""
+import json
+import threading
+import time
+from urllib.parse import urljoin
+
+import numpy as np
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = ['/dashboard/', '/rooms/', '/payments/', '/complaints/']
+
+
+class Command(BaseCommand):
+    help = 'Measure p50/p99 latency and throughput of a running server under concurrent load'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--username', required=True)
+        parser.add_argument('--password', required=True)
+        parser.add_argument('--login-type', default='admin', choices=['admin', 'student'])
+        parser.add_argument('--path', action='append', dest='paths', help='Path to request (repeatable)')
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--requests', type=int, default=500, help='Requests per path')
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def _login(self, base_url, options):
+        session = requests.Session()
+        login_url = urljoin(base_url, '/login/')
+        session.get(login_url, timeout=30)
+        response = session.post(login_url, data={
+            'username': options['username'],
+            'password': options['password'],
+            'login_type': options['login_type'],
+            'csrfmiddlewaretoken': session.cookies.get('csrftoken', ''),
+        }, headers={'Referer': login_url}, allow_redirects=False, timeout=30)
+        if response.status_code != 302 or 'sessionid' not in session.cookies:
+            raise CommandError(f'Login failed for {options["username"]} (HTTP {response.status_code})')
+        return session.cookies.get_dict()
+
+    def _run_path(self, url, cookies, concurrency, total):
+        latencies = []
+        failures = []
+        lock = threading.Lock()
+        per_thread = max(1, total // concurrency)
+
+        def worker():
+            session = requests.Session()
+            session.cookies.update(cookies)
+            local = []
+            for _ in range(per_thread):
+                started = time.perf_counter()
+                try:
+                    response = session.get(url, allow_redirects=False, timeout=60)
+                    if response.status_code != 200:
+                        failures.append(response.status_code)
+                except requests.RequestException as e:
+                    failures.append(str(e))
+                local.append((time.perf_counter() - started) * 1000)
+            with lock:
+                latencies.extend(local)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        p50, p95, p99 = np.percentile(np.array(latencies), [50, 95, 99])
+        return {
+            'requests': len(latencies),
+            'failures': len(failures),
+            'throughput_rps': round(len(latencies) / elapsed, 1),
+            'p50_ms': round(float(p50), 2),
+            'p95_ms': round(float(p95), 2),
+            'p99_ms': round(float(p99), 2),
+        }
+
+    def handle(self, *args, **options):
+        base_url = options['base_url']
+        cookies = self._login(base_url, options)
+        concurrency = max(1, options['concurrency'])
+
+        results = {
+            'base_url': base_url,
+            'concurrency': concurrency,
+            'paths': {},
+        }
+        for path in options['paths'] or DEFAULT_PATHS:
+            results['paths'][path] = self._run_path(
+                urljoin(base_url, path), cookies, concurrency, options['requests']
+            )
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f'{base_url} with {concurrency} concurrent clients')
+        for path, stats in results['paths'].items():
+            self.stdout.write(
+                f"{path:<24} {stats['throughput_rps']:>8} req/s  p50 {stats['p50_ms']} ms  "
+                f"p99 {stats['p99_ms']} ms  failures {stats['failures']}"
+            )
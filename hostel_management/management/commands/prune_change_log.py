@@ -0,0 +1,21 @@
+"""
+Delete old delta-sync change log entries. Clients whose cursor is older than
+the remaining log get a full snapshot (reset) on their next sync.
+
+Usage:
+    python manage.py prune_change_log --days 90
+"""
+from django.core.management.base import BaseCommand
+
+from hostel_management.changelog import prune
+
+
+class Command(BaseCommand):
+    help = 'Delete change log entries older than --days'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90)
+
+    def handle(self, *args, **options):
+        deleted = prune(options['days'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} change log entries.'))
@@ -0,0 +1,220 @@
+"""
+Benchmark the core user journeys against a throwaway database.
+
+A fresh test database is created, filled with synthetic data at the requested
+scale and each journey is requested through the Django test client. Latency
+percentiles and query counts are emitted as JSON so runs can be diffed
+between commits. The main templates are also timed on their own: parse time
+(uncached, including extended and included templates) and render time with
+the context captured from the journey's response. The authenticated GET
+journeys are repeated with each session engine (SESSION_BACKEND) to count the
+session queries per request.
+
+Usage:
+    python manage.py run_benchmarks --scale medium --iterations 30 --output bench.json
+    python manage.py run_benchmarks --students 2000 --complaints 5000 --output bench.json
+"""
+import json
+import subprocess
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+
+from hostel_management import seeding, template_cache
+from hostel_management.db_router import replica_alias
+from hostel_management.testing import PLAIN_STATIC_STORAGES, create_unmanaged_tables
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=settings.BASE_DIR
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Seed a throwaway database and measure latency and query counts of core pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(seeding.SCALES), default='small')
+        parser.add_argument('--hostels', type=int)
+        parser.add_argument('--rooms-per-hostel', type=int)
+        parser.add_argument('--students', type=int)
+        parser.add_argument('--fees-per-student', type=int)
+        parser.add_argument('--complaints', type=int)
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per journey')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Write the JSON results to this file')
+
+    def journeys(self):
+        """(name, login username, method, url, POST data) for every benchmarked journey"""
+        admin, student = seeding.ADMIN_USERNAME, seeding.STUDENT_USERNAME
+        return [
+            ('dashboard_admin', admin, 'get', '/dashboard/', None),
+            ('dashboard_student', student, 'get', '/dashboard/', None),
+            ('room_list', admin, 'get', '/rooms/', None),
+            ('payment_list_admin', admin, 'get', '/payments/', None),
+            ('payment_list_student', student, 'get', '/payments/', None),
+            ('complaint_list_admin', admin, 'get', '/complaints/', None),
+            ('complaint_list_student', student, 'get', '/complaints/', None),
+            ('allocation_add_form', admin, 'get', '/students/allocations/add/', None),
+            ('student_payment_make_form', student, 'get', '/payments/make/', None),
+            ('student_payment_make_submit', student, 'post', '/payments/make/',
+             {'payment_type': 'Hostel', 'amount': '1500'}),
+        ]
+
+    # journey -> template rendered by that journey's view
+    TEMPLATE_JOURNEYS = {
+        'dashboard_admin.html': 'dashboard_admin',
+        'rooms/room_list.html': 'room_list',
+        'payments/payment_list.html': 'payment_list_admin',
+    }
+
+    def measure_template(self, name, response, iterations):
+        context = response.context[0].flatten()
+        parse, render = [], []
+        for _ in range(iterations):
+            parse_ms, chain = template_cache.compile_chain_ms(name)
+            parse.append(parse_ms)
+            render.append(template_cache.render_ms(name, context, response.wsgi_request))
+        return {
+            'parse_ms': round(float(np.median(parse)), 2),
+            'render_ms': round(float(np.median(render)), 2),
+            'templates_parsed': chain,
+        }
+
+    SESSION_BACKENDS = ('db', 'cached_db', 'signed_cookies')
+
+    def measure_sessions(self, iterations):
+        """Median total and django_session queries per request for each session engine"""
+        journeys = [journey for journey in self.journeys() if journey[2] == 'get']
+        sessions = {}
+        for backend in self.SESSION_BACKENDS:
+            results = {}
+            with override_settings(SESSION_ENGINE=f'django.contrib.sessions.backends.{backend}'):
+                clients = {}
+                for name, username, method, url, data in journeys:
+                    if username not in clients:
+                        clients[username] = Client()
+                        clients[username].login(username=username, password=seeding.PASSWORD)
+                    client = clients[username]
+                    client.get(url)  # warm up
+                    total, session = [], []
+                    for _ in range(iterations):
+                        with CaptureQueriesContext(connection) as captured:
+                            client.get(url)
+                        total.append(len(captured))
+                        session.append(sum('django_session' in query['sql'] for query in captured.captured_queries))
+                    results[name] = {
+                        'queries': int(np.median(total)),
+                        'session_queries': int(np.median(session)),
+                    }
+            sessions[backend] = {
+                'session_queries_per_request': round(
+                    float(np.mean([result['session_queries'] for result in results.values()])), 2
+                ),
+                'journeys': results,
+            }
+            self.stderr.write(
+                f"sessions {backend:<19} session queries/request "
+                f"{sessions[backend]['session_queries_per_request']}"
+            )
+        return sessions
+
+    def measure(self, client, method, url, data, iterations):
+        getattr(client, method)(url, data)  # warm up
+        timings = []
+        queries = []
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = getattr(client, method)(url, data)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(captured))
+        p50, p95, p99 = np.percentile(np.array(timings), [50, 95, 99])
+        return response, {
+            'status': response.status_code,
+            'p50_ms': round(float(p50), 2),
+            'p95_ms': round(float(p95), 2),
+            'p99_ms': round(float(p99), 2),
+            'mean_ms': round(float(np.mean(timings)), 2),
+            'queries': int(np.median(queries)),
+            'max_queries': max(queries),
+        }
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        if replica_alias():
+            # Keep replica reads inside the throwaway database
+            connections[replica_alias()].creation.set_as_test_mirror(connection.settings_dict)
+        try:
+            create_unmanaged_tables()
+            started = time.perf_counter()
+            params = dict(seeding.SCALES[options['scale']])
+            for name in params:
+                if options[name] is not None:
+                    params[name] = options[name]
+            counts = seeding.seed(seed_value=options['seed'], **params)
+            seed_seconds = time.perf_counter() - started
+
+            results = {}
+            templates = {}
+            clients = {}
+            with override_settings(
+                EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+                EMAIL_QUEUE_ENABLED=False,
+                ALLOWED_HOSTS=['testserver'],
+                STORAGES=PLAIN_STATIC_STORAGES,
+                # Keep cached values of the throwaway database out of the shared cache
+                CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+            ):
+                for name, username, method, url, data in self.journeys():
+                    if username not in clients:
+                        clients[username] = Client()
+                        clients[username].login(username=username, password=seeding.PASSWORD)
+                    response, results[name] = self.measure(
+                        clients[username], method, url, data, options['iterations']
+                    )
+                    self.stderr.write(
+                        f"{name:<28} p50 {results[name]['p50_ms']:>8} ms  "
+                        f"queries {results[name]['queries']}"
+                    )
+                    for template_name, journey in self.TEMPLATE_JOURNEYS.items():
+                        if journey == name:
+                            templates[template_name] = self.measure_template(
+                                template_name, response, options['iterations']
+                            )
+                            self.stderr.write(
+                                f"  {template_name:<26} parse {templates[template_name]['parse_ms']:>6} ms  "
+                                f"render {templates[template_name]['render_ms']:>6} ms"
+                            )
+                sessions = self.measure_sessions(options['iterations'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'revision': _git_revision(),
+            'database': connection.vendor,
+            'iterations': options['iterations'],
+            'dataset': counts,
+            'seed_seconds': round(seed_seconds, 2),
+            'journeys': results,
+            'templates': templates,
+            'sessions': sessions,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
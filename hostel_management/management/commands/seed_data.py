@@ -0,0 +1,56 @@
+"""
+Fill an empty database with synthetic data at a chosen scale.
+
+Usage:
+    python manage.py seed_data --scale production --create-tables
+    python manage.py seed_data --students 50000 --fees-per-student 8 --seed 7 --rollups
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hostel_management import seeding
+from hostel_management.testing import create_unmanaged_tables
+from students.models import Student
+
+
+class Command(BaseCommand):
+    help = 'Seed hostels, rooms, students, allocations, fees and complaints with bulk_create'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(seeding.SCALES), default='small')
+        parser.add_argument('--hostels', type=int)
+        parser.add_argument('--rooms-per-hostel', type=int)
+        parser.add_argument('--students', type=int)
+        parser.add_argument('--fees-per-student', type=int)
+        parser.add_argument('--complaints', type=int)
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (same seed, same data)')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--create-tables', action='store_true',
+                            help='Create the unmanaged Supabase tables if they are missing (local databases)')
+        parser.add_argument('--rollups', action='store_true',
+                            help='Also build the fee aggregates, complaint rollups and occupancy history')
+
+    def handle(self, *args, **options):
+        if options['create_tables']:
+            create_unmanaged_tables()
+        if Student.objects.exists():
+            raise CommandError('The database already has students; seed_data only fills an empty database.')
+
+        params = dict(seeding.SCALES[options['scale']])
+        for name in params:
+            if options[name] is not None:
+                params[name] = options[name]
+
+        started = time.perf_counter()
+        counts = seeding.seed(seed_value=options['seed'], batch_size=options['batch_size'], **params)
+        elapsed = time.perf_counter() - started
+        for name, count in counts.items():
+            self.stdout.write(f'{name:>16}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'Seeded in {elapsed:.1f}s.'))
+
+        if options['rollups']:
+            from django.core.management import call_command
+            call_command('rebuild_fee_aggregates', stdout=self.stdout)
+            call_command('build_complaint_rollups', '--full', stdout=self.stdout)
+            call_command('backfill_occupancy_history', '--days', '240', stdout=self.stdout)
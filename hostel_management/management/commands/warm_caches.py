@@ -0,0 +1,91 @@
+"""
+Recompute the shared caches so the first page views after a deploy are warm.
+
+Usage:
+    python manage.py warm_caches                          # everything
+    python manage.py warm_caches --only dashboard --only occupancy
+
+Every entry is recomputed, even when it is still fresh, so running this on a
+schedule replaces entries before they expire. It has to write to the cache the
+web workers read: gunicorn starts it when the server is ready (CACHE_WARMUP_ON_START).
+A cron job on another machine only helps with CACHE_BACKEND=redis; the file
+cache lives on the web host, and locmem only in this process.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from complaints.analytics import weekly_report
+from hostel_management import template_cache
+from hostel_management.dashboard import admin_stats
+from rooms.occupancy import hostel_rollups, occupancy_index, utilization_index
+
+
+def _dashboard():
+    stats = admin_stats(force=True)
+    return f"{stats['total_rooms']} rooms, {stats['total_students']} students"
+
+
+def _occupancy():
+    return f'{len(occupancy_index(force=True))} rooms'
+
+
+def _hostels():
+    hostels = hostel_rollups(force=True)
+    utilization_index(force=True)
+    return f'{len(hostels)} hostels'
+
+
+def _complaints():
+    return f'{len(weekly_report(force=True))} report rows'
+
+
+def _templates():
+    # The template cache is per process: this checks that every template
+    # compiles; workers fill their own cache at startup (TEMPLATE_WARMUP).
+    return f'{template_cache.warm()} templates'
+
+
+STEPS = {
+    'dashboard': ('dashboard stats', _dashboard),
+    'occupancy': ('occupancy index', _occupancy),
+    'hostels': ('hostel rollups', _hostels),
+    'complaints': ('complaint report', _complaints),
+    'templates': ('templates', _templates),
+}
+
+
+class Command(BaseCommand):
+    help = 'Precompute dashboard stats, occupancy, hostel rollups and templates into the shared cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only', action='append', choices=sorted(STEPS),
+            help='Warm only this cache (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        if getattr(settings, 'CACHE_BACKEND', '') == 'locmem':
+            self.stdout.write(self.style.WARNING(
+                'CACHE_BACKEND=locmem is per process; the warmed values will not reach the web workers.'
+            ))
+
+        failed = []
+        started = time.perf_counter()
+        for step in options['only'] or STEPS:
+            label, warm = STEPS[step]
+            step_started = time.perf_counter()
+            try:
+                detail = warm()
+            except Exception as exc:
+                failed.append(step)
+                self.stdout.write(self.style.ERROR(f'{label:<18} failed: {exc}'))
+                continue
+            ms = (time.perf_counter() - step_started) * 1000
+            self.stdout.write(f'{label:<18} {ms:9.1f} ms  {detail}')
+
+        total_ms = (time.perf_counter() - started) * 1000
+        if failed:
+            raise CommandError(f'Could not warm: {", ".join(failed)} ({total_ms:.1f} ms)')
+        self.stdout.write(self.style.SUCCESS(f'Warmed caches in {total_ms:.1f} ms.'))
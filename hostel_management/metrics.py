@@ -0,0 +1,307 @@
+"""
+Prometheus-style metrics without an external service.
+
+Counters and histograms are added up in memory and flushed every
+METRICS_FLUSH_SECONDS by a background thread into a small SQLite file
+(METRICS_DB_PATH) shared by every gunicorn worker on the host, so a scrape of
+/metrics returns the totals of all workers rather than those of whichever
+worker answered. Recording a metric never touches the file on the request
+path. A flush is one transaction of UPSERTs in WAL mode; failures are logged
+and the increments are kept for the next flush.
+
+Gauges such as the email queue depth are read from a callback
+(register_gauge) at every flush and stored per process; a scrape adds up the
+values of processes that flushed recently, so a worker that exits stops
+counting instead of leaving its last value behind.
+"""
+import atexit
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# name -> (type, help)
+REGISTRY = {
+    'http_requests_total': ('counter', 'Requests by URL name and status code'),
+    'http_request_duration_seconds': ('histogram', 'Request latency by URL name'),
+    'http_db_queries_total': ('counter', 'Database queries by URL name (instrumented requests only)'),
+    'http_db_query_seconds_total': ('counter', 'Database time by URL name (instrumented requests only)'),
+    'cache_requests_total': ('counter', 'Cache lookups by cache and result (hit/miss)'),
+    'cache_hit_ratio': ('gauge', 'Share of cache lookups that were hits'),
+    'email_queued_total': ('counter', 'Emails handed to the email queue'),
+    'email_sent_total': ('counter', 'Emails processed by the sender, by result'),
+    'email_send_duration_seconds': ('histogram', 'Time spent sending one email'),
+    'email_queue_depth': ('gauge', 'Emails queued but not yet processed, across workers'),
+    'occupancy_recomputations_total': ('counter', 'Occupancy computations by kind'),
+    'sse_streams_opened_total': ('counter', 'Server-sent event streams opened, by stream'),
+    'sse_streams_closed_total': ('counter', 'Server-sent event streams closed, by stream'),
+    'sse_streams_open': ('gauge', 'Server-sent event streams currently open, across workers'),
+}
+
+_local = threading.local()
+
+# Increments not yet written to the file: (name, labels) -> value
+_buffer = defaultdict(float)
+_buffer_lock = threading.Lock()
+# (name, labels) -> callback returning this process's current value
+_gauges = {}
+_flusher = None
+_flusher_lock = threading.Lock()
+
+
+def enabled():
+    return getattr(settings, 'METRICS_ENABLED', True)
+
+
+def _db_path():
+    return getattr(settings, 'METRICS_DB_PATH', None) or os.path.join(
+        tempfile.gettempdir(), 'hostel_management_metrics.sqlite3'
+    )
+
+
+def _connection():
+    # One connection per thread and process; forked workers open their own
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.pid != os.getpid():
+        conn = sqlite3.connect(_db_path(), timeout=5, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS metric ('
+            'name TEXT NOT NULL, labels TEXT NOT NULL, value REAL NOT NULL, '
+            'PRIMARY KEY (name, labels))'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS gauge ('
+            'name TEXT NOT NULL, labels TEXT NOT NULL, pid INTEGER NOT NULL, '
+            'value REAL NOT NULL, updated REAL NOT NULL, '
+            'PRIMARY KEY (name, labels, pid))'
+        )
+        _local.conn, _local.pid = conn, os.getpid()
+    return conn
+
+
+def _format_labels(labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{key}="{escape(value)}"' for key, value in sorted(labels.items()))
+
+
+def _flush_seconds():
+    return getattr(settings, 'METRICS_FLUSH_SECONDS', 5)
+
+
+def _gauge_max_age():
+    # A process that has not flushed for this long is assumed to be gone
+    return _flush_seconds() * 3
+
+
+def _write(increments, gauges):
+    conn = _connection()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        conn.executemany(
+            'INSERT INTO metric (name, labels, value) VALUES (?, ?, ?) '
+            'ON CONFLICT (name, labels) DO UPDATE SET value = value + excluded.value',
+            [(name, labels, value) for (name, labels), value in increments.items()],
+        )
+        now = time.time()
+        conn.executemany(
+            'INSERT INTO gauge (name, labels, pid, value, updated) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT (name, labels, pid) DO UPDATE SET value = excluded.value, updated = excluded.updated',
+            [(name, labels, os.getpid(), value, now) for (name, labels), value in gauges.items()],
+        )
+        conn.execute('DELETE FROM gauge WHERE updated < ?', (now - _gauge_max_age(),))
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+
+
+def flush():
+    """Write this process's buffered counters and current gauge values to the shared file"""
+    with _buffer_lock:
+        increments = dict(_buffer)
+        _buffer.clear()
+    gauges = {}
+    for key, read in list(_gauges.items()):
+        try:
+            gauges[key] = float(read())
+        except Exception as e:
+            logger.warning('Could not read gauge %s: %s', key[0], e)
+    if not (increments or gauges):
+        return
+    try:
+        _write(increments, gauges)
+    except sqlite3.Error as e:
+        logger.warning('Could not record metrics: %s', e)
+        # Keep the increments for the next flush
+        with _buffer_lock:
+            for key, value in increments.items():
+                _buffer[key] += value
+
+
+def _run():
+    while True:
+        time.sleep(_flush_seconds())
+        flush()
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _flusher_lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(target=_run, name='metrics-flush', daemon=True)
+            _flusher.start()
+
+
+def _after_fork():
+    # A forked worker starts with the parent's unflushed increments and no
+    # flusher thread; drop the copies so they are not counted twice
+    global _buffer_lock, _flusher
+    _buffer_lock = threading.Lock()
+    _buffer.clear()
+    _flusher = None
+
+
+os.register_at_fork(after_in_child=_after_fork)
+atexit.register(flush)
+
+
+def _add(name, value, labels):
+    pending = getattr(_local, 'pending', None)
+    key = (name, _format_labels(labels))
+    if pending is not None:
+        pending[key] += value
+        return
+    with _buffer_lock:
+        _buffer[key] += value
+    _ensure_flusher()
+
+
+@contextmanager
+def batch():
+    """Add every metric recorded inside the block to the buffer at once"""
+    if getattr(_local, 'pending', None) is not None:
+        yield
+        return
+    _local.pending = defaultdict(float)
+    try:
+        yield
+    finally:
+        pending, _local.pending = _local.pending, None
+        if pending and enabled():
+            with _buffer_lock:
+                for key, value in pending.items():
+                    _buffer[key] += value
+            _ensure_flusher()
+
+
+def inc(name, value=1, **labels):
+    """Increase a counter"""
+    if enabled():
+        _add(name, value, labels)
+
+
+def register_gauge(name, read, **labels):
+    """Report read() as this process's value of a gauge at every flush"""
+    _gauges[(name, _format_labels(labels))] = read
+
+
+def observe(name, value, buckets=LATENCY_BUCKETS, **labels):
+    """Record one observation in a histogram"""
+    if not enabled():
+        return
+    with batch():
+        for bound in buckets:
+            if value <= bound:
+                _add(f'{name}_bucket', 1, {**labels, 'le': str(bound)})
+        _add(f'{name}_bucket', 1, {**labels, 'le': '+Inf'})
+        _add(f'{name}_sum', value, labels)
+        _add(f'{name}_count', 1, labels)
+
+
+def _family(sample_name):
+    for suffix in ('_bucket', '_sum', '_count'):
+        base = sample_name[:-len(suffix)] if sample_name.endswith(suffix) else None
+        if base and REGISTRY.get(base, ('',))[0] == 'histogram':
+            return base
+    return sample_name
+
+
+def _derived_gauges(rows):
+    """Cache hit ratios computed at scrape time from the shared counters"""
+    caches = defaultdict(lambda: {'hit': 0.0, 'miss': 0.0})
+    for name, labels, value in rows:
+        if name == 'cache_requests_total':
+            parts = dict(part.split('=', 1) for part in labels.split(','))
+            caches[parts['cache']][parts['result'].strip('"')] += value
+    gauges = []
+    for cache_name, counts in sorted(caches.items()):
+        lookups = counts['hit'] + counts['miss']
+        gauges.append(('cache_hit_ratio', f'cache={cache_name}', counts['hit'] / lookups if lookups else 0))
+    return gauges
+
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    # Other workers' values are at most METRICS_FLUSH_SECONDS old; this one's are current
+    flush()
+    conn = _connection()
+    rows = conn.execute('SELECT name, labels, value FROM metric ORDER BY name, rowid').fetchall()
+    rows += _derived_gauges(rows)
+    rows += conn.execute(
+        'SELECT name, labels, SUM(value) FROM gauge WHERE updated >= ? GROUP BY name, labels ORDER BY name, labels',
+        (time.time() - _gauge_max_age(),),
+    ).fetchall()
+
+    families = defaultdict(list)
+    for name, labels, value in rows:
+        families[_family(name)].append((name, labels, value))
+
+    lines = []
+    for family in sorted(families):
+        metric_type, help_text = REGISTRY.get(family, ('untyped', ''))
+        lines.append(f'# HELP {family} {help_text}')
+        lines.append(f'# TYPE {family} {metric_type}')
+        for name, labels, value in families[family]:
+            sample = f'{name}{{{labels}}}' if labels else name
+            lines.append(f'{sample} {float(value)!r}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """Record latency, status and query counts of every request by URL name"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        if not enabled():
+            return response
+
+        match = request.resolver_match
+        # Unresolved paths share one label to keep the series count bounded
+        view = match.view_name if match else 'unmatched'
+        with batch():
+            inc('http_requests_total', view=view, status=response.status_code)
+            observe('http_request_duration_seconds', time.perf_counter() - started, view=view)
+            timing = getattr(request, 'timing', None)
+            if timing:
+                inc('http_db_queries_total', timing['queries'], view=view)
+                inc('http_db_query_seconds_total', timing['db_ms'] / 1000, view=view)
+        return response
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hostel_management', '0002_content_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('student_id', models.IntegerField()),
+                ('model', models.CharField(max_length=50)),
+                ('object_id', models.IntegerField()),
+                ('action', models.CharField(choices=[('upsert', 'Created or updated'), ('delete', 'Deleted')], max_length=10)),
+                ('changed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'change_log',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['student_id', 'id'], name='change_log_student_id_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+from django.db import models
+
+
+class SlowQuery(models.Model):
+    """A slow statement from a request over the latency budget, with its query plan"""
+    
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    view = models.CharField(max_length=200, blank=True)
+    request_ms = models.FloatField(help_text='Total time of the request')
+    duration_ms = models.FloatField(help_text='Time of this statement')
+    database = models.CharField(max_length=100, default='default')
+    sql = models.TextField()
+    params = models.TextField(blank=True)
+    # EXPLAIN (COSTS) on PostgreSQL, or EXPLAIN (ANALYZE, BUFFERS) with
+    # SLOW_QUERY_EXPLAIN_ANALYZE=True; EXPLAIN QUERY PLAN on SQLite
+    plan = models.TextField(blank=True)
+    
+    def __str__(self):
+        return f"{self.view or self.path} - {self.duration_ms:.0f} ms"
+    
+    class Meta:
+        db_table = 'slow_query'
+        ordering = ['-created_at']
+        verbose_name = 'Slow Query'
+        verbose_name_plural = 'Slow Queries'
+
+
+class ContentVersion(models.Model):
+    """Counter bumped on every write to a group of tables, used for ETags"""
+    
+    key = models.CharField(max_length=50, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField()
+    
+    def __str__(self):
+        return f"{self.key} v{self.version}"
+    
+    class Meta:
+        db_table = 'content_version'
+
+
+class ChangeLogEntry(models.Model):
+    """One insert, update or delete of a student's fee, payment, complaint or allocation"""
+    
+    ACTION_CHOICES = [
+        ('upsert', 'Created or updated'),
+        ('delete', 'Deleted'),
+    ]
+    
+    id = models.BigAutoField(primary_key=True)
+    student_id = models.IntegerField()
+    model = models.CharField(max_length=50)
+    object_id = models.IntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    changed_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"#{self.pk} {self.action} {self.model} {self.object_id}"
+    
+    class Meta:
+        db_table = 'change_log'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['student_id', 'id'], name='change_log_student_id_idx'),
+        ]
@@ -0,0 +1,218 @@
+"""
+Publish/subscribe for pushing live updates to open pages.
+
+publish(channel, message) hands a JSON-serialisable dict to every subscriber
+of the channel once the current transaction commits. Subscribers are the
+server-sent event streams served under ASGI (see complaints.stream); they
+wait with `async with subscribe(channel) as subscription`. How messages get
+from publishers to subscribers is up to the backend named by PUBSUB_BACKEND:
+
+- InProcessBackend (default) delivers to subscribers in the same process. It
+  needs no other service, so it is what development and tests use, but with
+  several workers a stream only sees messages published by its own worker.
+- PostgresNotifyBackend sends messages with pg_notify and listens on a
+  dedicated connection, so every worker on the same database receives them.
+  LISTEN needs a session connection: it does not work through Supabase's
+  transaction pooler (port 6543). The listening connection is opened
+  directly, also with DB_POOL_MODE=native, and works with psycopg2 and
+  psycopg 3.
+
+Delivery is best effort. A subscriber that falls behind, or a message too big
+for NOTIFY, gets a {'type': 'resync'} message instead, and the stream should
+send the current state.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, connections, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+RESYNC = {'type': 'resync'}
+
+
+class Subscription:
+    """Messages of one channel for one async consumer"""
+
+    def __init__(self, hub, channel, maxsize=100):
+        self.hub = hub
+        self.channel = channel
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize)
+
+    def put(self, message):
+        """Queue a message; safe to call from any thread"""
+        try:
+            self._loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # The consumer's event loop is closed
+            pass
+
+    def _put(self, message):
+        if self._queue.full():
+            # Too slow to keep up: drop the backlog and ask for a resync
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            message = RESYNC
+        self._queue.put_nowait(message)
+
+    async def get(self, timeout=None):
+        """Next message, or None when nothing arrives within timeout seconds"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.hub.unsubscribe(self)
+
+
+class Hub:
+    """Subscriptions of this process, by channel"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+    def deliver(self, channel, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    def count(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+
+class InProcessBackend:
+    """Delivers messages to the subscribers of this process only"""
+
+    def __init__(self, hub):
+        self.hub = hub
+
+    def start(self):
+        pass
+
+    def publish(self, channel, message):
+        self.hub.deliver(channel, message)
+
+
+class PostgresNotifyBackend:
+    """Delivers messages to every process listening on the default database"""
+
+    NOTIFY_CHANNEL = 'hostel_pubsub'
+    # NOTIFY payloads must be shorter than 8000 bytes
+    MAX_PAYLOAD = 7900
+
+    def __init__(self, hub):
+        self.hub = hub
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._listen_forever, name='pubsub-listen', daemon=True)
+                self._thread.start()
+
+    def publish(self, channel, message):
+        payload = json.dumps({'channel': channel, 'message': message}, cls=DjangoJSONEncoder)
+        if len(payload.encode()) > self.MAX_PAYLOAD:
+            payload = json.dumps({'channel': channel, 'message': RESYNC})
+        with connections['default'].cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [self.NOTIFY_CHANNEL, payload])
+
+    def _listen_forever(self):
+        while True:
+            try:
+                self._listen()
+            except Exception as e:
+                logger.warning('Pub/sub listener lost its connection: %s', e)
+            time.sleep(5)
+
+    def _deliver(self, payload):
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            return
+        self.hub.deliver(data['channel'], data['message'])
+
+    def _listen(self):
+        wrapper = connections.create_connection('default')
+        # Database.connect() rather than get_new_connection(), which would take
+        # a connection from the native pool and keep it busy for good
+        conn = wrapper.Database.connect(**wrapper.get_connection_params())
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN {self.NOTIFY_CHANNEL}')
+            if callable(conn.notifies):
+                # psycopg 3: blocks until a notification arrives
+                for notify in conn.notifies():
+                    self._deliver(notify.payload)
+            else:
+                # psycopg2: wait for the socket, then read what arrived
+                while True:
+                    if select.select([conn], [], [], 60) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._deliver(conn.notifies.pop(0).payload)
+        finally:
+            conn.close()
+
+
+hub = Hub()
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            path = getattr(settings, 'PUBSUB_BACKEND', 'hostel_management.pubsub.InProcessBackend')
+            _backend = import_string(path)(hub)
+        return _backend
+
+
+def publish(channel, message):
+    """Send a message to the channel's subscribers after the current transaction commits"""
+    def send():
+        try:
+            get_backend().publish(channel, message)
+        except DatabaseError as e:
+            logger.warning('Could not publish to %s: %s', channel, e)
+    transaction.on_commit(send)
+
+
+def subscribe(channel):
+    """Subscription to a channel; must be created inside the consumer's event loop"""
+    get_backend().start()
+    return hub.subscribe(channel)
@@ -0,0 +1,199 @@
+"""
+Synthetic data for local benchmarks and performance investigations.
+
+seed() fills an empty database with hostels, rooms, students, profiles,
+allocations, fees, payment records and complaints using bulk_create in large
+batches. Random values come from a seeded NumPy generator, so the same
+arguments always produce the same dataset. Allocations never exceed room
+capacity; students beyond the available beds stay unallocated. Complaints
+are skewed: a small share of students and categories account for most of them.
+"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from complaints.models import Complaint
+from hostel_management import conditional
+from payments.models import Fee, PaymentRecord
+from rooms.models import Hostel, Room
+from students.models import Allocation, Student, StudentProfile, UserProfile
+
+ADMIN_USERNAME = 'bench_admin'
+STUDENT_USERNAME = 'bench_student'
+PASSWORD = 'bench-password'
+
+SCALES = {
+    'small': dict(hostels=3, rooms_per_hostel=50, students=300, fees_per_student=4, complaints=300),
+    'medium': dict(hostels=10, rooms_per_hostel=200, students=5000, fees_per_student=6, complaints=5000),
+    'production': dict(hostels=20, rooms_per_hostel=600, students=30000, fees_per_student=10, complaints=60000),
+}
+
+ROOM_TYPES = {1: 'Single', 2: 'Double', 3: 'Triple'}
+FEE_AMOUNTS = [1500, 5000, 12000, 45000, 60000]
+CATEGORY_WEIGHTS = [0.35, 0.2, 0.15, 0.15, 0.05, 0.1]
+UPDATE_BATCH_SIZE = 500
+
+
+def _bulk_insert(model, objs, batch_size):
+    """bulk_create that returns the new primary keys on every backend"""
+    last_pk = model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+    model.objects.bulk_create(objs, batch_size=batch_size)
+    return list(model.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True))
+
+
+def _backdate(model, pks, timestamps, fields):
+    """
+    Set auto_now / auto_now_add fields of freshly inserted rows to historical
+    values; bulk_create always stores the current time in them, bulk_update
+    does not touch them
+    """
+    objs = [model(pk=pk, **dict(zip(fields, values))) for pk, values in zip(pks, timestamps)]
+    # Each batch is one UPDATE ... CASE WHEN pk = ...; long CASE lists get slow
+    model.objects.bulk_update(objs, fields, batch_size=UPDATE_BATCH_SIZE)
+
+
+def seed(hostels=3, rooms_per_hostel=50, students=300, fees_per_student=4,
+         complaints=300, seed_value=42, batch_size=5000, create_users=True):
+    """Create a synthetic dataset and return the row counts"""
+    rng = np.random.default_rng(seed_value)
+    today = date.today()
+    tz = timezone.get_current_timezone()
+    now = timezone.now()
+
+    # Hostels and rooms: room numbers encode the floor (20 rooms per floor)
+    hostel_ids = _bulk_insert(Hostel, [
+        Hostel(name=f'Hostel {i + 1}', location=f'Block {chr(65 + i % 26)}', totalrooms=rooms_per_hostel)
+        for i in range(hostels)
+    ], batch_size)
+    capacities = rng.choice([1, 2, 3], size=hostels * rooms_per_hostel, p=[0.2, 0.5, 0.3])
+    room_ids = _bulk_insert(Room, [
+        Room(
+            hostelid_id=hostel_id,
+            roomnumber=str((n // 20 + 1) * 100 + n % 20 + 1),
+            capacity=int(capacities[h * rooms_per_hostel + n]),
+            type=ROOM_TYPES[int(capacities[h * rooms_per_hostel + n])],
+        )
+        for h, hostel_id in enumerate(hostel_ids)
+        for n in range(rooms_per_hostel)
+    ], batch_size)
+
+    # Students; the first one matches the benchmark student login by name
+    departments = [code for code, _ in Student.DEPARTMENT_CHOICES]
+    genders = rng.choice(['Male', 'Female'], size=students)
+    student_departments = rng.choice(departments, size=students)
+    phones = rng.integers(9000000000, 9999999999, size=students)
+    student_ids = _bulk_insert(Student, [
+        Student(
+            name=STUDENT_USERNAME if i == 0 else f'Student {i}',
+            gender=str(genders[i]),
+            department=str(student_departments[i]),
+            phone=str(phones[i]),
+        )
+        for i in range(students)
+    ], batch_size)
+
+    messes = [code for code, _ in StudentProfile.MESS_CHOICES]
+    profile_messes = rng.choice(messes, size=students)
+    birth_offsets = rng.integers(17 * 365, 25 * 365, size=students)
+    StudentProfile.objects.bulk_create([
+        StudentProfile(
+            student_id=student_id,
+            hostel_mess=str(profile_messes[i]),
+            date_of_birth=today - timedelta(days=int(birth_offsets[i])),
+        )
+        for i, student_id in enumerate(student_ids)
+    ], batch_size=batch_size)
+
+    # One bed per allocated student, never more than the room capacity
+    beds = np.repeat(np.array(room_ids), capacities)
+    rng.shuffle(beds)
+    allocated = min(len(beds), len(student_ids))
+    allocation_offsets = rng.integers(0, 240, size=allocated)
+    Allocation.objects.bulk_create([
+        Allocation(
+            student_id=student_ids[i],
+            room_id=int(beds[i]),
+            date_of_allocation=today - timedelta(days=int(allocation_offsets[i])),
+        )
+        for i in range(allocated)
+    ], batch_size=batch_size)
+
+    # Fees: mostly paid, with due dates spread over the last year
+    fee_total = students * fees_per_student
+    fee_students = np.repeat(np.array(student_ids), fees_per_student)
+    amounts = rng.choice(FEE_AMOUNTS, size=fee_total)
+    due_offsets = rng.integers(-60, 365, size=fee_total)
+    paid = rng.random(fee_total) < 0.8
+    fee_ids = _bulk_insert(Fee, [
+        Fee(
+            studentid_id=int(fee_students[i]),
+            amount=Decimal(int(amounts[i])),
+            duedate=today - timedelta(days=int(due_offsets[i])),
+            status='Paid' if paid[i] else 'Not Paid',
+        )
+        for i in range(fee_total)
+    ], batch_size)
+
+    payment_types = [code for code, _ in PaymentRecord.PAYMENT_TYPE_CHOICES]
+    record_types = rng.choice(payment_types, size=fee_total, p=[0.45, 0.35, 0.1, 0.1])
+    record_ids = _bulk_insert(PaymentRecord, [
+        PaymentRecord(fee_id=fee_id, payment_type=str(record_types[i]))
+        for i, fee_id in enumerate(fee_ids)
+        if paid[i]
+    ], batch_size)
+    _backdate(PaymentRecord, record_ids, [
+        (timezone.make_aware(datetime.combine(today - timedelta(days=int(due_offsets[i])), time(10)), tz),)
+        for i in range(fee_total)
+        if paid[i]
+    ], ['created_at'])
+
+    # Complaints: Zipf-distributed across students, weighted across categories
+    if not student_ids:
+        complaints = 0
+    categories = [code for code, _ in Complaint.CATEGORY_CHOICES]
+    complainants = (rng.zipf(1.3, size=complaints) - 1) % len(student_ids)
+    complaint_categories = rng.choice(categories, size=complaints, p=CATEGORY_WEIGHTS)
+    created_hours = rng.integers(0, 180 * 24, size=complaints)
+    # Resolution times are long-tailed: most within a day, some take weeks
+    resolution_hours = np.minimum(rng.lognormal(2.5, 1.2, size=complaints), created_hours)
+    status_draw = rng.random(complaints)
+    complaint_objs, complaint_times = [], []
+    for i in range(complaints):
+        created_at = now - timedelta(hours=int(created_hours[i]))
+        status = 'resolved' if status_draw[i] < 0.7 else ('in_progress' if status_draw[i] < 0.85 else 'pending')
+        resolved_at = created_at + timedelta(hours=float(resolution_hours[i])) if status == 'resolved' else None
+        complaint_objs.append(Complaint(
+            student_id=student_ids[int(complainants[i])],
+            category=str(complaint_categories[i]),
+            subject=f'Complaint {i}',
+            description='Synthetic complaint for benchmarking.',
+            status=status,
+            resolved_at=resolved_at,
+        ))
+        complaint_times.append((created_at, resolved_at or created_at))
+    complaint_ids = _bulk_insert(Complaint, complaint_objs, batch_size)
+    _backdate(Complaint, complaint_ids, complaint_times, ['created_at', 'updated_at'])
+
+    if create_users:
+        if not User.objects.filter(username=ADMIN_USERNAME).exists():
+            User.objects.create_superuser(ADMIN_USERNAME, 'bench_admin@example.com', PASSWORD)
+        if not User.objects.filter(username=STUDENT_USERNAME).exists():
+            student_user = User.objects.create_user(STUDENT_USERNAME, 'bench_student@example.com', PASSWORD)
+            UserProfile.objects.create(user=student_user, role='student')
+
+    # bulk_create skips the signals that invalidate cached pages
+    conditional.bump(*conditional.SCOPES)
+
+    return {
+        'hostels': len(hostel_ids),
+        'rooms': len(room_ids),
+        'beds': int(capacities.sum()),
+        'students': len(student_ids),
+        'allocations': allocated,
+        'fees': len(fee_ids),
+        'payment_records': int(paid.sum()),
+        'complaints': complaints,
+    }
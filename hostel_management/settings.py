@@ -4,7 +4,10 @@ Django settings for hostel_management project.
 
 from pathlib import Path
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 import os
+import sys
+import tempfile
 from dotenv import load_dotenv
 import dj_database_url
 
@@ -45,32 +48,48 @@ INSTALLED_APPS = [
     # Third party apps
     'crispy_forms',
     'crispy_bootstrap5',
+    'rest_framework',
+    'rest_framework.authtoken',
     
     # Local apps
+    'hostel_management',
     'students',
     'rooms',
     'complaints',
     'payments',
+    'api',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'hostel_management.metrics.MetricsMiddleware',
+    'hostel_management.instrumentation.QueryTimingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'hostel_management.db_router.PrimaryPinMiddleware',
 ]
 
 ROOT_URLCONF = 'hostel_management.urls'
 
+# Templates are parsed once per process by the cached loader, also with
+# DEBUG=True (runserver's autoreloader clears it when a template changes).
+# TEMPLATE_WARMUP compiles all project templates when a worker starts.
+TEMPLATE_CACHE_ENABLED = config('TEMPLATE_CACHE_ENABLED', default=True, cast=bool)
+TEMPLATE_WARMUP = config('TEMPLATE_WARMUP', default=True, cast=bool)
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -78,11 +97,15 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+            ] if TEMPLATE_CACHE_ENABLED else TEMPLATE_LOADERS,
         },
     },
 ]
 
 WSGI_APPLICATION = 'hostel_management.wsgi.application'
+ASGI_APPLICATION = 'hostel_management.asgi.application'
 
 # Database - Supabase PostgreSQL
 DATABASE_URL = config('DATABASE_URL', default=None)
@@ -107,6 +130,141 @@ else:
         }
     }
 
+# Connection pooling mode (DB_POOL_MODE), applied to every PostgreSQL alias:
+#   persistent - one long-lived connection per worker (CONN_MAX_AGE=600 with
+#                DATABASE_URL). Default.
+#   native     - Django's built-in psycopg 3 pool per worker process. Needs
+#                `pip install -r requirements-pool.txt`. Keep
+#                DB_POOL_MAX_SIZE * workers (* instances) below the database limit.
+#   pgbouncer  - for Supabase's transaction pooler (port 6543) or PgBouncer in
+#                transaction mode: connections are closed after each request and
+#                server-side cursors are disabled, since they break across pooled
+#                transactions. Size the pool on the PgBouncer side instead.
+DB_POOL_MODE = config('DB_POOL_MODE', default='persistent')
+DB_POOL_MIN_SIZE = config('DB_POOL_MIN_SIZE', default=1, cast=int)
+DB_POOL_MAX_SIZE = config('DB_POOL_MAX_SIZE', default=4, cast=int)
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=10, cast=int)
+
+
+def apply_pool_mode(database):
+    """Adjust one DATABASES entry for DB_POOL_MODE (PostgreSQL only)"""
+    if 'postgresql' not in database.get('ENGINE', ''):
+        return database
+    if DB_POOL_MODE == 'native':
+        try:
+            import psycopg_pool  # noqa: F401
+        except ImportError:
+            raise ImproperlyConfigured('DB_POOL_MODE=native requires psycopg 3: pip install -r requirements-pool.txt')
+        database['CONN_MAX_AGE'] = 0
+        database['CONN_HEALTH_CHECKS'] = False
+        database.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+        }
+    elif DB_POOL_MODE == 'pgbouncer':
+        database['CONN_MAX_AGE'] = 0
+        database['DISABLE_SERVER_SIDE_CURSORS'] = True
+    elif DB_POOL_MODE != 'persistent':
+        raise ImproperlyConfigured(f'Unknown DB_POOL_MODE: {DB_POOL_MODE}')
+    return database
+
+
+apply_pool_mode(DATABASES['default'])
+
+# Name of the database `manage.py test` creates. SQLite defaults to a file
+# rather than memory, so tests that use several connections at once (e.g.
+# the concurrent payment tests) can run.
+DATABASE_TEST_NAME = config('DATABASE_TEST_NAME', default='')
+if DATABASE_TEST_NAME:
+    DATABASES['default']['TEST'] = {'NAME': DATABASE_TEST_NAME}
+elif DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default']['TEST'] = {
+        'NAME': os.path.join(tempfile.gettempdir(), 'hostel_management_test.sqlite3'),
+    }
+
+# Optional read replica for list, dashboard and report pages
+# Views wrapped with @read_only_view read from it; writes always use 'default'.
+DATABASE_REPLICA_URL = config('DATABASE_REPLICA_URL', default=None)
+DATABASE_REPLICA_ALIAS = config('DATABASE_REPLICA_ALIAS', default='replica')
+# Seconds a browser stays on the primary after a write (read-your-writes)
+DATABASE_REPLICA_PIN_SECONDS = config('DATABASE_REPLICA_PIN_SECONDS', default=10, cast=int)
+
+if DATABASE_REPLICA_URL:
+    DATABASES[DATABASE_REPLICA_ALIAS] = dj_database_url.config(
+        default=DATABASE_REPLICA_URL,
+        conn_max_age=600,
+        conn_health_checks=True,
+    )
+    # Tests read the replica through the default test database
+    DATABASES[DATABASE_REPLICA_ALIAS]['TEST'] = {'MIRROR': 'default'}
+    apply_pool_mode(DATABASES[DATABASE_REPLICA_ALIAS])
+
+# Separate SQLite file the replica routing tests (hostel_management/tests.py)
+# use as the replica, so they can check which database a query really hit.
+# Nothing reads from it unless a test makes it DATABASE_REPLICA_ALIAS.
+if sys.argv[1:2] == ['test']:
+    DATABASES['routing_test_replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(tempfile.gettempdir(), 'hostel_management_replica.sqlite3'),
+        'TEST': {'NAME': os.path.join(tempfile.gettempdir(), 'hostel_management_test_replica.sqlite3')},
+    }
+
+DATABASE_ROUTERS = ['hostel_management.db_router.PrimaryReplicaRouter']
+
+# Part of every page ETag, so a deploy invalidates pages cached by browsers
+# (Render sets RENDER_GIT_COMMIT)
+RELEASE_VERSION = config('RELEASE_VERSION', default=os.getenv('RENDER_GIT_COMMIT', ''))
+
+# Cache shared by all workers (CACHE_BACKEND):
+#   file   - files under CACHE_DIR, shared by the workers on one host. Default.
+#   redis  - a Redis-compatible server at CACHE_URL, shared by every instance.
+#            Needs `pip install redis`.
+#   locmem - per-process memory; used automatically by `manage.py test`.
+# Bump CACHE_VERSION to drop every cached value at once (e.g. after a deploy
+# that changes the shape of a cached value).
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem' if sys.argv[1:2] == ['test'] else 'file')
+CACHE_DIR = config('CACHE_DIR', default=os.path.join(tempfile.gettempdir(), 'hostel_management_cache'))
+CACHE_URL = config('CACHE_URL', default='redis://127.0.0.1:6379/1')
+CACHE_KEY_PREFIX = config('CACHE_KEY_PREFIX', default='hostel')
+CACHE_VERSION = config('CACHE_VERSION', default=1, cast=int)
+CACHE_TIMEOUT = config('CACHE_TIMEOUT', default=300, cast=int)
+# Lifetime of the admin dashboard statistics; writes to rooms, fees or
+# complaints start a new key, so this only bounds how long unused entries stay
+DASHBOARD_STATS_TIMEOUT = config('DASHBOARD_STATS_TIMEOUT', default=600, cast=int)
+
+if CACHE_BACKEND == 'file':
+    _cache = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+elif CACHE_BACKEND == 'redis':
+    try:
+        import redis  # noqa: F401
+    except ImportError:
+        raise ImproperlyConfigured('CACHE_BACKEND=redis requires "redis"')
+    _cache = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_URL,
+    }
+elif CACHE_BACKEND == 'locmem':
+    _cache = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'hostel_management',
+    }
+else:
+    raise ImproperlyConfigured(f'Unknown CACHE_BACKEND: {CACHE_BACKEND}')
+
+CACHES = {
+    'default': {
+        **_cache,
+        'KEY_PREFIX': CACHE_KEY_PREFIX,
+        'VERSION': CACHE_VERSION,
+        'TIMEOUT': CACHE_TIMEOUT,
+    },
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -141,6 +299,23 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# REST API (/api/v1/). The mobile app authenticates with a token from
+# /api/v1/auth/token/ or reuses the web session.
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework.authentication.TokenAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+    ],
+    'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.IsAuthenticated'],
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'] + (
+        ['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []
+    ),
+    'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.URLPathVersioning',
+    'ALLOWED_VERSIONS': ['v1'],
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.IdCursorPagination',
+    'PAGE_SIZE': 50,
+}
+
 # Crispy Forms
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
@@ -150,8 +325,34 @@ LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'dashboard'
 LOGOUT_REDIRECT_URL = 'login'
 
+# Session storage (SESSION_BACKEND):
+#   db             - django_session table: a SELECT on every authenticated
+#                    request. Default.
+#   cached_db      - read through the shared cache (CACHES), written to both;
+#                    the table is only read on a cache miss.
+#   signed_cookies - the session lives in a signed cookie (signed with
+#                    SECRET_KEY); no session queries at all. Sessions cannot be
+#                    revoked server-side, except by rotating SECRET_KEY.
+# Delete expired rows with `python manage.py clearsessions` (db and cached_db).
+SESSION_BACKEND = config('SESSION_BACKEND', default='db')
+if SESSION_BACKEND not in ('db', 'cached_db', 'signed_cookies'):
+    raise ImproperlyConfigured(f'Unknown SESSION_BACKEND: {SESSION_BACKEND}')
+SESSION_ENGINE = f'django.contrib.sessions.backends.{SESSION_BACKEND}'
+SESSION_COOKIE_AGE = config('SESSION_COOKIE_AGE', default=60 * 60 * 24 * 14, cast=int)
+
 # WhiteNoise configuration for static files
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# CompressedManifestStaticFilesStorage fingerprints file names during
+# collectstatic and precompresses them (gzip, plus Brotli when the Brotli
+# package is installed). WhiteNoise serves fingerprinted files with a one-year,
+# immutable Cache-Control header.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': config('STATICFILES_BACKEND', default='whitenoise.storage.CompressedManifestStaticFilesStorage'),
+    },
+}
 
 # Email Configuration
 # For development: emails will be printed to console
@@ -165,4 +366,61 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='')
-SERVER_EMAIL = config('SERVER_EMAIL', default='')
\ No newline at end of file
+# Send confirmation emails from a background thread instead of the request
+EMAIL_QUEUE_ENABLED = config('EMAIL_QUEUE_ENABLED', default=True, cast=bool)
+SERVER_EMAIL = config('SERVER_EMAIL', default='')
+
+# Refresh the fee analytics aggregates on a background thread after a fee is
+# saved, instead of inside the request; tests refresh inline
+FEE_AGGREGATES_BACKGROUND = config('FEE_AGGREGATES_BACKGROUND', default=sys.argv[1:2] != ['test'], cast=bool)
+
+# Per-request query count and timing (Server-Timing header + JSON log line at
+# DEBUG, or WARNING for slow requests; REQUEST_TIMING_LOG_LEVEL=DEBUG shows all)
+REQUEST_TIMING_ENABLED = config('REQUEST_TIMING_ENABLED', default=True, cast=bool)
+# Fraction of requests to instrument, between 0.0 and 1.0
+REQUEST_TIMING_SAMPLE_RATE = config('REQUEST_TIMING_SAMPLE_RATE', default=1.0, cast=float)
+# Requests slower than this (milliseconds) are logged as warnings
+REQUEST_TIMING_SLOW_MS = config('REQUEST_TIMING_SLOW_MS', default=500, cast=int)
+# Slow requests save their slowest SELECTs with EXPLAIN plans (admin: Slow Queries)
+SLOW_QUERY_LOG_ENABLED = config('SLOW_QUERY_LOG_ENABLED', default=True, cast=bool)
+# Statements per slow request to explain, and the minimum statement time (ms)
+SLOW_QUERY_CAPTURE_COUNT = config('SLOW_QUERY_CAPTURE_COUNT', default=3, cast=int)
+SLOW_QUERY_MIN_MS = config('SLOW_QUERY_MIN_MS', default=10, cast=float)
+# Plans are estimated (EXPLAIN without running the statement) by default. True
+# uses EXPLAIN ANALYZE on PostgreSQL, which runs the slow statement a second
+# time inside the request that was already slow; enable it only while debugging.
+SLOW_QUERY_EXPLAIN_ANALYZE = config('SLOW_QUERY_EXPLAIN_ANALYZE', default=False, cast=bool)
+# Only the newest rows are kept
+SLOW_QUERY_LOG_MAX_ROWS = config('SLOW_QUERY_LOG_MAX_ROWS', default=1000, cast=int)
+
+# /metrics (Prometheus text format). Counters live in a SQLite file shared by
+# all workers on the host; defaults to a file in the system temp directory.
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_DB_PATH = config('METRICS_DB_PATH', default='')
+# Each worker adds up metrics in memory and writes them to the file this often
+METRICS_FLUSH_SECONDS = config('METRICS_FLUSH_SECONDS', default=5, cast=float)
+# Scrapers send "Authorization: Bearer <METRICS_TOKEN>"; staff users can open it when logged in
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Live complaint updates (server-sent events, ASGI only). The in-process backend
+# only reaches streams on the same worker; PostgresNotifyBackend reaches all
+# workers but needs a session connection (not the transaction pooler).
+PUBSUB_BACKEND = config('PUBSUB_BACKEND', default='hostel_management.pubsub.InProcessBackend')
+COMPLAINT_STREAM_HEARTBEAT_SECONDS = config('COMPLAINT_STREAM_HEARTBEAT_SECONDS', default=15, cast=int)
+# Streams end after this long and the browser reconnects (rechecking the session)
+COMPLAINT_STREAM_MAX_SECONDS = config('COMPLAINT_STREAM_MAX_SECONDS', default=300, cast=int)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'hostel_management.requests': {
+            'handlers': ['console'],
+            'level': config('REQUEST_TIMING_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
@@ -0,0 +1,81 @@
+"""
+Slow-query capture.
+
+When an instrumented request exceeds the latency budget (REQUEST_TIMING_SLOW_MS),
+QueryTimingMiddleware passes its slowest statements here. Each SELECT that took
+at least SLOW_QUERY_MIN_MS is explained on the connection it ran on and saved
+as a SlowQuery row, which the admin can browse. Only the newest
+SLOW_QUERY_LOG_MAX_ROWS rows are kept.
+
+On PostgreSQL the plan is the estimated one from EXPLAIN (COSTS), which does
+not run the statement. SLOW_QUERY_EXPLAIN_ANALYZE=True switches to
+EXPLAIN (ANALYZE, BUFFERS) for actual row counts and timings, at the price of
+running the statement again before the response is sent. SQLite uses
+EXPLAIN QUERY PLAN.
+"""
+import logging
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger('hostel_management.requests')
+
+
+def explain(alias, sql, params):
+    """Query plan of one statement as text"""
+    connection = connections[alias]
+    if connection.vendor == 'postgresql':
+        options = 'ANALYZE, BUFFERS' if getattr(settings, 'SLOW_QUERY_EXPLAIN_ANALYZE', False) else 'COSTS'
+        prefix = f'EXPLAIN ({options}) '
+    elif connection.vendor == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    else:
+        prefix = 'EXPLAIN '
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+    except DatabaseError as e:
+        return f'EXPLAIN failed: {e}'
+    if connection.vendor == 'sqlite':
+        # (id, parent, notused, detail)
+        return '\n'.join(str(row[-1]) for row in rows)
+    return '\n'.join(str(row[0]) for row in rows)
+
+
+def capture(timing, statements):
+    """Save the slow SELECT statements of a slow request with their plans"""
+    if not getattr(settings, 'SLOW_QUERY_LOG_ENABLED', True):
+        return 0
+    from .models import SlowQuery
+
+    min_ms = getattr(settings, 'SLOW_QUERY_MIN_MS', 10)
+    samples = []
+    for duration_ms, sql, params, alias in statements:
+        if duration_ms < min_ms or not sql.lstrip().upper().startswith('SELECT'):
+            continue
+        samples.append(SlowQuery(
+            method=timing['method'],
+            path=timing['path'][:500],
+            view=timing['view'] or '',
+            request_ms=timing['total_ms'],
+            duration_ms=round(duration_ms, 2),
+            database=alias,
+            sql=sql,
+            params=repr(params)[:2000],
+            plan=explain(alias, sql, params),
+        ))
+    if not samples:
+        return 0
+
+    try:
+        SlowQuery.objects.bulk_create(samples)
+        # Rotate: drop everything older than the newest SLOW_QUERY_LOG_MAX_ROWS
+        max_rows = getattr(settings, 'SLOW_QUERY_LOG_MAX_ROWS', 1000)
+        cutoff = SlowQuery.objects.using('default').order_by('-pk').values_list('pk', flat=True)[max_rows:max_rows + 1]
+        if cutoff:
+            SlowQuery.objects.filter(pk__lte=cutoff[0]).delete()
+    except DatabaseError as e:
+        logger.warning('Could not save slow queries: %s', e)
+        return 0
+    return len(samples)
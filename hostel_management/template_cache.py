@@ -0,0 +1,91 @@
+"""
+Template compilation helpers.
+
+The Django engine uses an explicit cached loader (settings.TEMPLATE_CACHE_ENABLED),
+so each template is parsed once per process. warm() compiles every project
+template up front. wsgi.py and asgi.py call it at startup so the first request
+of a worker does not pay for parsing the large base layouts. compile_chain_ms()
+and render_ms() are used by run_benchmarks to report parse and render time
+separately.
+"""
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.template import Engine, TemplateSyntaxError, engines
+from django.template.loader_tags import ExtendsNode, IncludeNode
+
+
+def project_template_names():
+    """Names of every .html template in the project template directories"""
+    names = []
+    for directory in engines['django'].engine.dirs:
+        root = Path(directory)
+        names.extend(sorted(str(path.relative_to(root)) for path in root.rglob('*.html')))
+    return names
+
+
+def warm():
+    """Compile all project templates into the cached loader; returns the number compiled"""
+    engine = engines['django'].engine
+    compiled = 0
+    for name in project_template_names():
+        try:
+            engine.get_template(name)
+            compiled += 1
+        except TemplateSyntaxError:
+            # Reported when the page is requested; do not block startup
+            pass
+    return compiled
+
+
+def _uncached_engine():
+    engine = engines['django'].engine
+    return Engine(
+        dirs=engine.dirs,
+        loaders=settings.TEMPLATE_LOADERS,
+        context_processors=engine.context_processors,
+        debug=engine.debug,
+        libraries=engine.libraries,
+    )
+
+
+def _referenced_templates(template):
+    """Literal names used by {% extends %} and {% include %} in a compiled template"""
+    names = []
+    for node in template.nodelist.get_nodes_by_type(ExtendsNode):
+        names.append(node.parent_name.var)
+    for node in template.nodelist.get_nodes_by_type(IncludeNode):
+        names.append(node.template.var)
+    return [name for name in names if isinstance(name, str)]
+
+
+def compile_chain_ms(name):
+    """
+    Milliseconds to load and parse a template plus everything it extends or
+    includes, bypassing the cache, and the names of those templates.
+    """
+    engine = _uncached_engine()
+    pending, seen = [name], set()
+    started = time.perf_counter()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        pending.extend(_referenced_templates(engine.get_template(current)))
+    return (time.perf_counter() - started) * 1000, sorted(seen)
+
+
+def render_ms(name, context, request=None):
+    """Milliseconds to render an already compiled template"""
+    template = engines['django'].get_template(name)
+    started = time.perf_counter()
+    template.render(context, request)
+    return (time.perf_counter() - started) * 1000
+
+
+def warm_at_startup():
+    """warm() unless TEMPLATE_WARMUP or the template cache is turned off"""
+    if getattr(settings, 'TEMPLATE_WARMUP', True) and getattr(settings, 'TEMPLATE_CACHE_ENABLED', True):
+        warm()
@@ -0,0 +1,31 @@
+"""
+Helpers for running the app against a throwaway database.
+
+The Supabase tables (hostel, room, student, allocation, fee) are unmanaged,
+so migrate never creates them. create_unmanaged_tables() builds them from the
+model definitions for test and benchmark databases.
+
+The manifest static storage needs a collectstatic run before templates can
+render; PLAIN_STATIC_STORAGES is an override for code that renders pages
+without one.
+"""
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+
+PLAIN_STATIC_STORAGES = {
+    **settings.STORAGES,
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+
+def create_unmanaged_tables(using='default'):
+    """Create the tables of every unmanaged, non-proxy model that is missing"""
+    connection = connections[using]
+    existing = set(connection.introspection.table_names())
+    # One schema editor so foreign keys are added after every table exists
+    with connection.schema_editor() as editor:
+        for model in apps.get_models():
+            opts = model._meta
+            if not opts.managed and not opts.proxy and opts.db_table not in existing:
+                editor.create_model(model)
@@ -0,0 +1,215 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from rooms.models import Hostel
+
+from . import caching, pubsub
+from .db_router import PIN_COOKIE, PrimaryPinMiddleware, read_only_view, use_replica
+from .testing import create_unmanaged_tables
+
+# Test-only SQLite alias from settings; unlike a DATABASE_REPLICA_URL replica
+# it is not a test mirror of the primary, so rows written to one database are
+# not visible through the other
+REPLICA = 'routing_test_replica'
+
+
+@override_settings(DATABASE_REPLICA_ALIAS=REPLICA)
+class ReplicaRoutingTests(TestCase):
+    """
+    Routing against a second SQLite file standing in for the replica. Nothing
+    replicates between the two, so each test can tell from the rows it gets
+    back which database served a query.
+    """
+
+    databases = {'default', REPLICA}
+
+    @classmethod
+    def setUpClass(cls):
+        # Hostel is unmanaged, so migrate does not create it on either database
+        create_unmanaged_tables()
+        create_unmanaged_tables(REPLICA)
+        super().setUpClass()
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        Hostel.objects.create(name='On primary')
+        Hostel.objects.using(REPLICA).create(name='On replica')
+
+        @read_only_view
+        def hostel_view(request):
+            return HttpResponse(','.join(Hostel.objects.values_list('name', flat=True)))
+
+        self.hostel_view = hostel_view
+
+    def test_reads_use_primary_by_default(self):
+        self.assertEqual(list(Hostel.objects.values_list('name', flat=True)), ['On primary'])
+
+    def test_reads_inside_use_replica_go_to_replica(self):
+        with use_replica():
+            self.assertEqual(list(Hostel.objects.values_list('name', flat=True)), ['On replica'])
+        self.assertEqual(list(Hostel.objects.values_list('name', flat=True)), ['On primary'])
+
+    def test_writes_inside_use_replica_land_on_primary(self):
+        with use_replica():
+            Hostel.objects.create(name='Written')
+            Hostel.objects.filter(name='On primary').update(location='Updated')
+        self.assertTrue(Hostel.objects.using('default').filter(name='Written').exists())
+        self.assertFalse(Hostel.objects.using(REPLICA).filter(name='Written').exists())
+        self.assertEqual(Hostel.objects.using('default').get(name='On primary').location, 'Updated')
+
+    def test_replica_is_never_migrated(self):
+        self.assertFalse(router.allow_migrate(REPLICA, 'rooms'))
+        self.assertTrue(router.allow_migrate('default', 'rooms'))
+
+    def test_read_only_view_serves_get_from_replica(self):
+        response = self.hostel_view(self.factory.get('/rooms/hostels/'))
+        self.assertEqual(response.content.decode(), 'On replica')
+
+    def test_read_only_view_serves_post_from_primary(self):
+        response = self.hostel_view(self.factory.post('/rooms/hostels/'))
+        self.assertEqual(response.content.decode(), 'On primary')
+
+    def test_pinned_request_reads_from_primary(self):
+        request = self.factory.get('/rooms/hostels/')
+        request.COOKIES[PIN_COOKIE] = '1'
+        self.assertEqual(self.hostel_view(request).content.decode(), 'On primary')
+
+    def test_write_request_sets_pin_cookie(self):
+        middleware = PrimaryPinMiddleware(lambda request: HttpResponse())
+        self.assertIn(PIN_COOKIE, middleware(self.factory.post('/rooms/add/')).cookies)
+        self.assertNotIn(PIN_COOKIE, middleware(self.factory.get('/rooms/')).cookies)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'caching-tests'}},
+    METRICS_ENABLED=False,
+)
+class CacheStampedeTests(SimpleTestCase):
+    """get_or_set() and aget_or_set() against a local-memory cache"""
+
+    KEY = 'stats:test'
+
+    def setUp(self):
+        cache.clear()
+        self.compute = mock.Mock(return_value='fresh')
+
+    async def acompute(self):
+        return self.compute()
+
+    def store(self, value, fresh_for):
+        cache.set(self.KEY, {'value': value, 'fresh_until': time.time() + fresh_for}, 60)
+
+    def hold_lock(self):
+        cache.add(f'{self.KEY}:lock', 1, 60)
+
+    def set_later(self, value, delay=0.1):
+        timer = threading.Timer(delay, self.store, args=(value, 60))
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+    def test_miss_computes_and_stores(self):
+        self.assertEqual(caching.get_or_set(self.KEY, self.compute, timeout=60), 'fresh')
+        self.assertEqual(caching.get_or_set(self.KEY, self.compute, timeout=60), 'fresh')
+        self.compute.assert_called_once()
+        self.assertIsNone(cache.get(f'{self.KEY}:lock'))
+
+    def test_fresh_entry_is_served_unless_forced(self):
+        self.store('cached', 60)
+        self.assertEqual(caching.get_or_set(self.KEY, self.compute, timeout=60), 'cached')
+        self.compute.assert_not_called()
+        self.assertEqual(caching.get_or_set(self.KEY, self.compute, timeout=60, force=True), 'fresh')
+
+    def test_stale_entry_is_recomputed_by_lock_holder(self):
+        self.store('stale', -1)
+        self.assertEqual(caching.get_or_set(self.KEY, self.compute, timeout=60), 'fresh')
+        self.assertEqual(cache.get(self.KEY)['value'], 'fresh')
+
+    def test_stale_entry_is_served_while_another_worker_recomputes(self):
+        self.store('stale', -1)
+        self.hold_lock()
+        self.assertEqual(caching.get_or_set(self.KEY, self.compute, timeout=60), 'stale')
+        self.compute.assert_not_called()
+
+    def test_missing_entry_waits_for_lock_holder(self):
+        self.hold_lock()
+        self.set_later('from lock holder')
+        self.assertEqual(caching.get_or_set(self.KEY, self.compute, timeout=60), 'from lock holder')
+        self.compute.assert_not_called()
+
+    @mock.patch.object(caching, 'WAIT_SECONDS', 0.1)
+    def test_missing_entry_is_computed_when_lock_holder_is_too_slow(self):
+        self.hold_lock()
+        self.assertEqual(caching.get_or_set(self.KEY, self.compute, timeout=60), 'fresh')
+        self.compute.assert_called_once()
+
+    async def test_async_miss_computes_and_stores(self):
+        self.assertEqual(await caching.aget_or_set(self.KEY, self.acompute, timeout=60), 'fresh')
+        self.assertEqual(await caching.aget_or_set(self.KEY, self.acompute, timeout=60), 'fresh')
+        self.compute.assert_called_once()
+
+    async def test_async_stale_entry_is_served_while_another_worker_recomputes(self):
+        self.store('stale', -1)
+        self.hold_lock()
+        self.assertEqual(await caching.aget_or_set(self.KEY, self.acompute, timeout=60), 'stale')
+        self.compute.assert_not_called()
+
+    async def test_async_missing_entry_waits_for_lock_holder(self):
+        self.hold_lock()
+        self.set_later('from lock holder')
+        self.assertEqual(await caching.aget_or_set(self.KEY, self.acompute, timeout=60), 'from lock holder')
+        self.compute.assert_not_called()
+
+    @mock.patch.object(caching, 'WAIT_SECONDS', 0.1)
+    async def test_async_missing_entry_is_computed_when_lock_holder_is_too_slow(self):
+        self.hold_lock()
+        self.assertEqual(await caching.aget_or_set(self.KEY, self.acompute, timeout=60), 'fresh')
+        self.compute.assert_called_once()
+
+
+class PostgresNotifyListenerTests(SimpleTestCase):
+    """The LISTEN loop with stand-ins for psycopg2 and psycopg 3 connections"""
+
+    def setUp(self):
+        self.hub = mock.Mock()
+        self.backend = pubsub.PostgresNotifyBackend(self.hub)
+        self.notify = SimpleNamespace(payload=json.dumps({'channel': 'room.1', 'message': {'type': 'update'}}))
+
+    def listen(self, conn):
+        wrapper = mock.Mock()
+        wrapper.get_connection_params.return_value = {}
+        wrapper.Database.connect.return_value = conn
+        with mock.patch.object(pubsub.connections, 'create_connection', return_value=wrapper):
+            self.backend._listen()
+        # The listener opens its own connection, never one from the pool
+        wrapper.get_new_connection.assert_not_called()
+
+    def test_psycopg3_notifies_generator(self):
+        conn = mock.MagicMock()
+        conn.notifies = mock.Mock(return_value=iter([self.notify, SimpleNamespace(payload='not json')]))
+        self.listen(conn)
+        self.hub.deliver.assert_called_once_with('room.1', {'type': 'update'})
+        conn.close.assert_called_once()
+
+    def test_psycopg2_poll_and_notifies_list(self):
+        conn = mock.MagicMock()
+        conn.notifies = []
+
+        def poll():
+            if self.hub.deliver.called:
+                raise ConnectionError('closed')
+            conn.notifies.append(self.notify)
+        conn.poll.side_effect = poll
+
+        with mock.patch.object(pubsub.select, 'select', return_value=([conn], [], [])):
+            with self.assertRaises(ConnectionError):
+                self.listen(conn)
+        self.hub.deliver.assert_called_once_with('room.1', {'type': 'update'})
+        conn.close.assert_called_once()
@@ -14,12 +14,14 @@ urlpatterns = [
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
     path('register/', views.register_view, name='register'),
+    path('metrics', views.metrics_view, name='metrics'),
     
     # App URLs
     path('students/', include('students.urls')),
     path('rooms/', include('rooms.urls')),
     path('complaints/', include('complaints.urls')),
     path('payments/', include('payments.urls')),
+    path('api/', include('api.urls')),
 ]
 
 # Serve media files in development
@@ -1,14 +1,21 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth.models import User
-from django.db.models import Count, Sum
-from students.models import Student, UserProfile
-from rooms.models import Room
+from django.db.models import Count
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from students.models import UserProfile
 from complaints.models import Complaint
 from payments.models import Fee
 from datetime import datetime
+from .async_utils import alist, arender, aget_student_for_user
+from .db_router import read_only_view
+from . import metrics
+from .dashboard import admin_stats
 
 
 def home(request):
@@ -90,125 +97,63 @@ def register_view(request):
     return render(request, 'register.html')
 
 
+def _student_summary(student):
+    """Recent complaints and payments shown on the student dashboard"""
+    unpaid = Fee.objects.filter(studentid=student).exclude(status__iexact='paid')
+    return {
+        'my_complaints': list(Complaint.objects.filter(student=student).order_by('-created_at')[:5]),
+        # Get pending/overdue payments (not paid)
+        'pending_payments_list': list(unpaid.order_by('-duedate')[:5]),
+        'pending_payments_count': unpaid.count(),
+        # Get only paid payments for recent payments
+        'paid_payments': list(Fee.objects.filter(studentid=student, status__iexact='paid').order_by('-duedate')[:5]),
+    }
+
+
 @login_required
-def dashboard(request):
+@read_only_view
+async def dashboard(request):
     """Dashboard view - different content based on user role"""
+    user = await request.auser()
     # Check if user is superuser first (no profile needed)
-    if request.user.is_superuser:
+    if user.is_superuser:
         role = 'admin'
     else:
-        try:
-            user_profile = UserProfile.objects.get(user=request.user)
-            role = user_profile.role
-        except UserProfile.DoesNotExist:
-            # Create a default student profile
-            UserProfile.objects.create(user=request.user, role='student')
-            role = 'student'
+        # get_or_create reads from the primary, so a lagging replica never causes a duplicate
+        user_profile, _ = await UserProfile.objects.aget_or_create(
+            user=user, defaults={'role': 'student'}
+        )
+        role = user_profile.role
     
-    if role == 'admin' or request.user.is_superuser:
-        # Admin dashboard with statistics
-        total_students = Student.objects.count()
-        total_rooms = Room.objects.count()
-        
-        # Count occupied and available rooms correctly
-        # Occupied = completely full (current_occupancy == capacity)
-        # Available = has at least one bed free (current_occupancy < capacity)
-        from students.models import Allocation
-        occupied_rooms = 0
-        available_rooms = 0
-        
-        all_rooms = Room.objects.all()
-        for room in all_rooms:
-            current_occupancy = Allocation.objects.filter(room=room).count()
-            if current_occupancy >= room.capacity:
-                occupied_rooms += 1
-            else:
-                available_rooms += 1
-        
-        pending_complaints = Complaint.objects.filter(status='pending').count()
-        
-        # Get paid fees (case-insensitive to handle 'Paid', 'paid', 'PAID')
-        from django.db.models import Q
-        paid_fees = Fee.objects.filter(Q(status__iexact='paid') | Q(status__iexact='Paid'))
-        fees_collected = paid_fees.aggregate(Sum('amount'))['amount__sum'] or 0
-        
-        # Recent complaints
-        recent_complaints = Complaint.objects.all().order_by('-created_at')[:5]
-        
-        # Get empty/available rooms (rooms that are not fully occupied)
-        from django.db.models import Count
-        empty_rooms = []
-        all_rooms = Room.objects.select_related('hostelid').all()
-        
-        for room in all_rooms:
-            # Count current allocations for this room
-            current_allocations = Allocation.objects.filter(room=room).count()
-            available_beds = room.capacity - current_allocations
-            
-            # Only include rooms with available beds
-            if available_beds > 0:
-                room.available_beds = available_beds
-                empty_rooms.append(room)
-        
-        # Limit to 5 rooms for display
-        empty_rooms = empty_rooms[:5]
-        
+    if role == 'admin' or user.is_superuser:
+        # Admin dashboard with statistics (cached until rooms, fees or complaints change)
+        stats = await sync_to_async(admin_stats)()
+        recent_complaints = await alist(Complaint.objects.select_related('student').order_by('-created_at')[:5])
         context = {
             'role': role,
-            'total_students': total_students,
-            'total_rooms': total_rooms,
-            'occupied_rooms': occupied_rooms,
-            'available_rooms': available_rooms,
-            'pending_complaints': pending_complaints,
-            'fees_collected': fees_collected,
+            **stats,
             'recent_complaints': recent_complaints,
-            'empty_rooms': empty_rooms,
         }
-        return render(request, 'dashboard_admin.html', context)
+        return await arender(request, 'dashboard_admin.html', context)
     
     else:
         # Student dashboard
         try:
-            # Try to find student by username matching
-            student = Student.objects.filter(name__icontains=request.user.username).first()
-            if not student:
-                # If no exact match, try to find by user profile or create a basic student record
-                student = Student.objects.filter(studentid=request.user.id).first()
+            student = await aget_student_for_user(user)
             
             if student:
                 # Get or create student profile
                 from students.models import StudentProfile
-                try:
-                    student_profile = StudentProfile.objects.get(student=student)
-                except StudentProfile.DoesNotExist:
-                    student_profile = StudentProfile.objects.create(student=student)
-                
-                my_complaints = Complaint.objects.filter(student=student).order_by('-created_at')[:5]
-                
-                # Get pending/overdue payments (not paid)
-                pending_payments_list = Fee.objects.filter(
-                    studentid=student
-                ).exclude(
-                    status__iexact='paid'
-                ).order_by('-duedate')[:5]
-                pending_payments_count = Fee.objects.filter(studentid=student).exclude(status__iexact='paid').count()
-                
-                # Get only paid payments for recent payments
-                paid_payments = Fee.objects.filter(
-                    studentid=student, 
-                    status__iexact='paid'
-                ).order_by('-duedate')[:5]
+                student_profile, _ = await StudentProfile.objects.aget_or_create(student=student)
                 
                 context = {
                     'role': role,
                     'student': student,
                     'student_profile': student_profile,
-                    'my_complaints': my_complaints,
-                    'pending_payments_list': pending_payments_list,
-                    'pending_payments_count': pending_payments_count,
-                    'paid_payments': paid_payments,
+                    # One trip to the ORM thread for all four queries
+                    **await sync_to_async(_student_summary)(student),
                 }
-                return render(request, 'dashboard_student.html', context)
+                return await arender(request, 'dashboard_student.html', context)
             else:
                 # Student profile not found - show message to contact admin
                 messages.warning(request, 'Your student profile is not found in the system. Please contact the administrator to create your profile.')
@@ -216,7 +161,7 @@ def dashboard(request):
                     'role': role,
                     'student': None,
                 }
-                return render(request, 'dashboard_student.html', context)
+                return await arender(request, 'dashboard_student.html', context)
         except Exception as e:
             # Handle any other errors
             messages.error(request, f'Error loading student dashboard: {str(e)}')
@@ -224,4 +169,13 @@ def dashboard(request):
                 'role': role,
                 'student': None,
             }
-            return render(request, 'dashboard_student.html', context)
+            return await arender(request, 'dashboard_student.html', context)
+
+
+def metrics_view(request):
+    """Prometheus metrics for a scraper with METRICS_TOKEN, or a logged-in staff user"""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    has_token = bool(token) and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+    if not (has_token or request.user.is_staff):
+        return HttpResponseForbidden()
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -9,3 +9,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hostel_management.settings')
 
 application = get_wsgi_application()
+
+# Parse the templates now rather than on each worker's first requests
+from hostel_management.template_cache import warm_at_startup  # noqa: E402
+
+warm_at_startup()
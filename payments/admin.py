@@ -1,5 +1,6 @@
-from django.contrib import admin
-from .models import Fee
+from django.contrib import admin, messages
+from .bulk import set_fee_status
+from .models import BillingRate, Fee, FeeDailyAggregate, FeeMonthlyAggregate
 
 
 @admin.register(Fee)
@@ -9,3 +10,34 @@ class FeeAdmin(admin.ModelAdmin):
     search_fields = ['studentid__name']
     list_editable = ['status']
     date_hierarchy = 'duedate'
+    actions = ['mark_paid', 'mark_not_paid']
+    
+    @admin.action(description='Mark selected fees as Paid')
+    def mark_paid(self, request, queryset):
+        updated = set_fee_status(queryset, 'Paid')
+        self.message_user(request, f'{updated} fee(s) marked as Paid.', messages.SUCCESS)
+    
+    @admin.action(description='Mark selected fees as Not Paid')
+    def mark_not_paid(self, request, queryset):
+        updated = set_fee_status(queryset, 'Not Paid')
+        self.message_user(request, f'{updated} fee(s) marked as Not Paid.', messages.SUCCESS)
+
+
+@admin.register(FeeDailyAggregate)
+class FeeDailyAggregateAdmin(admin.ModelAdmin):
+    list_display = ['day', 'payment_type', 'hostel', 'department', 'is_paid', 'fee_count', 'total_amount']
+    list_filter = ['is_paid', 'payment_type', 'department']
+    date_hierarchy = 'day'
+
+
+@admin.register(FeeMonthlyAggregate)
+class FeeMonthlyAggregateAdmin(admin.ModelAdmin):
+    list_display = ['month', 'payment_type', 'hostel', 'department', 'is_paid', 'fee_count', 'total_amount']
+    list_filter = ['is_paid', 'payment_type', 'department']
+    date_hierarchy = 'month'
+
+
+@admin.register(BillingRate)
+class BillingRateAdmin(admin.ModelAdmin):
+    list_display = ['room_type', 'hostel', 'amount']
+    list_filter = ['room_type']
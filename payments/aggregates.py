@@ -0,0 +1,218 @@
+"""
+Incremental fee aggregates for the finance dashboard.
+
+FeeDailyAggregate holds fee counts and totals per due date and dimension
+(payment type, hostel, department, paid/unpaid). FeeMonthlyAggregate is
+rolled up from the daily rows. The Fee/PaymentRecord signals queue the days
+touched by a save with schedule_refresh(); a background thread refreshes
+them, so the request that saved the fee does not wait for it. rebuild_all()
+recomputes everything from scratch. Fees without a due date are not
+aggregated.
+
+Refreshes of the same month are serialised (a PostgreSQL advisory lock; SQLite
+only has one writer at a time anyway), and each refresh reads the fees after
+taking the lock, so concurrent payments for the same day cannot both write
+their rows. A unique constraint on the dimensions backs this up.
+"""
+import atexit
+import logging
+import threading
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+from students.utils import current_hostel_map
+from .models import Fee, FeeDailyAggregate, FeeMonthlyAggregate
+
+DIMENSIONS = ('payment_type', 'hostel_id', 'department', 'is_paid')
+# First key of the pg_advisory_xact_lock(namespace, month) refresh locks
+LOCK_NAMESPACE = 7201
+
+logger = logging.getLogger(__name__)
+
+_condition = threading.Condition()
+_pending_days = set()
+_busy = False
+_worker = None
+_worker_lock = threading.Lock()
+
+AGING_BUCKETS = [
+    ('Not yet due', None, -1),
+    ('0-30 days', 0, 30),
+    ('31-60 days', 31, 60),
+    ('61-90 days', 61, 90),
+    ('90+ days', 91, None),
+]
+
+
+def _month_start(day):
+    return day.replace(day=1)
+
+
+def _next_month(month):
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def _daily_rows(days=None):
+    """Build unsaved FeeDailyAggregate rows for the given due dates (all when None)"""
+    fees = Fee.objects.filter(duedate__isnull=False).order_by()
+    if days is not None:
+        fees = fees.filter(duedate__in=days)
+    grouped = fees.values_list(
+        'duedate', 'studentid', 'payment_record__payment_type', 'studentid__department', 'status'
+    ).annotate(fee_count=Count('feeid'), total_amount=Sum('amount'))
+
+    totals = defaultdict(lambda: [0, Decimal('0')])
+    rows = list(grouped.iterator(chunk_size=5000))
+    hostel_map = current_hostel_map({row[1] for row in rows} if days is not None else None)
+    for day, student_id, payment_type, department, status, fee_count, total_amount in rows:
+        is_paid = (status or '').lower() == 'paid'
+        key = (day, payment_type or '', hostel_map.get(student_id), department or '', is_paid)
+        totals[key][0] += fee_count
+        totals[key][1] += total_amount or 0
+
+    return [
+        FeeDailyAggregate(
+            day=day, payment_type=payment_type, hostel_id=hostel_id,
+            department=department, is_paid=is_paid,
+            fee_count=fee_count, total_amount=total_amount,
+        )
+        for (day, payment_type, hostel_id, department, is_paid), (fee_count, total_amount) in totals.items()
+    ]
+
+
+def _monthly_rows(daily_rows):
+    """Roll a queryset of daily aggregates up into unsaved monthly rows"""
+    grouped = daily_rows.order_by().annotate(month_start=TruncMonth('day')).values(
+        'month_start', *DIMENSIONS
+    ).annotate(count_sum=Sum('fee_count'), amount_sum=Sum('total_amount'))
+    return [
+        FeeMonthlyAggregate(
+            month=row['month_start'],
+            fee_count=row['count_sum'],
+            total_amount=row['amount_sum'],
+            **{dimension: row[dimension] for dimension in DIMENSIONS},
+        )
+        for row in grouped
+    ]
+
+
+def _lock_months(months):
+    """Wait for other transactions refreshing these months (PostgreSQL only)"""
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        # Always in the same order, so two refreshes cannot deadlock
+        for month in sorted(months):
+            cursor.execute('SELECT pg_advisory_xact_lock(%s, %s)', [LOCK_NAMESPACE, month.toordinal()])
+
+
+def refresh_days(days):
+    """Recompute the daily and monthly aggregates touched by the given due dates"""
+    days = {day for day in days if day}
+    if not days:
+        return
+    months = {_month_start(day) for day in days}
+    with transaction.atomic():
+        _lock_months(months)
+        FeeDailyAggregate.objects.filter(day__in=days).delete()
+        FeeDailyAggregate.objects.bulk_create(_daily_rows(days), batch_size=1000)
+        for month in months:
+            FeeMonthlyAggregate.objects.filter(month=month).delete()
+            FeeMonthlyAggregate.objects.bulk_create(_monthly_rows(
+                FeeDailyAggregate.objects.filter(day__gte=month, day__lt=_next_month(month))
+            ))
+
+
+def _run():
+    global _busy
+    while True:
+        with _condition:
+            _condition.wait_for(lambda: _pending_days)
+            days = set(_pending_days)
+            _pending_days.clear()
+            _busy = True
+        try:
+            refresh_days(days)
+        except Exception:
+            # The days stay stale until the next save or rebuild_fee_aggregates
+            logger.exception('Fee aggregate refresh failed for %s', sorted(days))
+        finally:
+            close_old_connections()
+            with _condition:
+                _busy = False
+                _condition.notify_all()
+
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run, name='fee-aggregates', daemon=True)
+            _worker.start()
+
+
+def schedule_refresh(days):
+    """
+    Refresh the given due dates on the background thread. Days queued while a
+    refresh runs are merged into the next one. Set FEE_AGGREGATES_BACKGROUND=False
+    to refresh inline instead.
+    """
+    days = {day for day in days if day}
+    if not days:
+        return
+    if not getattr(settings, 'FEE_AGGREGATES_BACKGROUND', True):
+        refresh_days(days)
+        return
+    _ensure_worker()
+    with _condition:
+        _pending_days.update(days)
+        _condition.notify_all()
+
+
+def flush(timeout=30):
+    """Wait for the queued refreshes; True when none are left"""
+    with _condition:
+        return _condition.wait_for(lambda: not _pending_days and not _busy, timeout)
+
+
+# Management commands exit right after their last save
+atexit.register(flush)
+
+
+def rebuild_all():
+    """Drop and rebuild every fee aggregate; returns (daily_rows, monthly_rows)"""
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # Wait for running refreshes and keep new ones out until the rebuild commits
+            with connection.cursor() as cursor:
+                cursor.execute('LOCK TABLE fee_daily_aggregate, fee_monthly_aggregate IN EXCLUSIVE MODE')
+        FeeDailyAggregate.objects.all().delete()
+        FeeMonthlyAggregate.objects.all().delete()
+        daily = FeeDailyAggregate.objects.bulk_create(_daily_rows(), batch_size=1000)
+        monthly = FeeMonthlyAggregate.objects.bulk_create(
+            _monthly_rows(FeeDailyAggregate.objects.all()), batch_size=1000
+        )
+    return len(daily), len(monthly)
+
+
+def aging_buckets(today=None):
+    """Outstanding (unpaid) amounts bucketed by days past the due date"""
+    today = today or date.today()
+    buckets = [{'label': label, 'fee_count': 0, 'total_amount': Decimal('0')} for label, _, _ in AGING_BUCKETS]
+    unpaid = FeeDailyAggregate.objects.filter(is_paid=False).order_by().values('day').annotate(
+        count_sum=Sum('fee_count'), amount_sum=Sum('total_amount')
+    )
+    for row in unpaid:
+        overdue = (today - row['day']).days
+        for bucket, (_, low, high) in zip(buckets, AGING_BUCKETS):
+            if (low is None or overdue >= low) and (high is None or overdue <= high):
+                bucket['fee_count'] += row['count_sum']
+                bucket['total_amount'] += row['amount_sum']
+                break
+    return buckets
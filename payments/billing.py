@@ -0,0 +1,162 @@
+"""
+Semester billing run.
+
+run_billing() creates one unpaid hostel fee, with a 'Hostel' payment record,
+for every student with a current allocation. The amount is the BillingRate of
+the student's room type, preferring a rate for their hostel over the default
+rate (no hostel). Each payment record's idempotency key is
+'billing:<term>:<studentid>', so running a term again bills only the students
+who were not billed yet, e.g. those allocated since the last run.
+
+Rows are written with bulk_create, one transaction per chunk. That bypasses
+the model signals, so the fee aggregates, content versions and change log are
+updated here instead.
+"""
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from hostel_management import changelog, conditional
+from students.models import Allocation
+from .aggregates import refresh_days
+from .models import BillingRate, Fee, PaymentRecord
+
+PAYMENT_TYPE = 'Hostel'
+DUE_DAYS = 30
+CHUNK_SIZE = 2000
+
+
+def current_term(today=None):
+    """'2026-1' for January to June, '2026-2' for July to December"""
+    today = today or timezone.localdate()
+    return f'{today.year}-{1 if today.month <= 6 else 2}'
+
+
+def default_due_date(today=None):
+    return (today or timezone.localdate()) + timedelta(days=DUE_DAYS)
+
+
+def billing_key(term, student_id):
+    return f'billing:{term}:{student_id}'
+
+
+def _billed_students(term, student_ids=None):
+    """Ids of the students already billed for the term"""
+    prefix = billing_key(term, '')
+    keys = PaymentRecord.objects.filter(idempotency_key__startswith=prefix)
+    if student_ids is not None:
+        keys = keys.filter(idempotency_key__in=[billing_key(term, student_id) for student_id in student_ids])
+    return {int(key[len(prefix):]) for key in keys.values_list('idempotency_key', flat=True)}
+
+
+def _current_rooms(hostel_ids=None):
+    """studentid -> (hostelid, room type) of each student's latest allocation"""
+    allocations = Allocation.objects.order_by('student_id', 'date_of_allocation', 'allocationid')
+    # Rows are ordered oldest first, so the last one seen per student wins
+    rooms = {}
+    for student_id, hostel_id, room_type in allocations.values_list(
+        'student_id', 'room__hostelid', 'room__type'
+    ).iterator(chunk_size=5000):
+        rooms[student_id] = (hostel_id, room_type or '')
+    if hostel_ids is not None:
+        hostel_ids = set(hostel_ids)
+        rooms = {student_id: room for student_id, room in rooms.items() if room[0] in hostel_ids}
+    return rooms
+
+
+def compute_charges(term, hostel_ids=None):
+    """
+    Charges of a billing run without writing anything.
+
+    Returns (charges, summary): charges is a list of (studentid, amount) for
+    the allocated students not billed for the term yet; summary counts the
+    allocated, already billed and unrated students.
+    """
+    rates = {}
+    for room_type, hostel_id, amount in BillingRate.objects.values_list('room_type', 'hostel_id', 'amount'):
+        rates[(room_type, hostel_id)] = amount
+
+    rooms = _current_rooms(hostel_ids)
+    billed = _billed_students(term)
+    charges, missing_rates = [], set()
+    already_billed = 0
+    for student_id, (hostel_id, room_type) in sorted(rooms.items()):
+        if student_id in billed:
+            already_billed += 1
+            continue
+        amount = rates.get((room_type, hostel_id), rates.get((room_type, None)))
+        if amount is None:
+            missing_rates.add((hostel_id, room_type))
+            continue
+        charges.append((student_id, amount))
+
+    summary = {
+        'term': term,
+        'allocated': len(rooms),
+        'already_billed': already_billed,
+        'unrated': len(rooms) - already_billed - len(charges),
+        'missing_rates': sorted(missing_rates, key=lambda rate: (rate[1], rate[0] or 0)),
+    }
+    return charges, summary
+
+
+def _bill_chunk(term, due_date, chunk):
+    """Write one chunk of charges in a transaction; returns the charges billed"""
+    while chunk:
+        try:
+            with transaction.atomic():
+                fees = Fee.objects.bulk_create([
+                    Fee(studentid_id=student_id, amount=amount, duedate=due_date, status='Not Paid')
+                    for student_id, amount in chunk
+                ])
+                records = PaymentRecord.objects.bulk_create([
+                    PaymentRecord(fee=fee, payment_type=PAYMENT_TYPE, idempotency_key=billing_key(term, fee.studentid_id))
+                    for fee in fees
+                ])
+                changelog.record_many('fee', [(fee.studentid_id, fee.pk, 'upsert') for fee in fees])
+                changelog.record_many('payment_record', [
+                    (fee.studentid_id, record.pk, 'upsert') for fee, record in zip(fees, records)
+                ])
+            return chunk
+        except IntegrityError:
+            # A concurrent run billed some of these students first
+            billed = _billed_students(term, [student_id for student_id, _ in chunk])
+            if not billed:
+                raise
+            chunk = [charge for charge in chunk if charge[0] not in billed]
+    return chunk
+
+
+def run_billing(term=None, due_date=None, hostel_ids=None, dry_run=False, chunk_size=CHUNK_SIZE):
+    """
+    Bill the term's hostel fee to every allocated student not billed yet.
+
+    hostel_ids limits the run to students currently in those hostels. Returns
+    the compute_charges() summary plus the number billed, the total amount and
+    the elapsed seconds.
+    """
+    started = time.perf_counter()
+    term = term or current_term()
+    due_date = due_date or default_due_date()
+    charges, summary = compute_charges(term, hostel_ids)
+
+    billed = []
+    if not dry_run:
+        for start in range(0, len(charges), chunk_size):
+            billed.extend(_bill_chunk(term, due_date, charges[start:start + chunk_size]))
+        if billed:
+            refresh_days([due_date])
+            conditional.bump('fees')
+    else:
+        billed = charges
+
+    summary.update({
+        'due_date': due_date,
+        'billed': len(billed),
+        'total_amount': sum((amount for _, amount in billed), Decimal('0')),
+        'seconds': time.perf_counter() - started,
+    })
+    return summary
@@ -0,0 +1,9 @@
+"""
+Status changes for many fees at once (payment list and admin actions)
+"""
+from hostel_management.bulk import update_in_bulk
+
+
+def set_fee_status(queryset, status):
+    """Set the status of the fees in queryset with one UPDATE; returns the number changed"""
+    return update_in_bulk(queryset.exclude(status=status), 'studentid', status=status)
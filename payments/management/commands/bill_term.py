@@ -0,0 +1,61 @@
+"""
+Bill the term's hostel fee to every allocated student.
+
+Amounts come from the Billing Rates (admin) by room type and hostel. Running
+the same term again only bills students who were not billed yet.
+
+Usage:
+    python manage.py bill_term                      # current term, due in 30 days
+    python manage.py bill_term --term 2026-2 --due-date 2026-08-15
+    python manage.py bill_term --hostel 1 --hostel 2 --dry-run
+"""
+from collections import defaultdict
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payments.billing import CHUNK_SIZE, current_term, run_billing
+
+
+class Command(BaseCommand):
+    help = "Create this term's hostel fees for all allocated students"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--term', help='Term label, e.g. 2026-2 (default: current term)')
+        parser.add_argument('--due-date', help='Due date of the fees (YYYY-MM-DD, default: in 30 days)')
+        parser.add_argument('--hostel', type=int, action='append', help='Only bill students in this hostel (repeatable)')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Fees written per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Report the charges without creating fees')
+
+    def handle(self, *args, **options):
+        due_date = None
+        if options['due_date']:
+            try:
+                due_date = date.fromisoformat(options['due_date'])
+            except ValueError:
+                raise CommandError('--due-date must be a date in YYYY-MM-DD format')
+
+        summary = run_billing(
+            term=options['term'] or current_term(),
+            due_date=due_date,
+            hostel_ids=options['hostel'],
+            dry_run=options['dry_run'],
+            chunk_size=options['chunk_size'],
+        )
+
+        verb = 'Would bill' if options['dry_run'] else 'Billed'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {summary['billed']} students ₹{summary['total_amount']:,.2f} for term {summary['term']} "
+            f"(due {summary['due_date']}) in {summary['seconds']:.2f}s."
+        ))
+        self.stdout.write(
+            f"Allocated students: {summary['allocated']}, already billed: {summary['already_billed']}, "
+            f"without a rate: {summary['unrated']}"
+        )
+        unrated_hostels = defaultdict(list)
+        for hostel_id, room_type in summary['missing_rates']:
+            unrated_hostels[room_type].append(str(hostel_id))
+        for room_type, hostel_ids in unrated_hostels.items():
+            self.stdout.write(self.style.WARNING(
+                f"No billing rate for room type '{room_type or '(none)'}' in hostels {', '.join(hostel_ids)}"
+            ))
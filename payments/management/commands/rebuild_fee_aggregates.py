@@ -0,0 +1,19 @@
+"""
+Rebuild the fee aggregate tables from the raw fee table.
+
+Usage:
+    python manage.py rebuild_fee_aggregates
+"""
+from django.core.management.base import BaseCommand
+
+from payments.aggregates import rebuild_all
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily and monthly fee aggregates from scratch'
+
+    def handle(self, *args, **options):
+        daily, monthly = rebuild_all()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {daily} daily and {monthly} monthly fee aggregate rows.'
+        ))
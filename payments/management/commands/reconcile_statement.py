@@ -0,0 +1,86 @@
+"""
+Match a CSV bank statement to unpaid fees and optionally mark them paid.
+
+The statement needs date and amount columns and a student id column or a
+reference column containing the student id (e.g. "STU-42").
+
+Usage:
+    python manage.py reconcile_statement statement.csv                   # report only
+    python manage.py reconcile_statement statement.csv --apply
+    python manage.py reconcile_statement statement.csv --tolerance-days 3 --report issues.csv
+"""
+import csv
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payments.reconciliation import apply_matches, reconcile
+
+
+class Command(BaseCommand):
+    help = 'Reconcile a CSV bank statement against unpaid fees'
+
+    def add_arguments(self, parser):
+        parser.add_argument('statement', help='Path to the CSV statement')
+        parser.add_argument('--tolerance-days', type=int, default=7,
+                            help='Maximum days between the due date and the transaction date')
+        parser.add_argument('--date-column', default='date')
+        parser.add_argument('--amount-column', default='amount')
+        parser.add_argument('--student-column', default='student_id')
+        parser.add_argument('--reference-column', default='reference')
+        parser.add_argument('--date-format', help='strptime format of the date column (default: common formats)')
+        parser.add_argument('--encoding', default='utf-8-sig')
+        parser.add_argument('--report', help='Write the ambiguous and unmatched lines to this CSV file')
+        parser.add_argument('--apply', action='store_true', help='Mark the matched fees as Paid')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options['statement'], newline='', encoding=options['encoding']) as statement:
+                result = reconcile(
+                    statement,
+                    tolerance_days=options['tolerance_days'],
+                    date_column=options['date_column'],
+                    amount_column=options['amount_column'],
+                    student_column=options['student_column'],
+                    reference_column=options['reference_column'],
+                    date_format=options['date_format'],
+                )
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            raise CommandError(f'Could not read the statement: {e}')
+        except ValueError as e:
+            # Missing columns; see --date-column, --amount-column etc.
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{result['lines']} statement lines checked against {result['indexed_fees']} unpaid fees "
+            f"in {elapsed:.2f}s: {len(result['matches'])} matched, {len(result['ambiguous'])} ambiguous, "
+            f"{len(result['unmatched'])} unmatched."
+        )
+        for reason, count in Counter(reason for _, _, reason in result['unmatched']).most_common():
+            self.stdout.write(f'  {reason}: {count}')
+
+        if options['report']:
+            self.write_report(options['report'], result)
+            self.stdout.write(f"Ambiguous and unmatched lines written to {options['report']}.")
+
+        if options['apply']:
+            updated = apply_matches(result)
+            self.stdout.write(self.style.SUCCESS(f'Marked {updated} fees as Paid.'))
+        elif result['matches']:
+            self.stdout.write('Run again with --apply to mark the matched fees as Paid.')
+
+    def write_report(self, path, result):
+        rows = [(line_no, 'ambiguous', ' '.join(map(str, fee_ids)), row) for line_no, row, fee_ids in result['ambiguous']]
+        rows += [(line_no, reason, '', row) for line_no, row, reason in result['unmatched']]
+        rows.sort(key=lambda item: item[0])
+        columns = []
+        for *_, row in rows:
+            columns.extend(column for column in row if column not in columns and column is not None)
+        with open(path, 'w', newline='', encoding='utf-8') as report:
+            writer = csv.writer(report)
+            writer.writerow(['line', 'issue', 'candidate_fee_ids', *columns])
+            for line_no, issue, candidates, row in rows:
+                writer.writerow([line_no, issue, candidates, *(row.get(column, '') for column in columns)])
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0002_paymentrecord'),
+        ('rooms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeeDailyAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payment_type', models.CharField(blank=True, default='', max_length=50)),
+                ('department', models.CharField(blank=True, default='', max_length=50)),
+                ('is_paid', models.BooleanField(default=False)),
+                ('fee_count', models.PositiveIntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('day', models.DateField(db_index=True)),
+                ('hostel', models.ForeignKey(blank=True, db_column='hostelid', db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='rooms.hostel')),
+            ],
+            options={
+                'verbose_name': 'Fee Daily Aggregate',
+                'verbose_name_plural': 'Fee Daily Aggregates',
+                'db_table': 'fee_daily_aggregate',
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FeeMonthlyAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payment_type', models.CharField(blank=True, default='', max_length=50)),
+                ('department', models.CharField(blank=True, default='', max_length=50)),
+                ('is_paid', models.BooleanField(default=False)),
+                ('fee_count', models.PositiveIntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('month', models.DateField(db_index=True)),
+                ('hostel', models.ForeignKey(blank=True, db_column='hostelid', db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='rooms.hostel')),
+            ],
+            options={
+                'verbose_name': 'Fee Monthly Aggregate',
+                'verbose_name_plural': 'Fee Monthly Aggregates',
+                'db_table': 'fee_monthly_aggregate',
+                'ordering': ['-month'],
+            },
+        ),
+    ]
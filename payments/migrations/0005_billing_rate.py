@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0004_paymentrecord_idempotency_key'),
+        ('rooms', '0002_occupancy_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BillingRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('room_type', models.CharField(max_length=20)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('hostel', models.ForeignKey(blank=True, db_column='hostelid', db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='rooms.hostel')),
+            ],
+            options={
+                'verbose_name': 'Billing Rate',
+                'verbose_name_plural': 'Billing Rates',
+                'db_table': 'billing_rate',
+                'ordering': ['room_type', 'hostel'],
+                'constraints': [models.UniqueConstraint(fields=('room_type', 'hostel'), name='billing_rate_unique_hostel'), models.UniqueConstraint(condition=models.Q(('hostel__isnull', True)), fields=('room_type',), name='billing_rate_unique_default')],
+            },
+        ),
+    ]
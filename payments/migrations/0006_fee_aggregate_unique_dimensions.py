@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:33
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+def clear_aggregates(apps, schema_editor):
+    # Concurrent refreshes may have left duplicate (double-counted) rows that
+    # would violate the new constraints. The tables only hold derived data:
+    # run `python manage.py rebuild_fee_aggregates` after migrating.
+    apps.get_model('payments', 'FeeDailyAggregate').objects.all().delete()
+    apps.get_model('payments', 'FeeMonthlyAggregate').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0005_billing_rate'),
+        ('rooms', '0002_occupancy_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_aggregates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='feedailyaggregate',
+            constraint=models.UniqueConstraint(models.F('day'), models.F('payment_type'), django.db.models.functions.comparison.Coalesce('hostel', models.Value(0)), models.F('department'), models.F('is_paid'), name='fee_daily_aggregate_unique_dimensions'),
+        ),
+        migrations.AddConstraint(
+            model_name='feemonthlyaggregate',
+            constraint=models.UniqueConstraint(models.F('month'), models.F('payment_type'), django.db.models.functions.comparison.Coalesce('hostel', models.Value(0)), models.F('department'), models.F('is_paid'), name='fee_monthly_aggregate_unique_dimensions'),
+        ),
+    ]
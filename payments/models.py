@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Coalesce
 from students.models import Student
 
 
@@ -50,6 +52,9 @@ class PaymentRecord(models.Model):
     fee = models.OneToOneField(Fee, on_delete=models.CASCADE, related_name='payment_record')
     payment_type = models.CharField(max_length=50, choices=PAYMENT_TYPE_CHOICES)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Sent with the student payment form; the unique index makes a resubmitted
+    # or retried payment fail instead of creating a second paid fee
+    idempotency_key = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
     
     def __str__(self):
         return f"{self.fee.studentid.name if self.fee.studentid else 'N/A'} - {self.payment_type} - ₹{self.fee.amount}"
@@ -59,6 +64,96 @@ class PaymentRecord(models.Model):
         verbose_name_plural = 'Payment Records'
 
 
+class FeeAggregateBase(models.Model):
+    """Shared dimensions and measures for the fee aggregate tables"""
+    
+    # Empty string when the fee has no PaymentRecord / department
+    payment_type = models.CharField(max_length=50, blank=True, default='')
+    # Hostel of the student's current allocation (null when unallocated)
+    hostel = models.ForeignKey(
+        'rooms.Hostel', on_delete=models.DO_NOTHING, null=True, blank=True,
+        db_constraint=False, related_name='+', db_column='hostelid'
+    )
+    department = models.CharField(max_length=50, blank=True, default='')
+    is_paid = models.BooleanField(default=False)
+    fee_count = models.PositiveIntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    
+    class Meta:
+        abstract = True
+
+
+class FeeDailyAggregate(FeeAggregateBase):
+    """Fee totals per due date, kept up to date by the Fee signals"""
+    
+    day = models.DateField(db_index=True)
+    
+    def __str__(self):
+        return f"{self.day} - {self.payment_type or 'N/A'} - ₹{self.total_amount}"
+    
+    class Meta:
+        db_table = 'fee_daily_aggregate'
+        ordering = ['-day']
+        verbose_name = 'Fee Daily Aggregate'
+        verbose_name_plural = 'Fee Daily Aggregates'
+        constraints = [
+            # One row per day and dimensions; unallocated (null hostel) rows count as one hostel
+            models.UniqueConstraint(
+                'day', 'payment_type', Coalesce('hostel', Value(0)), 'department', 'is_paid',
+                name='fee_daily_aggregate_unique_dimensions',
+            ),
+        ]
+
+
+class FeeMonthlyAggregate(FeeAggregateBase):
+    """Fee totals per due month, rolled up from FeeDailyAggregate"""
+    
+    # First day of the month
+    month = models.DateField(db_index=True)
+    
+    def __str__(self):
+        return f"{self.month:%b %Y} - {self.payment_type or 'N/A'} - ₹{self.total_amount}"
+    
+    class Meta:
+        db_table = 'fee_monthly_aggregate'
+        ordering = ['-month']
+        verbose_name = 'Fee Monthly Aggregate'
+        verbose_name_plural = 'Fee Monthly Aggregates'
+        constraints = [
+            models.UniqueConstraint(
+                'month', 'payment_type', Coalesce('hostel', Value(0)), 'department', 'is_paid',
+                name='fee_monthly_aggregate_unique_dimensions',
+            ),
+        ]
+
+
+class BillingRate(models.Model):
+    """Hostel fee per term for a room type, used by the billing run"""
+    
+    room_type = models.CharField(max_length=20)
+    # Empty for the default rate of the room type; a hostel's own rate takes precedence
+    hostel = models.ForeignKey(
+        'rooms.Hostel', on_delete=models.DO_NOTHING, null=True, blank=True,
+        db_constraint=False, related_name='+', db_column='hostelid'
+    )
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    
+    def __str__(self):
+        return f"{self.room_type} - {self.hostel or 'All hostels'} - ₹{self.amount}"
+    
+    class Meta:
+        db_table = 'billing_rate'
+        ordering = ['room_type', 'hostel']
+        verbose_name = 'Billing Rate'
+        verbose_name_plural = 'Billing Rates'
+        constraints = [
+            models.UniqueConstraint(fields=['room_type', 'hostel'], name='billing_rate_unique_hostel'),
+            models.UniqueConstraint(
+                fields=['room_type'], condition=models.Q(hostel__isnull=True), name='billing_rate_unique_default'
+            ),
+        ]
+
+
 # Keep Payment model for backward compatibility with existing code
 class Payment(Fee):
     """Proxy model for Fee to maintain compatibility"""
@@ -0,0 +1,174 @@
+"""
+Bank statement reconciliation.
+
+reconcile() reads a CSV bank statement line by line and matches each credit to
+an unpaid fee of the same student and amount whose due date is within
+tolerance_days of the transaction date. Unpaid fees are loaded once into a
+hash index keyed by (studentid, amount), so each line costs one dictionary
+lookup and matching is linear in the size of the statement.
+
+A line is matched when the unclaimed fees that fit all have the same due date;
+such fees are interchangeable and the oldest is claimed. When fees with
+different due dates fit, the line is reported as ambiguous with the candidate
+fee ids and nothing is claimed. Lines that cannot be parsed or have no
+fitting fee are reported as unmatched with a reason. apply_matches() marks the
+matched fees paid with one bulk update.
+
+The statement needs a date column, an amount column and either a student id
+column or a reference column containing the student id (e.g. "HOSTEL STU-42").
+"""
+import csv
+import re
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from .bulk import set_fee_status
+from .models import Fee
+
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y')
+# Student id inside a free-text reference: "STU-42", "SID 42", "student 42"
+STUDENT_REFERENCE = re.compile(r'\b(?:STU|SID|STUDENT)[-\s#:]*(\d+)\b', re.IGNORECASE)
+CENT = Decimal('0.01')
+
+# Reasons for unmatched lines
+INVALID = 'invalid'
+NOT_A_CREDIT = 'not a credit'
+NO_STUDENT = 'no student id'
+NO_FEE = 'no unpaid fee'
+OUTSIDE_WINDOW = 'outside date window'
+ALREADY_MATCHED = 'fee already matched'
+
+
+class FeeIndex:
+    """Unpaid fees by (studentid, amount), each list ordered by due date"""
+
+    def __init__(self, fees):
+        self._fees = defaultdict(list)
+        self.size = 0
+        for fee_id, student_id, amount, duedate in fees:
+            if amount is None:
+                continue
+            self._fees[(student_id, amount.quantize(CENT))].append((duedate, fee_id))
+            self.size += 1
+        self._claimed = set()
+
+    @classmethod
+    def unpaid(cls):
+        fees = Fee.objects.exclude(status__iexact='paid').order_by('duedate', 'feeid').values_list(
+            'feeid', 'studentid', 'amount', 'duedate'
+        )
+        return cls(fees.iterator(chunk_size=5000))
+
+    def match(self, student_id, amount, day, tolerance_days):
+        """
+        ([(due date, fee id)] of the unclaimed fees that fit, reason when none
+        fit); fees without a due date fit any day
+        """
+        fees = self._fees.get((student_id, amount))
+        if not fees:
+            return [], NO_FEE
+        in_window = [
+            (duedate, fee_id) for duedate, fee_id in fees
+            if duedate is None or abs((day - duedate).days) <= tolerance_days
+        ]
+        if not in_window:
+            return [], OUTSIDE_WINDOW
+        available = [fee for fee in in_window if fee[1] not in self._claimed]
+        if not available:
+            return [], ALREADY_MATCHED
+        return available, None
+
+    def claim(self, fee_id):
+        self._claimed.add(fee_id)
+
+
+def parse_amount(value):
+    """Decimal amount from a statement cell such as '₹1,500.00'; None when unreadable"""
+    cleaned = re.sub(r'[^\d.\-]', '', value or '')
+    try:
+        return Decimal(cleaned).quantize(CENT)
+    except InvalidOperation:
+        return None
+
+
+def parse_date(value, date_format=None):
+    value = (value or '').strip()
+    for fmt in ([date_format] if date_format else DATE_FORMATS):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_student(row, student_column, reference_column):
+    value = (row.get(student_column) or '').strip() if student_column else ''
+    if value.isdigit():
+        return int(value)
+    found = STUDENT_REFERENCE.search(row.get(reference_column) or '') if reference_column else None
+    return int(found.group(1)) if found else None
+
+
+def check_columns(fieldnames, required, any_of):
+    """Raise ValueError naming the columns missing from a statement header"""
+    if fieldnames is None:
+        raise ValueError('The statement is empty.')
+    missing = [column for column in required if column not in fieldnames]
+    if not any(column and column in fieldnames for column in any_of):
+        missing.append(' or '.join(column for column in any_of if column))
+    if missing:
+        raise ValueError(
+            f"The statement is missing columns: {', '.join(missing)} (found: {', '.join(fieldnames)})."
+        )
+
+
+def reconcile(lines, index=None, tolerance_days=7, date_column='date', amount_column='amount',
+              student_column='student_id', reference_column='reference', date_format=None):
+    """
+    Match statement lines (an iterable of CSV text lines, e.g. an open file)
+    against the unpaid fees.
+
+    Returns a dict with 'lines' (count), 'matches' [(line number, fee id)],
+    'ambiguous' [(line number, row, candidate fee ids)] and 'unmatched'
+    [(line number, row, reason)]. Line numbers count the header as line 1.
+    Raises ValueError when the header lacks the date or amount column, or
+    both the student id and reference columns.
+    """
+    reader = csv.DictReader(lines)
+    check_columns(reader.fieldnames, [date_column, amount_column], [student_column, reference_column])
+    index = index if index is not None else FeeIndex.unpaid()
+    result = {'lines': 0, 'matches': [], 'ambiguous': [], 'unmatched': [], 'indexed_fees': index.size}
+    for row in reader:
+        result['lines'] += 1
+        line_no = reader.line_num
+        day = parse_date(row.get(date_column), date_format)
+        amount = parse_amount(row.get(amount_column))
+        if day is None or amount is None:
+            result['unmatched'].append((line_no, row, INVALID))
+            continue
+        if amount <= 0:
+            result['unmatched'].append((line_no, row, NOT_A_CREDIT))
+            continue
+        student_id = parse_student(row, student_column, reference_column)
+        if student_id is None:
+            result['unmatched'].append((line_no, row, NO_STUDENT))
+            continue
+
+        fees, reason = index.match(student_id, amount, day, tolerance_days)
+        if reason:
+            result['unmatched'].append((line_no, row, reason))
+        elif len({duedate for duedate, _ in fees}) > 1:
+            result['ambiguous'].append((line_no, row, [fee_id for _, fee_id in fees]))
+        else:
+            index.claim(fees[0][1])
+            result['matches'].append((line_no, fees[0][1]))
+    return result
+
+
+def apply_matches(result):
+    """Mark the matched fees paid in one bulk update; returns the number updated"""
+    fee_ids = [fee_id for _, fee_id in result['matches']]
+    if not fee_ids:
+        return 0
+    return set_fee_status(Fee.objects.filter(pk__in=fee_ids), 'Paid')
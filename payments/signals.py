@@ -0,0 +1,47 @@
+"""
+Keep the fee aggregate tables in sync with Fee and PaymentRecord writes
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from hostel_management.bulk import bulk_updated
+from .aggregates import schedule_refresh
+from .models import Fee, PaymentRecord
+
+
+def _schedule_refresh(*days):
+    """Queue the aggregate refresh once the surrounding transaction commits"""
+    transaction.on_commit(lambda: schedule_refresh(days))
+
+
+@receiver(pre_save, sender=Fee)
+def remember_previous_duedate(sender, instance, **kwargs):
+    """Remember the stored due date so a moved fee also refreshes its old day"""
+    instance._previous_duedate = None
+    if instance.pk:
+        instance._previous_duedate = Fee.objects.filter(pk=instance.pk).values_list(
+            'duedate', flat=True
+        ).first()
+
+
+@receiver(post_save, sender=Fee)
+def fee_saved(sender, instance, **kwargs):
+    _schedule_refresh(instance.duedate, getattr(instance, '_previous_duedate', None))
+
+
+@receiver(post_delete, sender=Fee)
+def fee_deleted(sender, instance, **kwargs):
+    _schedule_refresh(instance.duedate)
+
+
+@receiver([post_save, post_delete], sender=PaymentRecord)
+def payment_record_changed(sender, instance, **kwargs):
+    duedate = Fee.objects.filter(pk=instance.fee_id).values_list('duedate', flat=True).first()
+    _schedule_refresh(duedate)
+
+
+@receiver(bulk_updated, sender=Fee)
+def fees_updated_in_bulk(sender, rows, **kwargs):
+    duedates = Fee.objects.filter(pk__in=[pk for pk, _ in rows]).values_list('duedate', flat=True).distinct()
+    _schedule_refresh(*duedates)
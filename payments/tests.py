@@ -1,3 +1,236 @@
-from django.test import TestCase
+import threading
+from datetime import date
+from decimal import Decimal
+from unittest import SkipTest, mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.test import Client, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from hostel_management.testing import PLAIN_STATIC_STORAGES, create_unmanaged_tables
+from rooms.models import Hostel, Room
+from students.models import Allocation, Student
+from . import billing
+from .billing import billing_key, run_billing
+from .models import BillingRate, Fee, PaymentRecord
+from .reconciliation import ALREADY_MATCHED, INVALID, NO_FEE, NO_STUDENT, OUTSIDE_WINDOW, FeeIndex, reconcile
+
+
+@override_settings(STORAGES=PLAIN_STATIC_STORAGES)
+class StudentPaymentIdempotencyTests(TransactionTestCase):
+    """
+    Replays student payment submissions, also from several threads at once.
+
+    Needs a database where concurrent transactions wait for each other's
+    locks: PostgreSQL, or SQLite with a file test database (the default,
+    DATABASE_TEST_NAME). In-memory SQLite fails conflicting writes
+    immediately, so it is skipped there.
+    """
+    THREADS = 4
+
+    @classmethod
+    def setUpClass(cls):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            raise SkipTest('Concurrent payment tests need PostgreSQL or a file-based SQLite test database')
+        super().setUpClass()
+        create_unmanaged_tables()
+
+    def setUp(self):
+        self.user = User.objects.create_user('asha', email='asha@example.com', password='password')
+        self.student = Student.objects.create(name='asha')
+        self.url = reverse('student_payment_make')
+        self.data = {'payment_type': 'Hostel', 'amount': '1500', 'idempotency_key': 'key-1'}
+
+    def tearDown(self):
+        # The unmanaged tables are not flushed between tests
+        Fee.objects.all().delete()
+        Student.objects.all().delete()
+
+    def post(self, data):
+        client = Client()
+        client.force_login(self.user)
+        return client.post(self.url, data)
+
+    def test_parallel_submissions_create_one_fee(self):
+        barrier = threading.Barrier(self.THREADS)
+        responses, errors = [], []
+
+        def submit():
+            try:
+                barrier.wait()
+                responses.append(self.post(self.data))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        with mock.patch('hostel_management.email_queue.enqueue') as enqueue:
+            threads = [threading.Thread(target=submit) for _ in range(self.THREADS)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(Fee.objects.filter(studentid=self.student).count(), 1)
+        self.assertEqual(PaymentRecord.objects.filter(idempotency_key='key-1').count(), 1)
+        self.assertEqual(enqueue.call_count, 1)
+        for response in responses:
+            self.assertRedirects(response, reverse('payment_list'), fetch_redirect_response=False)
+
+    def test_resubmission_is_not_charged_again(self):
+        self.post(self.data)
+        response = self.post(self.data)
+        self.assertRedirects(response, reverse('payment_list'), fetch_redirect_response=False)
+        self.assertEqual(Fee.objects.filter(studentid=self.student).count(), 1)
+
+    def test_failed_payment_record_leaves_no_fee(self):
+        with mock.patch.object(PaymentRecord.objects, 'create', side_effect=RuntimeError('boom')):
+            response = self.post(self.data)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Fee.objects.exists())
+
+
+class ReconciliationTests(SimpleTestCase):
+    """Matching against a FeeIndex built in memory; no database involved"""
+
+    def reconcile(self, fees, *lines, **options):
+        statement = ['date,amount,student_id,reference', *lines]
+        return reconcile(statement, index=FeeIndex(fees), **options)
+
+    def test_credit_matches_fee_of_same_student_and_amount(self):
+        result = self.reconcile(
+            [(1, 42, Decimal('1500'), date(2025, 1, 10)), (2, 43, Decimal('1500'), date(2025, 1, 10))],
+            '2025-01-12,"1,500.00",42,',
+        )
+        self.assertEqual(result['matches'], [(2, 1)])
+        self.assertEqual(result['unmatched'], [])
+
+    def test_student_id_is_read_from_reference(self):
+        result = self.reconcile([(1, 42, Decimal('800'), date(2025, 1, 10))], '10/01/2025,800,,HOSTEL STU-42')
+        self.assertEqual(result['matches'], [(2, 1)])
+
+    def test_same_due_date_claims_oldest_then_next(self):
+        fees = [(1, 42, Decimal('500'), date(2025, 1, 10)), (2, 42, Decimal('500'), date(2025, 1, 10))]
+        result = self.reconcile(fees, '2025-01-10,500,42,', '2025-01-11,500,42,', '2025-01-12,500,42,')
+        self.assertEqual(result['matches'], [(2, 1), (3, 2)])
+        self.assertEqual([(line, reason) for line, _, reason in result['unmatched']], [(4, ALREADY_MATCHED)])
+
+    def test_different_due_dates_in_window_are_ambiguous(self):
+        fees = [(1, 42, Decimal('500'), date(2025, 1, 8)), (2, 42, Decimal('500'), date(2025, 1, 12))]
+        result = self.reconcile(fees, '2025-01-10,500,42,')
+        self.assertEqual(result['matches'], [])
+        self.assertEqual([(line, ids) for line, _, ids in result['ambiguous']], [(2, [1, 2])])
+
+    def test_window_limits_candidates(self):
+        fees = [(1, 42, Decimal('500'), date(2025, 1, 1)), (2, 42, Decimal('500'), date(2025, 3, 1))]
+        result = self.reconcile(fees, '2025-01-05,500,42,', '2025-02-10,500,42,', tolerance_days=7)
+        self.assertEqual(result['matches'], [(2, 1)])
+        self.assertEqual([(line, reason) for line, _, reason in result['unmatched']], [(3, OUTSIDE_WINDOW)])
+
+    def test_unmatched_reasons(self):
+        result = self.reconcile(
+            [(1, 42, Decimal('500'), date(2025, 1, 10))],
+            'not a date,500,42,', '2025-01-10,500,,no id here', '2025-01-10,999,42,',
+        )
+        self.assertEqual(
+            [(line, reason) for line, _, reason in result['unmatched']],
+            [(2, INVALID), (3, NO_STUDENT), (4, NO_FEE)],
+        )
+
+    def test_missing_columns_are_named(self):
+        with self.assertRaisesMessage(ValueError, 'missing columns: amount, student_id or reference'):
+            reconcile(['date,value,name', '2025-01-10,500,asha'], index=FeeIndex([]))
+
+    def test_empty_statement_is_rejected(self):
+        with self.assertRaisesMessage(ValueError, 'The statement is empty.'):
+            reconcile([], index=FeeIndex([]))
+
+
+class UnpaidFeeIndexTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        create_unmanaged_tables()
+        super().setUpClass()
+
+    def test_paid_fees_are_skipped_whatever_the_case(self):
+        student = Student.objects.create(name='asha')
+        for status in ('Paid', 'paid', 'PAID', 'Not Paid'):
+            Fee.objects.create(studentid=student, amount=500, duedate=date(2025, 1, 10), status=status)
+        unpaid = Fee.objects.get(status='Not Paid')
+
+        result = reconcile(['date,amount,student_id', f'2025-01-10,500,{student.pk}'], index=FeeIndex.unpaid())
+
+        self.assertEqual(result['indexed_fees'], 1)
+        self.assertEqual(result['matches'], [(2, unpaid.pk)])
+
+
+class BillingRunTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        create_unmanaged_tables()
+        super().setUpClass()
+
+    def setUp(self):
+        self.hostel = Hostel.objects.create(name='North')
+        room = Room.objects.create(hostelid=self.hostel, roomnumber='101', capacity=2, type='Double')
+        self.students = [Student.objects.create(name=name) for name in ('asha', 'ravi')]
+        for student in self.students:
+            Allocation.objects.create(student=student, room=room, date_of_allocation=date(2026, 1, 5))
+        BillingRate.objects.create(room_type='Double', amount=Decimal('1500'))
+
+    def billing_keys(self):
+        return sorted(PaymentRecord.objects.values_list('idempotency_key', flat=True))
+
+    def test_rerunning_a_term_bills_nobody_twice(self):
+        self.assertEqual(run_billing(term='2026-1')['billed'], 2)
+
+        summary = run_billing(term='2026-1')
+
+        self.assertEqual((summary['billed'], summary['already_billed']), (0, 2))
+        self.assertEqual(Fee.objects.count(), 2)
+        self.assertEqual(self.billing_keys(), sorted(billing_key('2026-1', s.pk) for s in self.students))
+
+    def test_students_billed_by_a_concurrent_run_are_skipped(self):
+        first, second = self.students
+        compute_charges = billing.compute_charges
+
+        def billed_meanwhile(*args, **kwargs):
+            # Another run bills the first student after the charges were computed
+            result = compute_charges(*args, **kwargs)
+            fee = Fee.objects.create(studentid=first, amount=1500, duedate=date(2026, 2, 1), status='Not Paid')
+            PaymentRecord.objects.create(fee=fee, payment_type='Hostel', idempotency_key=billing_key('2026-1', first.pk))
+            return result
+
+        with mock.patch.object(billing, 'compute_charges', side_effect=billed_meanwhile):
+            summary = run_billing(term='2026-1')
+
+        self.assertEqual((summary['billed'], summary['total_amount']), (1, Decimal('1500')))
+        self.assertEqual(Fee.objects.filter(studentid=first).count(), 1)
+        self.assertEqual(Fee.objects.filter(studentid=second).count(), 1)
+        self.assertEqual(self.billing_keys(), sorted(billing_key('2026-1', s.pk) for s in self.students))
+
+    def test_new_term_bills_again(self):
+        run_billing(term='2026-1')
+
+        self.assertEqual(run_billing(term='2026-2')['billed'], 2)
+
+        self.assertEqual(Fee.objects.count(), 4)
+        self.assertEqual(PaymentRecord.objects.filter(idempotency_key__startswith='billing:2026-2:').count(), 2)
+
+    @override_settings(STORAGES=PLAIN_STATIC_STORAGES)
+    def test_admin_action_bills_selected_hostels_once(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        url = reverse('admin:rooms_hostel_changelist')
+        data = {'action': 'bill_current_term', '_selected_action': [self.hostel.pk]}
+
+        self.client.post(url, data)
+        response = self.client.post(url, data, follow=True)
+
+        self.assertContains(response, 'Billed 0 students')
+        self.assertContains(response, '2 were already billed')
+        self.assertEqual(Fee.objects.count(), 2)
+        self.assertEqual(PaymentRecord.objects.count(), 2)
@@ -4,6 +4,8 @@ from . import views
 urlpatterns = [
     path('', views.payment_list, name='payment_list'),
     path('add/', views.payment_add, name='payment_add'),
+    path('analytics/', views.payment_analytics, name='payment_analytics'),
+    path('bulk-status/', views.payment_bulk_status, name='payment_bulk_status'),
     path('<int:pk>/', views.payment_detail, name='payment_detail'),
     path('<int:pk>/edit/', views.payment_edit, name='payment_edit'),
     path('<int:pk>/update-status/', views.payment_update_status, name='payment_update_status'),
@@ -1,10 +1,19 @@
+import uuid
+from datetime import timedelta
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
+from django.db import IntegrityError, transaction
+from django.db.models import Sum
+from django.http import JsonResponse
 from django.utils import timezone
-from .models import Fee
+from .models import Fee, PaymentRecord
 from .forms import FeeForm, FeeUpdateForm
 from students.models import Student
+from hostel_management.async_utils import alist, arender, aget_student_for_user
+from hostel_management.conditional import conditional_page
+from hostel_management.db_router import read_only_view
 
 
 def is_admin(user):
@@ -18,23 +27,23 @@ def is_admin(user):
 
 
 @login_required
-def payment_list(request):
+@read_only_view
+# The admin list shows student names, which change with the 'rooms' scope
+@conditional_page('fees', 'rooms')
+async def payment_list(request):
     """List payments based on user role"""
-    if is_admin(request.user):
+    user = await request.auser()
+    if await sync_to_async(is_admin)(user):
         # Admin sees all payments
-        payments = Fee.objects.all()
+        payments = await alist(Fee.objects.select_related('studentid', 'payment_record'))
         template = 'payments/payment_list.html'
     else:
         # Student sees only their payments
         try:
-            # Try to find student by username matching
-            student = Student.objects.filter(name__icontains=request.user.username).first()
-            if not student:
-                # If no exact match, try to find by user profile or create a basic student record
-                student = Student.objects.filter(studentid=request.user.id).first()
+            student = await aget_student_for_user(user)
             
             if student:
-                payments = Fee.objects.filter(studentid=student)
+                payments = await alist(Fee.objects.filter(studentid=student).select_related('payment_record'))
             else:
                 payments = []
                 messages.warning(request, 'Student profile not found.')
@@ -46,7 +55,7 @@ def payment_list(request):
     context = {
         'payments': payments,
     }
-    return render(request, template, context)
+    return await arender(request, template, context)
 
 
 @login_required
@@ -181,6 +190,27 @@ def payment_update_status(request, pk):
     return render(request, 'payments/payment_update.html', context)
 
 
+@login_required
+@user_passes_test(is_admin)
+def payment_bulk_status(request):
+    """Set the status of the selected payments in one update (admin only)"""
+    if request.method != 'POST':
+        return redirect('payment_list')
+    
+    from .bulk import set_fee_status
+    
+    status = request.POST.get('status')
+    fee_ids = [pk for pk in request.POST.getlist('fee_ids') if pk.isdigit()]
+    if status not in dict(FeeUpdateForm.STATUS_CHOICES):
+        messages.error(request, 'Please choose a valid status.')
+    elif not fee_ids:
+        messages.error(request, 'Please select at least one payment.')
+    else:
+        updated = set_fee_status(Fee.objects.filter(pk__in=fee_ids), status)
+        messages.success(request, f'{updated} payment(s) marked as {status}.')
+    return redirect('payment_list')
+
+
 @login_required
 @user_passes_test(is_admin)
 def payment_delete(request, pk):
@@ -198,6 +228,39 @@ def payment_delete(request, pk):
     return render(request, 'payments/payment_confirm_delete.html', context)
 
 
+@login_required
+@user_passes_test(is_admin)
+@read_only_view
+def payment_analytics(request):
+    """Fee collection dashboard read from the aggregate tables (admin only)"""
+    from .aggregates import aging_buckets
+    from .models import FeeMonthlyAggregate
+    
+    today = timezone.localdate()
+    first_month = (today.replace(day=1) - timedelta(days=335)).replace(day=1)
+    revenue = FeeMonthlyAggregate.objects.filter(is_paid=True, month__gte=first_month).order_by()
+    
+    def totals(*fields):
+        return list(
+            revenue.values(*fields).annotate(
+                fee_count=Sum('fee_count'), total_amount=Sum('total_amount')
+            ).order_by(*fields)
+        )
+    
+    context = {
+        'first_month': first_month,
+        'revenue_by_month': totals('month'),
+        'revenue_by_type': totals('payment_type'),
+        'revenue_by_hostel': totals('hostel__name'),
+        'revenue_by_department': totals('department'),
+        'aging': aging_buckets(today),
+    }
+    
+    if request.GET.get('format') == 'json':
+        return JsonResponse(context)
+    return render(request, 'payments/payment_analytics.html', context)
+
+
 @login_required
 def student_payment_make(request):
     """Student payment interface with dropdown and amount controls"""
@@ -214,41 +277,63 @@ def student_payment_make(request):
     if request.method == 'POST':
         payment_type = request.POST.get('payment_type')
         amount = request.POST.get('amount')
+        # Generated when the form is rendered, so a double submit or a retried
+        # POST carries the same key and pays only once
+        idempotency_key = request.POST.get('idempotency_key', '').strip()[:64] or None
         
         if payment_type and amount:
+            if _payment_already_made(idempotency_key, student):
+                messages.info(request, 'This payment has already been processed.')
+                return redirect('payment_list')
             try:
-                # Create a new fee record for the student
-                fee = Fee.objects.create(
-                    studentid=student,
-                    amount=amount,
-                    duedate=timezone.now().date(),
-                    status='Paid'  # Mark as paid since student is making payment
-                )
-                
-                # Create a payment record to track the payment type
-                from .models import PaymentRecord
-                PaymentRecord.objects.create(
-                    fee=fee,
-                    payment_type=payment_type
-                )
-                
-                # Send email confirmation to student
-                try:
-                    from hostel_management.email_utils import send_payment_confirmation_email
+                with transaction.atomic():
+                    # Create a new fee record for the student
+                    fee = Fee.objects.create(
+                        studentid=student,
+                        amount=amount,
+                        duedate=timezone.now().date(),
+                        status='Paid'  # Mark as paid since student is making payment
+                    )
+                    
+                    # Create a payment record to track the payment type
+                    PaymentRecord.objects.create(
+                        fee=fee,
+                        payment_type=payment_type,
+                        idempotency_key=idempotency_key,
+                    )
+                    
+                    # Send email confirmation to student
+                    # Queued once the payment is committed, so a rolled back payment sends nothing
                     if request.user.email:
-                        send_payment_confirmation_email(fee, payment_type, request.user.email, student.name)
-                except Exception as e:
-                    print(f"Email sending failed: {str(e)}")
-                    # Continue even if email fails
-                
-                messages.success(request, f'Payment of ₹{amount} for {payment_type} has been processed successfully! A confirmation email has been sent.')
-                return redirect('payment_list')
+                        from hostel_management.email_queue import enqueue
+                        from hostel_management.email_utils import send_payment_confirmation_email
+                        email = request.user.email
+                        transaction.on_commit(
+                            lambda: enqueue(send_payment_confirmation_email, fee, payment_type, email, student.name)
+                        )
+            except IntegrityError as e:
+                # The same submission committed first in a concurrent request
+                if _payment_already_made(idempotency_key, student):
+                    messages.info(request, 'This payment has already been processed.')
+                    return redirect('payment_list')
+                messages.error(request, f'Error processing payment: {str(e)}')
             except Exception as e:
                 messages.error(request, f'Error processing payment: {str(e)}')
+            else:
+                messages.success(request, f'Payment of ₹{amount} for {payment_type} has been processed successfully! A confirmation email has been sent.')
+                return redirect('payment_list')
         else:
             messages.error(request, 'Please fill in all required fields.')
     
     context = {
         'student': student,
+        'idempotency_key': uuid.uuid4().hex,
     }
     return render(request, 'payments/student_payment_make.html', context)
+
+
+def _payment_already_made(idempotency_key, student):
+    """Whether the student already made the payment submitted with this key"""
+    if not idempotency_key:
+        return False
+    return PaymentRecord.objects.filter(idempotency_key=idempotency_key, fee__studentid=student.pk).exists()
@@ -1,11 +1,26 @@
-from django.contrib import admin
-from .models import Room, Hostel
+from django.contrib import admin, messages
+from .models import Room, Hostel, OccupancySnapshot
 
 
 @admin.register(Hostel)
 class HostelAdmin(admin.ModelAdmin):
     list_display = ['name', 'location', 'totalrooms']
     search_fields = ['name', 'location']
+    actions = ['bill_current_term']
+    
+    @admin.action(description="Bill this term's hostel fee to the residents of the selected hostels")
+    def bill_current_term(self, request, queryset):
+        from payments.billing import run_billing
+        
+        summary = run_billing(hostel_ids=list(queryset.values_list('pk', flat=True)))
+        self.message_user(request, (
+            f"Billed {summary['billed']} students ₹{summary['total_amount']:,.2f} for term {summary['term']} "
+            f"(due {summary['due_date']}); {summary['already_billed']} were already billed."
+        ), messages.SUCCESS)
+        if summary['unrated']:
+            self.message_user(request, (
+                f"{summary['unrated']} students were skipped because their room type has no billing rate."
+            ), messages.WARNING)
 
 
 @admin.register(Room)
@@ -17,3 +32,10 @@ class RoomAdmin(admin.ModelAdmin):
     def current_occupancy_display(self, obj):
         return f"{obj.current_occupancy()}/{obj.capacity}"
     current_occupancy_display.short_description = 'Occupancy'
+
+
+@admin.register(OccupancySnapshot)
+class OccupancySnapshotAdmin(admin.ModelAdmin):
+    list_display = ['day', 'hostel', 'room_type', 'occupied_beds', 'total_beds']
+    list_filter = ['hostel', 'room_type']
+    date_hierarchy = 'day'
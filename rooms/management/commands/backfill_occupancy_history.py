@@ -0,0 +1,48 @@
+"""
+Backfill the daily occupancy history from allocation dates.
+
+Usage:
+    python manage.py backfill_occupancy_history              # since the last snapshot
+    python manage.py backfill_occupancy_history --days 180   # last 180 days
+    python manage.py backfill_occupancy_history --since 2025-07-01
+"""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from rooms.history import backfill
+from rooms.models import OccupancySnapshot
+from students.models import Allocation
+
+
+class Command(BaseCommand):
+    help = 'Rebuild daily occupancy snapshots per hostel and room type'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='First day to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--days', type=int, help='Rebuild the last N days')
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+
+        if options['since']:
+            try:
+                start = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError('--since must be a date in YYYY-MM-DD format')
+        elif options['days']:
+            start = today - timedelta(days=options['days'] - 1)
+        else:
+            last_day = OccupancySnapshot.objects.aggregate(Max('day'))['day__max']
+            if last_day:
+                start = min(last_day, today)
+            else:
+                first = Allocation.objects.aggregate(Min('date_of_allocation'))['date_of_allocation__min']
+                start = first or today
+
+        written = backfill(start, today)
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {written} occupancy snapshots for {start} to {today}.'
+        ))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OccupancySnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('room_type', models.CharField(blank=True, default='', max_length=20)),
+                ('occupied_beds', models.PositiveIntegerField(default=0)),
+                ('total_beds', models.PositiveIntegerField(default=0)),
+                ('hostel', models.ForeignKey(db_column='hostelid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='rooms.hostel')),
+            ],
+            options={
+                'verbose_name': 'Occupancy Snapshot',
+                'verbose_name_plural': 'Occupancy Snapshots',
+                'db_table': 'occupancy_snapshot',
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('day', 'hostel', 'room_type'), name='occupancy_snapshot_unique_day')],
+            },
+        ),
+    ]
@@ -58,6 +58,9 @@ class Room(models.Model):
     
     def current_occupancy(self):
         """Get current number of students allocated to this room"""
+        # Rooms loaded through rooms.occupancy already carry the count
+        if hasattr(self, 'occupied'):
+            return self.occupied
         from students.models import Allocation
         return Allocation.objects.filter(room=self).count()
     
@@ -71,10 +74,35 @@ class Room(models.Model):
     
     def occupancy_percentage(self):
         """Get occupancy percentage"""
-        if self.capacity == 0:
+        if not self.capacity:
             return 0
         return (self.current_occupancy() / self.capacity) * 100
     
     def get_room_type_display(self):
         """Get display value for room type"""
         return self.type if self.type else 'N/A'
+
+
+class OccupancySnapshot(models.Model):
+    """Daily occupied beds per hostel and room type, derived from allocation dates"""
+    
+    day = models.DateField()
+    hostel = models.ForeignKey(
+        Hostel, on_delete=models.DO_NOTHING, db_constraint=False,
+        related_name='+', db_column='hostelid'
+    )
+    room_type = models.CharField(max_length=20, blank=True, default='')
+    occupied_beds = models.PositiveIntegerField(default=0)
+    total_beds = models.PositiveIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.day} - {self.hostel_id} - {self.room_type or 'N/A'}: {self.occupied_beds}/{self.total_beds}"
+    
+    class Meta:
+        db_table = 'occupancy_snapshot'
+        ordering = ['day']
+        verbose_name = 'Occupancy Snapshot'
+        verbose_name_plural = 'Occupancy Snapshots'
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'hostel', 'room_type'], name='occupancy_snapshot_unique_day'),
+        ]
@@ -0,0 +1,144 @@
+"""
+Grouped occupancy queries for hostels and rooms.
+
+These replace per-room current_occupancy() calls (one COUNT per room) with a
+single annotated query. occupancy_index(), hostel_rollups() and
+utilization_index() keep the results for all hostels in the shared cache until
+the 'rooms' content version changes; warm_caches fills them after a deploy.
+"""
+import re
+from collections import OrderedDict
+
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from hostel_management import caching, conditional, metrics
+from students.models import Allocation
+from .models import Hostel, Room
+
+FILL_LEVELS = ('empty', 'partial', 'full')
+
+
+def rooms_with_occupancy(hostel=None):
+    """Rooms annotated with `occupied` (allocation count) in one query"""
+    rooms = Room.objects.select_related('hostelid').annotate(occupied=Count('allocations'))
+    if hostel is not None:
+        rooms = rooms.filter(hostelid=hostel)
+    return rooms
+
+
+def hostels_with_utilization():
+    """Hostels annotated with room_count, total_beds and occupied_beds in one query"""
+    metrics.inc('occupancy_recomputations_total', kind='hostel_utilization')
+    occupied = Allocation.objects.filter(
+        room__hostelid=OuterRef('pk')
+    ).order_by().values('room__hostelid').annotate(total=Count('pk')).values('total')
+    beds = Room.objects.filter(hostelid=OuterRef('pk')).order_by().values('hostelid').annotate(
+        total=Sum('capacity')
+    ).values('total')
+    return Hostel.objects.annotate(
+        room_count=Count('rooms'),
+        total_beds=Coalesce(Subquery(beds, output_field=IntegerField()), Value(0)),
+        occupied_beds=Coalesce(Subquery(occupied, output_field=IntegerField()), Value(0)),
+    )
+
+
+def _cached(name, compute, force):
+    """compute() cached under the current 'rooms' version"""
+    version, _ = conditional.current(['rooms'])['rooms']
+    return caching.get_or_set(f'{name}:{version}', compute, force=force)
+
+
+def occupancy_index(force=False):
+    """rooms_with_occupancy() for every room, as a cached list"""
+    return _cached('occupancy_index', lambda: list(rooms_with_occupancy()), force)
+
+
+def hostel_rollups(force=False):
+    """hostels_with_utilization() as a cached list"""
+    return _cached('hostel_rollups', lambda: list(hostels_with_utilization()), force)
+
+
+def utilization_index(force=False):
+    """utilization_summary() for every hostel, cached"""
+    return _cached('utilization_index', utilization_summary, force)
+
+
+def fill_level(occupied, capacity):
+    """Classify a room as empty, partial or full"""
+    if not occupied:
+        return 'empty'
+    if occupied >= (capacity or 0):
+        return 'full'
+    return 'partial'
+
+
+def floor_of(roomnumber):
+    """Derive the floor from a room number: '101' -> 1, '1203' -> 12, '12' -> 0"""
+    match = re.match(r'\d+', roomnumber or '')
+    if not match:
+        return None
+    digits = match.group()
+    return int(digits[:-2]) if len(digits) >= 3 else 0
+
+
+def _room_sort_key(room):
+    try:
+        return (0, int(room.roomnumber))
+    except (ValueError, TypeError):
+        return (1, room.roomnumber or '')
+
+
+def utilization_summary(hostel=None):
+    """
+    Per-hostel totals, rooms by fill level and a floor -> rooms heatmap.
+    Returns a list of JSON-serialisable dicts, one per hostel.
+    """
+    metrics.inc('occupancy_recomputations_total', kind='utilization_summary')
+    summaries = OrderedDict()
+    hostels = Hostel.objects.order_by('name') if hostel is None else [hostel]
+    for item in hostels:
+        summaries[item.pk] = {
+            'hostel_id': item.pk,
+            'name': item.name,
+            'location': item.location,
+            'total_rooms': 0,
+            'total_beds': 0,
+            'occupied_beds': 0,
+            'free_beds': 0,
+            'utilization': 0.0,
+            'rooms_by_fill': {level: 0 for level in FILL_LEVELS},
+            'floors': OrderedDict(),
+        }
+
+    for room in sorted(rooms_with_occupancy(hostel), key=_room_sort_key):
+        summary = summaries.get(room.hostelid_id)
+        if summary is None:
+            continue
+        capacity = room.capacity or 0
+        level = fill_level(room.occupied, capacity)
+        summary['total_rooms'] += 1
+        summary['total_beds'] += capacity
+        summary['occupied_beds'] += room.occupied
+        summary['rooms_by_fill'][level] += 1
+        floor = floor_of(room.roomnumber)
+        summary['floors'].setdefault(floor, []).append({
+            'room_id': room.pk,
+            'roomnumber': room.roomnumber,
+            'type': room.type,
+            'capacity': capacity,
+            'occupied': room.occupied,
+            'fill': level,
+        })
+
+    results = []
+    for summary in summaries.values():
+        summary['free_beds'] = max(summary['total_beds'] - summary['occupied_beds'], 0)
+        if summary['total_beds']:
+            summary['utilization'] = round(summary['occupied_beds'] * 100 / summary['total_beds'], 1)
+        summary['floors'] = [
+            {'floor': floor, 'rooms': rooms}
+            for floor, rooms in sorted(summary['floors'].items(), key=lambda item: (item[0] is None, item[0] or 0))
+        ]
+        results.append(summary)
+    return results
@@ -12,6 +12,8 @@ urlpatterns = [
     # Hostel URLs
     path('hostels/', views.hostel_list, name='hostel_list'),
     path('hostels/add/', views.hostel_add, name='hostel_add'),
+    path('hostels/utilization/', views.hostel_utilization, name='hostel_utilization'),
+    path('hostels/occupancy-trend/', views.occupancy_trend, name='occupancy_trend'),
     path('hostels/<int:pk>/', views.hostel_detail, name='hostel_detail'),
     path('hostels/<int:pk>/edit/', views.hostel_edit, name='hostel_edit'),
     path('hostels/<int:pk>/delete/', views.hostel_delete, name='hostel_delete'),
@@ -1,8 +1,13 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
+from django.http import Http404, JsonResponse
+from asgiref.sync import sync_to_async
 from .models import Room, Hostel
 from .forms import RoomForm, HostelForm
+from hostel_management.async_utils import arender
+from hostel_management.conditional import conditional_page
+from hostel_management.db_router import read_only_view
 
 
 def is_admin(user):
@@ -16,29 +21,24 @@ def is_admin(user):
 
 
 @login_required
-def room_list(request):
+@read_only_view
+@conditional_page('rooms')
+async def room_list(request):
     """List all rooms grouped by hostel"""
     from collections import defaultdict
-    from students.models import Allocation
+    from .occupancy import occupancy_index
     
-    # Get all rooms
-    rooms = Room.objects.select_related('hostelid').all()
+    # All rooms with their occupancy (one query, cached until rooms change)
+    rooms = await sync_to_async(occupancy_index)()
     
     # Calculate statistics
-    total_rooms = rooms.count()
+    total_rooms = len(rooms)
     
     # Count occupied and available rooms correctly
     # Occupied = completely full (current_occupancy == capacity)
     # Available = has at least one bed free (current_occupancy < capacity)
-    occupied_rooms = 0
-    available_rooms = 0
-    
-    for room in rooms:
-        current_occupancy = Allocation.objects.filter(room=room).count()
-        if current_occupancy >= room.capacity:
-            occupied_rooms += 1
-        else:
-            available_rooms += 1
+    occupied_rooms = sum(1 for room in rooms if room.occupied >= (room.capacity or 0))
+    available_rooms = total_rooms - occupied_rooms
     
     # Group rooms by hostel
     rooms_by_hostel = defaultdict(list)
@@ -68,7 +68,7 @@ def room_list(request):
         'occupied_rooms': occupied_rooms,
         'available_rooms': available_rooms,
     }
-    return render(request, 'rooms/room_list.html', context)
+    return await arender(request, 'rooms/room_list.html', context)
 
 
 @login_required
@@ -154,13 +154,17 @@ def room_detail(request, pk):
 
 # Hostel Views
 @login_required
-def hostel_list(request):
+@read_only_view
+@conditional_page('rooms')
+async def hostel_list(request):
     """List all hostels"""
-    hostels = Hostel.objects.all()
+    from .occupancy import hostel_rollups
+    
+    hostels = await sync_to_async(hostel_rollups)()
     context = {
         'hostels': hostels,
     }
-    return render(request, 'rooms/hostel_list.html', context)
+    return await arender(request, 'rooms/hostel_list.html', context)
 
 
 @login_required
@@ -225,13 +229,83 @@ def hostel_delete(request, pk):
 
 
 @login_required
+@read_only_view
+@conditional_page('rooms')
 def hostel_detail(request, pk):
     """View hostel details"""
+    from .occupancy import utilization_summary
+    
     hostel = get_object_or_404(Hostel, pk=pk)
-    rooms = hostel.rooms.all()
+    summary = utilization_summary(hostel)[0]
     
     context = {
         'hostel': hostel,
-        'rooms': rooms,
+        'summary': summary,
     }
     return render(request, 'rooms/hostel_detail.html', context)
+
+
+def hostel_from_query(request):
+    """Hostel selected with ?hostel=<id>, None when not given; 404 for an unknown or malformed id"""
+    value = request.GET.get('hostel')
+    if not value:
+        return None
+    if not value.isdigit():
+        raise Http404('No hostel matches the given query.')
+    return get_object_or_404(Hostel, pk=value)
+
+
+@login_required
+@read_only_view
+def hostel_utilization(request):
+    """Bed utilization and floor/room heatmap for every hostel (HTML or JSON)"""
+    from .occupancy import utilization_index, utilization_summary
+    
+    hostel = hostel_from_query(request)
+    if hostel is not None:
+        hostels = utilization_summary(hostel)
+    else:
+        hostels = utilization_index()
+    
+    if request.GET.get('format') == 'json':
+        return JsonResponse({'hostels': hostels})
+    
+    context = {
+        'hostels': hostels,
+    }
+    return render(request, 'rooms/hostel_utilization.html', context)
+
+
+@login_required
+@read_only_view
+def occupancy_trend(request):
+    """Daily occupancy trend from the occupancy history (HTML chart or JSON)"""
+    from datetime import timedelta
+    from django.utils import timezone
+    from .history import trend
+    
+    try:
+        days = max(1, min(int(request.GET.get('days', 120)), 730))
+    except ValueError:
+        days = 120
+    hostel = hostel_from_query(request)
+    room_type = request.GET.get('type') or None
+    
+    end = timezone.localdate()
+    series = trend(end - timedelta(days=days - 1), end, hostel, room_type)
+    
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'hostel_id': hostel.pk if hostel else None,
+            'room_type': room_type,
+            'series': series,
+        })
+    
+    context = {
+        'series': series,
+        'days': days,
+        'hostel': hostel,
+        'room_type': room_type,
+        'hostels': Hostel.objects.order_by('name'),
+    }
+    return render(request, 'rooms/occupancy_trend.html', context)
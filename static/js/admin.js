@@ -0,0 +1,136 @@
+// Theme Toggle
+function toggleTheme() {
+    const html = document.documentElement;
+    const currentTheme = html.getAttribute('data-theme');
+    const newTheme = currentTheme === 'dark' ? 'light' : 'dark';
+    const icon = document.getElementById('theme-icon');
+    const mobileIcon = document.getElementById('mobile-theme-icon');
+
+    html.setAttribute('data-theme', newTheme);
+
+    // Update both icons (sidebar and mobile)
+    if (icon) {
+        icon.className = newTheme === 'dark' ? 'bi bi-moon-stars-fill' : 'bi bi-sun-fill';
+    }
+    if (mobileIcon) {
+        mobileIcon.className = newTheme === 'dark' ? 'bi bi-moon-stars-fill' : 'bi bi-sun-fill';
+    }
+
+    // Save preference
+    localStorage.setItem('theme', newTheme);
+}
+
+// Load saved theme
+document.addEventListener('DOMContentLoaded', function() {
+    const savedTheme = localStorage.getItem('theme') || 'dark';
+    const icon = document.getElementById('theme-icon');
+    const mobileIcon = document.getElementById('mobile-theme-icon');
+
+    document.documentElement.setAttribute('data-theme', savedTheme);
+
+    if (icon) {
+        icon.className = savedTheme === 'dark' ? 'bi bi-moon-stars-fill' : 'bi bi-sun-fill';
+    }
+    if (mobileIcon) {
+        mobileIcon.className = savedTheme === 'dark' ? 'bi bi-moon-stars-fill' : 'bi bi-sun-fill';
+    }
+});
+
+// Mobile Sidebar Toggle
+function toggleSidebar() {
+    const sidebar = document.getElementById('sidebar');
+    const overlay = document.querySelector('.sidebar-overlay');
+    sidebar.classList.toggle('active');
+    overlay.classList.toggle('active');
+}
+
+// Close sidebar when clicking outside on mobile
+document.addEventListener('click', function(event) {
+    const sidebar = document.getElementById('sidebar');
+    const toggle = document.querySelector('.mobile-menu-toggle');
+    const isClickInsideSidebar = sidebar.contains(event.target);
+    const isClickOnToggle = toggle && toggle.contains(event.target);
+
+    if (!isClickInsideSidebar && !isClickOnToggle && sidebar.classList.contains('active')) {
+        toggleSidebar();
+    }
+});
+
+// Logout profile click handler
+document.addEventListener('DOMContentLoaded', function() {
+    const logoutProfile = document.getElementById('logout-profile');
+    if (logoutProfile) {
+        logoutProfile.addEventListener('click', function() {
+            window.location.href = logoutProfile.dataset.logoutUrl;
+        });
+    }
+});
+
+// Windows-specific layout fixes
+function fixWindowsLayout() {
+    const mainContent = document.querySelector('.main-content');
+    if (mainContent) {
+        const sidebar = document.querySelector('.glass-sidebar');
+        if (sidebar) {
+            const sidebarWidth = sidebar.offsetWidth + 40; // 40px for margins
+            const availableWidth = window.innerWidth - sidebarWidth;
+            mainContent.style.width = availableWidth + 'px';
+            mainContent.style.maxWidth = availableWidth + 'px';
+        }
+    }
+}
+
+// Apply fixes on load and resize
+document.addEventListener('DOMContentLoaded', fixWindowsLayout);
+window.addEventListener('resize', fixWindowsLayout);
+
+// Fix dropdown positioning on Windows
+function fixDropdowns() {
+    const selects = document.querySelectorAll('.form-select');
+    selects.forEach(select => {
+        select.addEventListener('focus', function() {
+            const rect = this.getBoundingClientRect();
+            const viewportWidth = window.innerWidth;
+
+            // If dropdown would overflow, adjust positioning
+            if (rect.right > viewportWidth - 20) {
+                this.style.maxWidth = (viewportWidth - rect.left - 40) + 'px';
+            }
+        });
+
+        select.addEventListener('blur', function() {
+            this.style.maxWidth = '';
+        });
+    });
+}
+
+// Apply dropdown fixes
+document.addEventListener('DOMContentLoaded', fixDropdowns);
+
+// Bulk status forms on the payment and complaint lists
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('[data-bulk-form]').forEach(function(form) {
+        const items = form.querySelectorAll('[data-bulk-item]');
+        const selectAll = form.querySelector('[data-bulk-select-all]');
+        const submit = form.querySelector('[data-bulk-submit]');
+
+        function refresh() {
+            const checked = form.querySelectorAll('[data-bulk-item]:checked').length;
+            submit.disabled = checked === 0;
+            if (selectAll) {
+                selectAll.checked = checked > 0 && checked === items.length;
+                selectAll.indeterminate = checked > 0 && checked < items.length;
+            }
+        }
+
+        items.forEach(function(item) {
+            item.addEventListener('change', refresh);
+        });
+        if (selectAll) {
+            selectAll.addEventListener('change', function() {
+                items.forEach(function(item) { item.checked = selectAll.checked; });
+                refresh();
+            });
+        }
+    });
+});
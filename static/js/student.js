@@ -0,0 +1,186 @@
+// Theme Toggle Functionality
+function toggleTheme() {
+    const html = document.documentElement;
+    const currentTheme = html.getAttribute('data-theme');
+    const newTheme = currentTheme === 'dark' ? 'light' : 'dark';
+
+    html.setAttribute('data-theme', newTheme);
+    localStorage.setItem('theme', newTheme);
+
+    // Update both icons (sidebar and mobile)
+    const icon = document.getElementById('theme-icon');
+    const mobileIcon = document.getElementById('mobile-theme-icon');
+
+    if (newTheme === 'dark') {
+        if (icon) icon.className = 'bi bi-sun-fill';
+        if (mobileIcon) mobileIcon.className = 'bi bi-sun-fill';
+    } else {
+        if (icon) icon.className = 'bi bi-moon-fill';
+        if (mobileIcon) mobileIcon.className = 'bi bi-moon-fill';
+    }
+}
+
+// Load saved theme on page load
+document.addEventListener('DOMContentLoaded', function() {
+    const savedTheme = localStorage.getItem('theme') || 'dark';
+    document.documentElement.setAttribute('data-theme', savedTheme);
+
+    const icon = document.getElementById('theme-icon');
+    const mobileIcon = document.getElementById('mobile-theme-icon');
+
+    if (savedTheme === 'dark') {
+        if (icon) icon.className = 'bi bi-sun-fill';
+        if (mobileIcon) mobileIcon.className = 'bi bi-sun-fill';
+    } else {
+        if (icon) icon.className = 'bi bi-moon-fill';
+        if (mobileIcon) mobileIcon.className = 'bi bi-moon-fill';
+    }
+});
+
+// Mobile sidebar toggle
+function toggleSidebar() {
+    const sidebar = document.getElementById('sidebar');
+    const overlay = document.getElementById('sidebar-overlay');
+    sidebar.classList.toggle('active');
+    overlay.classList.toggle('active');
+}
+
+// Close sidebar when clicking outside on mobile
+document.addEventListener('click', function(event) {
+    const sidebar = document.getElementById('sidebar');
+    const toggle = document.querySelector('.mobile-menu-toggle');
+    const overlay = document.getElementById('sidebar-overlay');
+
+    if (window.innerWidth <= 992) {
+        if (!sidebar.contains(event.target) && !toggle.contains(event.target)) {
+            sidebar.classList.remove('active');
+            overlay.classList.remove('active');
+        }
+    }
+});
+
+// Handle window resize
+window.addEventListener('resize', function() {
+    const sidebar = document.getElementById('sidebar');
+    const overlay = document.getElementById('sidebar-overlay');
+
+    if (window.innerWidth > 992) {
+        sidebar.classList.remove('active');
+        overlay.classList.remove('active');
+    }
+});
+
+// Logout profile click handler
+document.addEventListener('DOMContentLoaded', function() {
+    const logoutProfile = document.getElementById('logout-profile');
+    if (logoutProfile) {
+        logoutProfile.addEventListener('click', function() {
+            window.location.href = logoutProfile.dataset.logoutUrl;
+        });
+    }
+});
+
+// Windows-specific layout fixes
+function fixWindowsLayout() {
+    const mainContent = document.querySelector('.main-content');
+    if (mainContent) {
+        const sidebar = document.querySelector('.glass-sidebar');
+        if (sidebar) {
+            const sidebarWidth = sidebar.offsetWidth + 40; // 40px for margins
+            const availableWidth = window.innerWidth - sidebarWidth;
+            mainContent.style.width = availableWidth + 'px';
+            mainContent.style.maxWidth = availableWidth + 'px';
+        }
+    }
+}
+
+// Apply fixes on load and resize
+document.addEventListener('DOMContentLoaded', fixWindowsLayout);
+window.addEventListener('resize', fixWindowsLayout);
+
+// Fix dropdown positioning on Windows
+function fixDropdowns() {
+    const selects = document.querySelectorAll('.form-select');
+    selects.forEach(select => {
+        select.addEventListener('focus', function() {
+            const rect = this.getBoundingClientRect();
+            const viewportWidth = window.innerWidth;
+
+            // If dropdown would overflow, adjust positioning
+            if (rect.right > viewportWidth - 20) {
+                this.style.maxWidth = (viewportWidth - rect.left - 40) + 'px';
+            }
+        });
+
+        select.addEventListener('blur', function() {
+            this.style.maxWidth = '';
+        });
+    });
+}
+
+// Apply dropdown fixes
+document.addEventListener('DOMContentLoaded', fixDropdowns);
+
+// Live complaint updates (server-sent events; only served in ASGI mode)
+const COMPLAINT_BADGES = {pending: 'bg-warning', in_progress: 'bg-info', resolved: 'bg-success'};
+
+function applyComplaintState(state) {
+    document.querySelectorAll(`[data-complaint-status="${state.id}"]`).forEach(function(cell) {
+        const badge = document.createElement('span');
+        badge.className = 'badge ' + (COMPLAINT_BADGES[state.status] || 'bg-secondary');
+        badge.textContent = state.status_display;
+        cell.replaceChildren(badge);
+    });
+    document.querySelectorAll(`[data-complaint-remarks="${state.id}"]`).forEach(function(remarks) {
+        remarks.textContent = state.admin_remarks;
+    });
+    document.querySelectorAll(`[data-complaint-remarks-block="${state.id}"]`).forEach(function(block) {
+        block.hidden = !state.admin_remarks;
+    });
+    document.querySelectorAll(`[data-complaint-resolved="${state.id}"]`).forEach(function(block) {
+        block.hidden = !state.resolved_at;
+        if (state.resolved_at) {
+            block.querySelector('[data-complaint-resolved-at]').textContent = new Date(state.resolved_at).toLocaleString();
+        }
+    });
+    document.querySelectorAll(`[data-complaint-panel="${state.id}"]`).forEach(function(panel) {
+        panel.hidden = panel.dataset.status !== state.status;
+    });
+    document.querySelectorAll(`[data-complaint-delete="${state.id}"]`).forEach(function(button) {
+        button.hidden = state.status === 'resolved';
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const root = document.querySelector('[data-complaint-stream]');
+    if (!root || !window.EventSource) return;
+    const isList = root.hasAttribute('data-complaint-list');
+    const source = new EventSource(root.dataset.complaintStream);
+
+    source.addEventListener('complaint', function(event) {
+        const state = JSON.parse(event.data);
+        if (isList && !document.querySelector(`[data-complaint-row="${state.id}"]`)) {
+            // Submitted from another tab: the new row has to come from the server
+            window.location.reload();
+            return;
+        }
+        applyComplaintState(state);
+    });
+    source.addEventListener('deleted', function(event) {
+        const data = JSON.parse(event.data);
+        document.querySelectorAll(`[data-complaint-row="${data.id}"]`).forEach(function(row) {
+            row.remove();
+        });
+    });
+    // Sent after a reconnect, in case messages were missed meanwhile
+    source.addEventListener('snapshot', function(event) {
+        const complaints = JSON.parse(event.data).complaints;
+        const ids = new Set(complaints.map(function(state) { return String(state.id); }));
+        complaints.forEach(applyComplaintState);
+        if (isList) {
+            document.querySelectorAll('[data-complaint-row]').forEach(function(row) {
+                if (!ids.has(row.dataset.complaintRow)) row.remove();
+            });
+        }
+    });
+});
@@ -0,0 +1,28 @@
+"""
+Helper queries shared by the reporting features
+"""
+from .models import Allocation, Student
+
+
+def current_hostel_map(student_ids=None):
+    """
+    Map studentid -> hostelid using each student's latest allocation.
+    Runs a single query instead of calling get_current_allocation() per student.
+    """
+    allocations = Allocation.objects.order_by('student_id', 'date_of_allocation', 'allocationid')
+    if student_ids is not None:
+        allocations = allocations.filter(student_id__in=student_ids)
+
+    # Rows are ordered oldest first, so the last one seen per student wins
+    hostel_map = {}
+    for student_id, hostel_id in allocations.values_list('student_id', 'room__hostelid'):
+        hostel_map[student_id] = hostel_id
+    return hostel_map
+
+
+def get_student_for_user(user):
+    """Student record of a logged-in user: name match on the username, then studentid = user id"""
+    student = Student.objects.filter(name__icontains=user.username).first()
+    if not student:
+        student = Student.objects.filter(studentid=user.id).first()
+    return student
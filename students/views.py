@@ -4,6 +4,8 @@ from django.contrib import messages
 from .models import Student, Allocation, StudentProfile
 from .forms import StudentForm, AllocationForm, StudentProfileForm
 from datetime import date
+from hostel_management.async_utils import alist, arender
+from hostel_management.db_router import read_only_view
 
 
 def is_admin(user):
@@ -18,13 +20,14 @@ def is_admin(user):
 
 @login_required
 @user_passes_test(is_admin)
-def student_list(request):
+@read_only_view
+async def student_list(request):
     """List all students"""
-    students = Student.objects.all()
+    students = await alist(Student.objects.all())
     context = {
         'students': students,
     }
-    return render(request, 'students/student_list.html', context)
+    return await arender(request, 'students/student_list.html', context)
 
 
 @login_required
@@ -122,13 +125,14 @@ def student_detail(request, pk):
 # Allocation Views
 @login_required
 @user_passes_test(is_admin)
-def allocation_list(request):
+@read_only_view
+async def allocation_list(request):
     """List all room allocations"""
-    allocations = Allocation.objects.all().select_related('student', 'room')
+    allocations = await alist(Allocation.objects.all().select_related('student', 'room__hostelid'))
     context = {
         'allocations': allocations,
     }
-    return render(request, 'students/allocation_list.html', context)
+    return await arender(request, 'students/allocation_list.html', context)
 
 
 @login_required